@@ -1,17 +1,24 @@
+import io
+
 from django import forms
 from django.contrib import admin, messages
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
 from django.urls import reverse
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin, TabularInline
+from unfold.decorators import action
 
 from activities.models.base import ExamActivity
 from content.models import Exam
 from content.models import Module as ContentModule
+from utils.admin import EstimatedCountPaginator
 from utils.enums import ActivityType
 
-from .forms import FillInTheBlankActivityForm
-from .models.base import Activity
+from .bank import ActivityBankImporter, export_rows, guess_format, read_rows, write_rows
+from .forms import ActivityBankUploadForm, FillInTheBlankActivityForm
+from .models.base import Activity, UserAnswer
 from .models.choice import Choice, ChoiceActivity
 from .models.fill_in_the_blank import FillInTheBlankActivity
 from .models.matching import MatchingActivity, MatchingPair
@@ -117,12 +124,91 @@ class ActivityAdmin(ModelAdmin):
     search_fields = ("title", "description")
     list_filter = ("type", "difficulty")
     ordering = ("-created_at",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["export_bank"]
+    actions_list = ["import_bank"]
 
     def has_add_permission(self, request):
         return False
 
-    def get_queryset(self, request):
-        return super().get_queryset(request)
+    def has_import_bank_permission(self, request):
+        return request.user.has_perm("activities.add_activity")
+
+    @action(
+        description="Importar banco de actividades",
+        url_path="import-bank",
+        permissions=["import_bank"],
+    )
+    def import_bank(self, request):
+        form = ActivityBankUploadForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            upload = form.cleaned_data["file"]
+            stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+            report = ActivityBankImporter().run(
+                read_rows(stream, guess_format(upload.name))
+            )
+            messages.success(
+                request,
+                f"Actividades creadas: {report.created} "
+                f"({report.rows_per_second:.0f} filas/s).",
+            )
+            for line, message in report.errors[:20]:
+                messages.warning(request, f"Línea {line}: {message}")
+            return redirect(reverse("admin:activities_activity_changelist"))
+
+        return TemplateResponse(
+            request,
+            "admin/activities/import_activities.html",
+            {
+                **self.admin_site.each_context(request),
+                "opts": self.model._meta,
+                "title": "Importar banco de actividades",
+                "form": form,
+            },
+        )
+
+    @admin.action(description="Exportar seleccionadas (JSONL)")
+    def export_bank(self, request, queryset):
+        response = StreamingHttpResponse(
+            (line.encode("utf-8") for line in write_rows(export_rows(queryset))),
+            content_type="application/x-ndjson",
+        )
+        response["Content-Disposition"] = 'attachment; filename="actividades.jsonl"'
+        return response
+
+
+@admin.register(UserAnswer)
+class UserAnswerAdmin(ModelAdmin):
+    list_display = (
+        "id",
+        "user",
+        "activity",
+        "is_correct",
+        "exam_attempt",
+        "answered_at",
+    )
+    list_select_related = ("user", "activity")
+    list_filter = ("is_correct",)
+    search_fields = ("user__email",)
+    raw_id_fields = ("user", "activity", "exam_attempt")
+    readonly_fields = (
+        "user",
+        "activity",
+        "exam_attempt",
+        "response_data",
+        "is_correct",
+        "answered_at",
+    )
+    ordering = ("-id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 
 class ChoiceInline(TabularInline):
@@ -176,7 +262,7 @@ class FillInTheBlankActivityAdmin(
                 )
             },
         ),
-        ("Contenido", {"fields": ("authoring_text",)}),
+        ("Contenido", {"fields": ("authoring_text", "accent_sensitive")}),
         ("Vista previa", {"fields": ("preview_text",)}),
     )
     readonly_fields = ("preview_text",)
@@ -13,3 +13,5 @@ class ActivitiesConfig(AppConfig):
         base_path = Path(__file__).resolve().parent / "strategies"
         import_strategies("payload", base_path.parent)
         import_strategies("validation", base_path.parent)
+
+        from . import signals, tasks  # noqa: F401
@@ -0,0 +1,475 @@
+"""
+Importación y exportación masiva de bancos de actividades (JSONL / CSV).
+
+Cada fila describe una actividad de cualquiera de los cuatro tipos:
+
+    {"type": "choice", "title": "...", "choices": [{"text": "...", "is_correct": true}]}
+    {"type": "fill_in", "title": "...", "text": "La capital es [[París]]"}
+    {"type": "matching", "title": "...", "pairs": [{"left": "perro", "right": "dog"}]}
+    {"type": "order", "title": "...", "sentence": "El gato está durmiendo"}
+
+Campos comunes opcionales: instructions, feedback, difficulty, points, module
+(id) y exam (id, con required/position para el vínculo). En `fill_in`,
+`accent_sensitive` (default: true) indica si las tildes cuentan al validar; en
+`order`, `tokenizer` (whitespace | punctuation) cómo se divide la oración.
+En CSV, `choices` y `pairs` van como JSON dentro de la celda.
+"""
+
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+
+from content.models import Exam, Module
+from utils.enums import ActivityType, DifficultyLevel, WordTokenizer
+
+from .blanks import build_authoring_text, compile_blanks, parse_blanks
+from .models.base import Activity, ExamActivity
+from .models.choice import Choice, ChoiceActivity
+from .models.fill_in_the_blank import FillInTheBlankActivity
+from .models.matching import MatchingActivity, MatchingPair
+from .models.word_ordering import WordOrderingActivity
+from .recommendations import invalidate_candidates
+from .tokens import tokenize_sentence
+
+FORMATS = ("jsonl", "csv")
+EXPORT_FIELDS = (
+    "type",
+    "title",
+    "instructions",
+    "feedback",
+    "difficulty",
+    "points",
+    "module",
+    "exam",
+    "required",
+    "position",
+    "is_multiple",
+    "choices",
+    "text",
+    "accent_sensitive",
+    "pairs",
+    "sentence",
+    "tokenizer",
+)
+JSON_CELLS = ("choices", "pairs")
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "si", "sí"}
+
+
+def _as_bool(value, default=False):
+    if value in (None, ""):
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def _as_int(value, name, default=None):
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"'{name}' debe ser un entero.")
+    if number < 0:
+        raise ValidationError(f"'{name}' no puede ser negativo.")
+    return number
+
+
+def guess_format(filename: str) -> str:
+    return "csv" if filename.lower().endswith(".csv") else "jsonl"
+
+
+def read_rows(stream, fmt="jsonl"):
+    """Genera `(línea, fila)`; las filas ilegibles llegan como `ValidationError`."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            line = reader.line_num
+            try:
+                for key in JSON_CELLS:
+                    if row.get(key):
+                        row[key] = json.loads(row[key])
+            except ValueError as exc:
+                yield line, ValidationError(f"JSON inválido en '{key}': {exc}")
+                continue
+            yield line, row
+        return
+
+    for line, raw in enumerate(stream, start=1):
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+        except ValueError as exc:
+            yield line, ValidationError(f"JSON inválido: {exc}")
+            continue
+        if not isinstance(row, dict):
+            yield line, ValidationError("Cada línea debe ser un objeto JSON.")
+            continue
+        yield line, row
+
+
+@dataclass
+class PreparedActivity:
+    model: type
+    parent_fields: dict
+    child_fields: dict
+    children: list = field(default_factory=list)
+    exam_link: dict = None
+
+
+def _prepare_choice(row):
+    choices = row.get("choices") or []
+    if not isinstance(choices, list) or len(choices) < 1 or len(choices) > 10:
+        raise ValidationError("'choices' debe tener entre 1 y 10 opciones.")
+    children = []
+    for index, choice in enumerate(choices, start=1):
+        if not isinstance(choice, dict):
+            raise ValidationError(f"La opción {index} debe ser un objeto.")
+        text = str(choice.get("text") or "").strip()
+        if not text:
+            raise ValidationError(f"La opción {index} necesita 'text'.")
+        children.append(
+            Choice(text=text, is_correct=_as_bool(choice.get("is_correct")))
+        )
+    if not any(c.is_correct for c in children):
+        raise ValidationError("Marca al menos una opción como correcta.")
+    return {"is_multiple": _as_bool(row.get("is_multiple"))}, children
+
+
+def _prepare_fill(row):
+    text, answers = parse_blanks(str(row.get("text") or ""))
+    accent_sensitive = _as_bool(row.get("accent_sensitive"), default=True)
+    return {
+        "text": text,
+        "correct_answers": answers,
+        "accent_sensitive": accent_sensitive,
+        "compiled": compile_blanks(text, answers, accent_sensitive),
+    }, []
+
+
+def _prepare_matching(row):
+    pairs = row.get("pairs") or []
+    if not isinstance(pairs, list) or not pairs:
+        raise ValidationError("'pairs' debe tener al menos un par.")
+    children = []
+    for index, pair in enumerate(pairs, start=1):
+        if not isinstance(pair, dict):
+            raise ValidationError(f"El par {index} debe ser un objeto.")
+        left = str(pair.get("left") or "").strip()
+        right = str(pair.get("right") or "").strip()
+        if not left or not right:
+            raise ValidationError(f"El par {index} necesita 'left' y 'right'.")
+        children.append(
+            MatchingPair(
+                left=left,
+                right=right,
+                is_vocabulary=_as_bool(pair.get("is_vocabulary")),
+            )
+        )
+    return {}, children
+
+
+def _prepare_ordering(row):
+    sentence = str(row.get("sentence") or "").strip()
+    if not sentence:
+        raise ValidationError("'sentence' es obligatorio.")
+    tokenizer = row.get("tokenizer") or WordTokenizer.WHITESPACE
+    if tokenizer not in WordTokenizer.values:
+        raise ValidationError(f"Tokenizador inválido: {tokenizer!r}.")
+    return {
+        "sentence": sentence,
+        "tokenizer": tokenizer,
+        "tokens": tokenize_sentence(sentence, tokenizer),
+    }, []
+
+
+ROW_STRATEGIES = {
+    ActivityType.CHOICE: (ChoiceActivity, _prepare_choice),
+    ActivityType.FILL: (FillInTheBlankActivity, _prepare_fill),
+    ActivityType.MATCH: (MatchingActivity, _prepare_matching),
+    ActivityType.ORDER: (WordOrderingActivity, _prepare_ordering),
+}
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    linked: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+
+class ActivityBankImporter:
+    """
+    Importa filas de un banco por bloques.
+
+    Cada bloque se valida completo (con una consulta para módulos y otra para
+    exámenes) y se escribe en una transacción: `bulk_create` de `Activity`,
+    un INSERT por tabla hija, y `bulk_create` de opciones, pares y vínculos
+    con exámenes. Las filas inválidas se reportan y no detienen la carga.
+    """
+
+    def __init__(self, chunk_size=1000, batch_size=500):
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    def run(self, rows) -> ImportReport:
+        report = ImportReport()
+        started = time.perf_counter()
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.chunk_size)):
+            self._import_chunk(chunk, report)
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def _import_chunk(self, chunk, report):
+        refs = [row for _, row in chunk if isinstance(row, dict)]
+        module_ids = self._existing_ids(Module, refs, "module")
+        exam_ids = self._existing_ids(Exam, refs, "exam")
+
+        prepared = []
+        for line, row in chunk:
+            try:
+                if isinstance(row, ValidationError):
+                    raise row
+                prepared.append(self.prepare(row, module_ids, exam_ids))
+            except ValidationError as exc:
+                report.errors.append((line, "; ".join(exc.messages)))
+
+        if prepared:
+            with transaction.atomic():
+                report.linked += self._write(prepared)
+                # Los INSERT masivos no disparan señales.
+                invalidate_candidates(*{
+                    item.parent_fields["module_id"] for item in prepared
+                })
+            report.created += len(prepared)
+
+    @staticmethod
+    def _existing_ids(model, rows, key):
+        ids = set()
+        for row in rows:
+            try:
+                value = _as_int(row.get(key), key)
+            except ValidationError:
+                continue
+            if value is not None:
+                ids.add(value)
+        if not ids:
+            return set()
+        return set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+
+    def prepare(self, row, module_ids, exam_ids) -> PreparedActivity:
+        if not isinstance(row, dict):
+            raise ValidationError("Cada fila debe ser un objeto.")
+        activity_type = row.get("type")
+        strategy = (
+            ROW_STRATEGIES.get(activity_type)
+            if isinstance(activity_type, str)
+            else None
+        )
+        if strategy is None:
+            raise ValidationError(f"Tipo de actividad desconocido: {activity_type!r}.")
+        model, prepare_fields = strategy
+
+        title = str(row.get("title") or "").strip()
+        if not title:
+            raise ValidationError("'title' es obligatorio.")
+        if len(title) > 255:
+            raise ValidationError("'title' no puede superar 255 caracteres.")
+
+        difficulty = row.get("difficulty") or DifficultyLevel.MEDIUM
+        if difficulty not in DifficultyLevel.values:
+            raise ValidationError(f"Dificultad inválida: {difficulty!r}.")
+
+        module_id = _as_int(row.get("module"), "module")
+        if module_id is not None and module_id not in module_ids:
+            raise ValidationError(f"El módulo {module_id} no existe.")
+
+        exam_link = None
+        exam_id = _as_int(row.get("exam"), "exam")
+        if exam_id is not None:
+            if exam_id not in exam_ids:
+                raise ValidationError(f"El examen {exam_id} no existe.")
+            exam_link = {
+                "exam_id": exam_id,
+                "required": _as_bool(row.get("required"), default=True),
+                "position": _as_int(row.get("position"), "position", default=0),
+            }
+
+        child_fields, children = prepare_fields(row)
+        return PreparedActivity(
+            model=model,
+            parent_fields={
+                "type": row["type"],
+                "title": title,
+                "instructions": row.get("instructions") or "",
+                "feedback": row.get("feedback") or "",
+                "difficulty": difficulty,
+                "points": _as_int(row.get("points"), "points", default=0),
+                "module_id": module_id,
+            },
+            child_fields=child_fields,
+            children=children,
+            exam_link=exam_link,
+        )
+
+    def _write(self, prepared) -> int:
+        parents = Activity.objects.bulk_create(
+            [Activity(**item.parent_fields) for item in prepared],
+            batch_size=self.batch_size,
+        )
+
+        # La herencia multitabla impide `bulk_create` sobre los modelos hijos:
+        # se insertan sólo sus columnas locales, apuntando al padre ya creado.
+        by_model, children, links = {}, {}, []
+        for item, parent in zip(prepared, parents):
+            by_model.setdefault(item.model, []).append(
+                item.model(activity_ptr_id=parent.pk, **item.child_fields)
+            )
+            for child in item.children:
+                child.activity_id = parent.pk
+                children.setdefault(type(child), []).append(child)
+            if item.exam_link:
+                links.append(ExamActivity(activity_id=parent.pk, **item.exam_link))
+
+        for model, objs in by_model.items():
+            fields = model._meta.local_concrete_fields
+            using = router.db_for_write(model)
+            for start in range(0, len(objs), self.batch_size):
+                model._base_manager._insert(
+                    objs[start : start + self.batch_size], fields=fields, using=using
+                )
+
+        for model, objs in children.items():
+            model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+        ExamActivity.objects.bulk_create(
+            links, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        return len(links)
+
+
+def _export_choice(activity):
+    return {
+        "is_multiple": activity.is_multiple,
+        "choices": [
+            {"text": c.text, "is_correct": c.is_correct} for c in activity.choices.all()
+        ],
+    }
+
+
+def _export_fill(activity):
+    return {
+        "text": build_authoring_text(activity.text, activity.correct_answers),
+        "accent_sensitive": activity.accent_sensitive,
+    }
+
+
+def _export_matching(activity):
+    return {
+        "pairs": [
+            {"left": p.left, "right": p.right, "is_vocabulary": p.is_vocabulary}
+            for p in activity.pairs.all()
+        ]
+    }
+
+
+def _export_ordering(activity):
+    return {"sentence": activity.sentence, "tokenizer": activity.tokenizer}
+
+
+EXPORT_STRATEGIES = {
+    ActivityType.CHOICE: (ChoiceActivity, ("choices",), _export_choice),
+    ActivityType.FILL: (FillInTheBlankActivity, (), _export_fill),
+    ActivityType.MATCH: (MatchingActivity, ("pairs",), _export_matching),
+    ActivityType.ORDER: (WordOrderingActivity, (), _export_ordering),
+}
+
+
+def export_rows(activities, exam=None, chunk_size=1000):
+    """
+    Genera filas del banco para el queryset de `Activity` dado.
+
+    Recorre cada tipo con `.iterator()` y prefetch de sus hijos, así que la
+    memoria no crece con el tamaño del banco. Con `exam`, incluye el vínculo.
+    """
+    links = {}
+    if exam is not None:
+        links = {
+            row["activity_id"]: row
+            for row in ExamActivity.objects.filter(exam=exam).values(
+                "activity_id", "required", "position"
+            )
+        }
+
+    for activity_type, (model, prefetch, export) in EXPORT_STRATEGIES.items():
+        queryset = (
+            model.objects.filter(pk__in=activities.values("pk"), type=activity_type)
+            .prefetch_related(*prefetch)
+            .order_by("pk")
+        )
+        for activity in queryset.iterator(chunk_size=chunk_size):
+            row = {
+                "type": activity.type,
+                "title": activity.title,
+                "instructions": activity.instructions,
+                "feedback": activity.feedback,
+                "difficulty": activity.difficulty,
+                "points": activity.points,
+                "module": activity.module_id,
+            }
+            link = links.get(activity.pk)
+            if link is not None:
+                row.update(
+                    exam=exam.pk if hasattr(exam, "pk") else exam,
+                    required=link["required"],
+                    position=link["position"],
+                )
+            row.update(export(activity))
+            yield row
+
+
+def write_rows(rows, fmt="jsonl"):
+    """Serializa filas del banco como líneas de texto (JSONL o CSV)."""
+    if fmt == "csv":
+        buffer = _LineBuffer()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        yield buffer.pop()
+        for row in rows:
+            row = {
+                key: json.dumps(value, ensure_ascii=False)
+                if key in JSON_CELLS
+                else value
+                for key, value in row.items()
+            }
+            writer.writerow(row)
+            yield buffer.pop()
+        return
+
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+class _LineBuffer:
+    def __init__(self):
+        self.parts = []
+
+    def write(self, value):
+        self.parts.append(value)
+
+    def pop(self):
+        value = "".join(self.parts)
+        self.parts.clear()
+        return value
@@ -0,0 +1,78 @@
+import re
+import unicodedata
+
+from django.core.exceptions import ValidationError
+
+BLANK_PATTERN = re.compile(r"\[\[(.+?)\]\]")
+BLANK_PLACEHOLDER = "{{blank}}"
+
+
+def parse_blanks(src: str):
+    """
+    Convierte el texto de autoría `... [[respuesta]] ...` al formato guardado.
+
+    Devuelve `(text, answers)`, donde `text` usa `{{blank}}` en cada hueco y
+    `answers` es `{"0": "respuesta", ...}`.
+    """
+    if not src:
+        raise ValidationError("Debes ingresar el texto con al menos un [[hueco]].")
+
+    answers = {}
+
+    def replace_match(m):
+        raw = m.group(1).strip()
+        if not raw:
+            raise ValidationError("Se encontró [[ ]] vacío.")
+        if "|" in raw:
+            raise ValidationError("Solo una respuesta por hueco. Quita '|'.")
+        answers[str(len(answers))] = raw
+        return BLANK_PLACEHOLDER
+
+    text = BLANK_PATTERN.sub(replace_match, src)
+    if not answers:
+        raise ValidationError("Incluye al menos un hueco usando [[respuesta]].")
+    return text, answers
+
+
+def build_authoring_text(text: str, answers: dict) -> str:
+    rebuilt = []
+    for i, part in enumerate(text.split(BLANK_PLACEHOLDER)):
+        rebuilt.append(part)
+        if str(i) in answers:
+            rebuilt.append(f"[[{answers[str(i)]}]]")
+    return "".join(rebuilt)
+
+
+def normalize_answer(value: str, accent_sensitive: bool = True) -> str:
+    value = unicodedata.normalize("NFC", str(value)).strip().casefold()
+    if accent_sensitive:
+        return value
+    stripped = "".join(
+        c for c in unicodedata.normalize("NFD", value) if not unicodedata.combining(c)
+    )
+    return unicodedata.normalize("NFC", stripped)
+
+
+def compile_blanks(text: str, answers: dict, accent_sensitive: bool = True) -> dict:
+    """
+    Representación precalculada de una actividad de completar espacios.
+
+    `segments` es el texto partido en cada `{{blank}}`, `offsets` la posición
+    de cada hueco en `text` y `answers` las respuestas ya normalizadas, en el
+    mismo orden que `keys`.
+    """
+    segments = text.split(BLANK_PLACEHOLDER)
+    offsets, position = [], 0
+    for segment in segments[:-1]:
+        position += len(segment)
+        offsets.append(position)
+        position += len(BLANK_PLACEHOLDER)
+
+    keys = list(answers)
+    return {
+        "blank_count": len(offsets),
+        "segments": segments,
+        "offsets": offsets,
+        "keys": keys,
+        "answers": [normalize_answer(answers[k], accent_sensitive) for k in keys],
+    }
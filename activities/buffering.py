@@ -0,0 +1,340 @@
+"""
+Buffer de escritura diferida para respuestas de práctica.
+
+Con `ANSWER_BUFFER_ENABLED = True` las respuestas se validan en la petición,
+pero la fila de `UserAnswer` y los efectos derivados (primer acierto,
+vocabulario y progreso) se escriben por lotes desde un hilo de fondo.
+
+Cada proceso agrega las respuestas a su propio archivo JSONL en
+`ANSWER_BUFFER_SPOOL_DIR`. Para volcarlas, el archivo se renombra a un lote
+`batch-<pid>-*.jsonl`, se inserta por sublotes y se borra. Si el proceso muere
+antes, el siguiente volcado (de cualquier proceso o de `flush_answer_buffer`)
+retoma los archivos huérfanos.
+
+Tras confirmar cada sublote se guarda en `<lote>.offset` hasta dónde se
+insertó, y al retomar un lote se sigue desde ahí: un fallo a mitad de archivo
+no vuelve a insertar lo ya confirmado. Sólo un corte entre la confirmación y
+el checkpoint repite un sublote, cosa que las lecturas ya toleran gracias a
+`first_correct_answer`. Los registros que no se pueden deserializar o que la
+base rechaza por sí solos se apartan a `dead-<pid>.jsonl`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import (
+    DataError,
+    IntegrityError,
+    close_old_connections,
+    connections,
+    router,
+    transaction,
+)
+from django.utils.dateparse import parse_datetime
+
+from activities.models.base import Activity, UserAnswer
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+SPOOL_PREFIX = "answers-"
+BATCH_PREFIX = "batch-"
+DEAD_PREFIX = "dead-"
+
+
+def buffer_enabled() -> bool:
+    return getattr(settings, "ANSWER_BUFFER_ENABLED", False)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _owner_pid(path: Path) -> int | None:
+    try:
+        return int(path.stem.split("-")[1])
+    except (IndexError, ValueError):
+        return None
+
+
+class AnswerSpool:
+    """Archivo de respaldo en disco de las respuestas pendientes."""
+
+    def __init__(self, directory, fsync: bool = True):
+        self.directory = Path(directory)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def path(self) -> Path:
+        return self.directory / f"{SPOOL_PREFIX}{os.getpid()}.jsonl"
+
+    def append(self, record: dict) -> int:
+        """Agrega un registro y devuelve cuántos hay en el archivo propio."""
+        line = json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+                fh.flush()
+                if self.fsync:
+                    os.fsync(fh.fileno())
+            self._pending += 1
+            return self._pending
+
+    def claim(self) -> List[Path]:
+        """
+        Toma los archivos a volcar: el propio, los de procesos muertos y los
+        lotes que otro proceso dejó a medias.
+        """
+        if not self.directory.exists():
+            return []
+
+        claimed = []
+        pid = os.getpid()
+        for path in sorted(self.directory.glob(f"{BATCH_PREFIX}*.jsonl")):
+            owner = _owner_pid(path)
+            if owner == pid or (owner is not None and not _pid_alive(owner)):
+                claimed.append(self._rename(path))
+
+        for path in sorted(self.directory.glob(f"{SPOOL_PREFIX}*.jsonl")):
+            owner = _owner_pid(path)
+            if owner == pid:
+                with self._lock:
+                    claimed.append(self._rename(path))
+                    self._pending = 0
+            elif owner is not None and not _pid_alive(owner):
+                claimed.append(self._rename(path))
+        return [path for path in claimed if path is not None]
+
+    def _rename(self, path: Path) -> Path | None:
+        target = (
+            self.directory / f"{BATCH_PREFIX}{os.getpid()}-{uuid.uuid4().hex}.jsonl"
+        )
+        try:
+            path.rename(target)
+        except FileNotFoundError:
+            return None
+        try:
+            self.offset_path(path).rename(self.offset_path(target))
+        except FileNotFoundError:
+            pass
+        return target
+
+    @staticmethod
+    def offset_path(path: Path) -> Path:
+        return path.with_suffix(".offset")
+
+    def checkpoint(self, path: Path, offset: int) -> None:
+        """Registra que todo lo anterior a `offset` (en bytes) ya se insertó."""
+        tmp = path.with_suffix(".offset.tmp")
+        tmp.write_text(str(offset))
+        os.replace(tmp, self.offset_path(path))
+
+    def discard(self, path: Path) -> None:
+        path.unlink()
+        self.offset_path(path).unlink(missing_ok=True)
+
+    def dead_letter(self, record) -> None:
+        path = self.directory / f"{DEAD_PREFIX}{os.getpid()}.jsonl"
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record, cls=DjangoJSONEncoder) + "\n")
+
+    def read(self, path: Path) -> Iterable[Tuple[dict, int]]:
+        """Registros desde el último checkpoint y el offset en que termina cada uno."""
+        try:
+            offset = int(self.offset_path(path).read_text())
+        except (FileNotFoundError, ValueError):
+            offset = 0
+        with open(path, "rb") as fh:
+            fh.seek(offset)
+            for line in fh:
+                offset += len(line)
+                try:
+                    yield json.loads(line), offset
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    logger.warning("Línea corrupta en %s; se descarta.", path)
+
+
+def serialize_answer(answer: UserAnswer) -> dict:
+    return {
+        "user_id": answer.user_id,
+        "activity_id": answer.activity_id,
+        "response_data": answer.response_data,
+        "is_correct": answer.is_correct,
+        # isoformat conserva los microsegundos que DjangoJSONEncoder recorta.
+        "answered_at": answer.answered_at.isoformat(),
+    }
+
+
+def deserialize_answer(record: dict) -> UserAnswer:
+    return UserAnswer(
+        user_id=record["user_id"],
+        activity_id=record["activity_id"],
+        response_data=record["response_data"],
+        is_correct=record["is_correct"],
+        answered_at=parse_datetime(record["answered_at"]),
+    )
+
+
+def _insert_answers(answers: List[UserAnswer]) -> None:
+    """
+    INSERT explícito de las respuestas: `bulk_create` pisaría `answered_at`
+    (`auto_now_add`) con la hora del volcado en vez de la de la respuesta.
+    """
+    opts = UserAnswer._meta
+    connection = connections[router.db_for_write(UserAnswer)]
+    fields = [f for f in opts.concrete_fields if not f.primary_key]
+    qn = connection.ops.quote_name
+    sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+        qn(opts.db_table),
+        ", ".join(qn(f.column) for f in fields),
+        ", ".join(["%s"] * len(fields)),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            sql,
+            [
+                [f.get_db_prep_save(getattr(a, f.attname), connection) for f in fields]
+                for a in answers
+            ],
+        )
+
+
+def write_answers(answers: List[UserAnswer]) -> None:
+    """Inserta un lote de respuestas y aplica sus efectos derivados."""
+    from activities.services import AnswerSubmissionService, FirstCorrectAnswerService
+
+    if not answers:
+        return
+
+    activities = Activity.objects.select_related("module__course").in_bulk({
+        a.activity_id for a in answers
+    })
+    users = User.objects.in_bulk({a.user_id for a in answers})
+    answers = [a for a in answers if a.activity_id in activities and a.user_id in users]
+
+    by_user = defaultdict(list)
+    for answer in answers:
+        answer.activity = activities[answer.activity_id]
+        by_user[answer.user_id].append(answer)
+
+    with transaction.atomic():
+        _insert_answers(answers)
+        FirstCorrectAnswerService.record(answers)
+        for user_id, user_answers in by_user.items():
+            AnswerSubmissionService._enqueue_side_effects(users[user_id], user_answers)
+
+
+class AnswerBuffer:
+    def __init__(self, spool: AnswerSpool, interval: float, max_batch: int):
+        self.spool = spool
+        self.interval = interval
+        self.max_batch = max_batch
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+
+    def add(self, answer: UserAnswer) -> None:
+        if self.spool.append(serialize_answer(answer)) >= self.max_batch:
+            self._wake.set()
+        self._ensure_worker()
+
+    def flush(self) -> int:
+        """Vuelca todo lo pendiente; devuelve la cantidad de respuestas escritas."""
+        written = 0
+        with self._flush_lock:
+            for path in self.spool.claim():
+                batch = []
+                for record, offset in self.spool.read(path):
+                    try:
+                        batch.append((record, deserialize_answer(record)))
+                    except (KeyError, TypeError, ValueError):
+                        logger.warning("Registro inválido en %s; se aparta.", path)
+                        self.spool.dead_letter(record)
+                    if len(batch) >= self.max_batch:
+                        written += self._write(batch)
+                        self.spool.checkpoint(path, offset)
+                        batch = []
+                written += self._write(batch)
+                self.spool.discard(path)
+        return written
+
+    def _write(self, batch) -> int:
+        try:
+            write_answers([answer for _, answer in batch])
+            return len(batch)
+        except (DataError, IntegrityError):
+            pass
+        # Algún registro rompe el sublote: se insertan de a uno y se apartan los
+        # que la base rechaza. Otros errores (p. ej. conexión) se propagan y el
+        # sublote se reintenta en el próximo volcado.
+        written = 0
+        for record, answer in batch:
+            try:
+                write_answers([answer])
+                written += 1
+            except (DataError, IntegrityError):
+                logger.exception("Respuesta rechazada por la base; se aparta.")
+                self.spool.dead_letter(record)
+        return written
+
+    def _ensure_worker(self) -> None:
+        if self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        self._worker_pid = os.getpid()
+        self._worker = threading.Thread(
+            target=self._run, name="answer-buffer", daemon=True
+        )
+        self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("No se pudo volcar el buffer de respuestas.")
+            finally:
+                close_old_connections()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_answer_buffer() -> AnswerBuffer:
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            directory = getattr(
+                settings,
+                "ANSWER_BUFFER_SPOOL_DIR",
+                Path(tempfile.gettempdir()) / "apart-answer-spool",
+            )
+            _buffer = AnswerBuffer(
+                AnswerSpool(directory, getattr(settings, "ANSWER_BUFFER_FSYNC", True)),
+                interval=getattr(settings, "ANSWER_BUFFER_FLUSH_INTERVAL", 2.0),
+                max_batch=getattr(settings, "ANSWER_BUFFER_MAX_BATCH", 500),
+            )
+        return _buffer
@@ -1,14 +1,11 @@
 # forms.py
-import re
-
 from django import forms
 
 from utils.enums import ActivityType
 
+from .blanks import build_authoring_text, parse_blanks
 from .models.fill_in_the_blank import FillInTheBlankActivity
 
-BLANK_PATTERN = re.compile(r"\[\[(.+?)\]\]")
-
 
 class FillInTheBlankActivityForm(forms.ModelForm):
     authoring_text = forms.CharField(
@@ -28,50 +25,21 @@ class FillInTheBlankActivityForm(forms.ModelForm):
             "points",
             "module",
             "authoring_text",
+            "accent_sensitive",
         )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         inst = getattr(self, "instance", None)
         if inst and inst.pk and inst.text and inst.correct_answers:
-            parts = inst.text.split("{{blank}}")
-            rebuilt = []
-            for i, part in enumerate(parts):
-                rebuilt.append(part)
-                if str(i) in inst.correct_answers:
-                    ans = inst.correct_answers[str(i)]
-                    rebuilt.append(f"[[{ans}]]")
-            self.fields["authoring_text"].initial = "".join(rebuilt)
+            self.fields["authoring_text"].initial = build_authoring_text(
+                inst.text, inst.correct_answers
+            )
 
     def clean(self):
         cleaned = super().clean()
-        src = cleaned.get("authoring_text") or ""
-        if not src:
-            raise forms.ValidationError(
-                "Debes ingresar el texto con al menos un [[hueco]]."
-            )
-
-        answers = {}
-        idx = 0
-
-        def replace_match(m):
-            nonlocal idx
-            raw = m.group(1).strip()
-            if not raw:
-                raise forms.ValidationError("Se encontró [[ ]] vacío.")
-            if "|" in raw:
-                raise forms.ValidationError("Solo una respuesta por hueco. Quita '|'.")
-            answers[str(idx)] = raw
-            idx += 1
-            return "{{blank}}"
-
-        normalized_text = BLANK_PATTERN.sub(replace_match, src)
-        if idx == 0:
-            raise forms.ValidationError(
-                "Incluye al menos un hueco usando [[respuesta]]."
-            )
-
-        cleaned["text"] = normalized_text
+        text, answers = parse_blanks(cleaned.get("authoring_text") or "")
+        cleaned["text"] = text
         cleaned["correct_answers"] = answers
         return cleaned
 
@@ -84,3 +52,16 @@ class FillInTheBlankActivityForm(forms.ModelForm):
             instance.save()
             self.save_m2m()
         return instance
+
+
+class ActivityBankUploadForm(forms.Form):
+    file = forms.FileField(
+        label="Archivo",
+        help_text="Banco de actividades en formato .jsonl o .csv (UTF-8).",
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data["file"]
+        if not upload.name.lower().endswith((".jsonl", ".csv")):
+            raise forms.ValidationError("El archivo debe ser .jsonl o .csv.")
+        return upload
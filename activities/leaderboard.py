@@ -0,0 +1,717 @@
+"""
+Lecturas del ranking: top N, posición exacta de un usuario y sus vecinos.
+
+El orden es siempre (puntos desc, user_id asc), así que la posición de un
+usuario es 1 + la cantidad de filas que lo preceden en ese orden, y sus
+vecinos son las k filas inmediatamente antes y después.
+
+Los puntajes acumulados por ámbito viven en un backend configurable con
+`LEADERBOARD_BACKEND`: `redis` (sorted sets en `LEADERBOARD_REDIS_URL`, el
+default fuera de los tests), `database` (tabla `leaderboard_score`) o `local`
+(sorted sets en memoria del proceso, sólo para los tests).
+
+Cada primer acierto suma los puntos de la actividad con `ZINCRBY` al
+confirmarse la transacción que lo registró; `rebuild_leaderboard` recalcula
+todo desde `first_correct_answer` si el backend se pierde o se desvía.
+"""
+
+from __future__ import annotations
+
+import abc
+import bisect
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet, Sum
+from django.utils import timezone
+
+from activities.models.base import FirstCorrectAnswer, LeaderboardScore
+from people.models import Person
+
+GLOBAL_SCOPE = "all"
+ROW_FIELDS = ("user_id", "total_points", "activities_count")
+
+
+def course_scope(course_id: int) -> str:
+    return f"course:{course_id}"
+
+
+def scope_course_id(scope: str) -> Optional[int]:
+    prefix, _, value = scope.partition(":")
+    return int(value) if prefix == "course" else None
+
+
+def language_scope(language_id: int) -> str:
+    return f"language:{language_id}"
+
+
+def scope_for(course_id: Optional[int] = None, language_id: Optional[int] = None):
+    if course_id:
+        return course_scope(course_id)
+    if language_id:
+        return language_scope(language_id)
+    return GLOBAL_SCOPE
+
+
+def activity_scopes(activity) -> List[str]:
+    """Ámbitos donde suma una actividad (requiere `module__course` cargado)."""
+    scopes = [GLOBAL_SCOPE]
+    module = activity.module if activity.module_id else None
+    if module and module.course_id:
+        scopes.append(course_scope(module.course_id))
+        if module.course.language_id:
+            scopes.append(language_scope(module.course.language_id))
+    return scopes
+
+
+Scores = Dict[Tuple[str, int], Tuple[int, int]]
+
+
+class ScoreBoard(abc.ABC):
+    """
+    Ranking de un ámbito. Las filas son dicts con `user_id`, `total_points`,
+    `activities_count` y `position`.
+    """
+
+    @abc.abstractmethod
+    def top(self, limit: int) -> List[dict]: ...
+
+    @abc.abstractmethod
+    def entry(self, user_id: int) -> Optional[dict]: ...
+
+    @abc.abstractmethod
+    def neighbors(self, row: dict, k: int) -> List[dict]:
+        """Las `k` filas anteriores y posteriores a `row`, en orden de ranking."""
+
+
+class QuerySetScoreBoard(ScoreBoard):
+    """Lecturas sobre un queryset de filas `user_id, total_points, activities_count`."""
+
+    @abc.abstractmethod
+    def rows(self) -> QuerySet: ...
+
+    def _ordered(self, qs: QuerySet, descending: bool = True) -> QuerySet:
+        if descending:
+            return qs.order_by("-total_points", "user_id")
+        return qs.order_by("total_points", "-user_id")
+
+    @staticmethod
+    def _before(row: dict) -> Q:
+        points, user_id = row["total_points"], row["user_id"]
+        return Q(total_points__gt=points) | Q(total_points=points, user_id__lt=user_id)
+
+    @staticmethod
+    def _after(row: dict) -> Q:
+        points, user_id = row["total_points"], row["user_id"]
+        return Q(total_points__lt=points) | Q(total_points=points, user_id__gt=user_id)
+
+    def top(self, limit: int) -> List[dict]:
+        rows = list(self._ordered(self.rows())[:limit])
+        for position, row in enumerate(rows, start=1):
+            row["position"] = position
+        return rows
+
+    def entry(self, user_id: int) -> Optional[dict]:
+        found = list(self.rows().filter(user_id=user_id)[:1])
+        if not found:
+            return None
+        row = found[0]
+        row["position"] = self.rows().filter(self._before(row)).count() + 1
+        return row
+
+    def neighbors(self, row: dict, k: int) -> List[dict]:
+        if k <= 0:
+            return []
+        above = list(self._ordered(self.rows().filter(self._before(row)), False)[:k])
+        below = list(self._ordered(self.rows().filter(self._after(row)))[:k])
+        above.reverse()
+        for offset, item in enumerate(above):
+            item["position"] = row["position"] - len(above) + offset
+        for offset, item in enumerate(below, start=1):
+            item["position"] = row["position"] + offset
+        return above + below
+
+
+class DatabaseScoreBoard(QuerySetScoreBoard):
+    """Ranking acumulado servido desde `leaderboard_score`."""
+
+    def __init__(self, scope: str = GLOBAL_SCOPE):
+        self.scope = scope
+
+    def rows(self) -> QuerySet:
+        return LeaderboardScore.objects.filter(scope=self.scope).values(*ROW_FIELDS)
+
+
+class AggregateScoreBoard(QuerySetScoreBoard):
+    """
+    Ranking calculado al vuelo desde `first_correct_answer`, para ventanas de
+    tiempo o módulos que no tienen un ámbito materializado.
+    """
+
+    def __init__(self, pairs: QuerySet):
+        self.pairs = pairs
+
+    def rows(self) -> QuerySet:
+        return (
+            self.pairs.values("user_id")
+            .annotate(total_points=Sum("points"), activities_count=Count("activity_id"))
+            .order_by()
+        )
+
+
+def user_scores(user_ids: Iterable[int]) -> Scores:
+    """Puntos y actividades por (ámbito, usuario) a partir de los aciertos."""
+    totals = defaultdict(lambda: [0, 0])
+    rows = (
+        FirstCorrectAnswer.objects.filter(user_id__in=list(user_ids))
+        .values(
+            "user_id",
+            "activity__module__course_id",
+            "activity__module__course__language_id",
+        )
+        .annotate(points=Sum("points"), count=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        scopes = [GLOBAL_SCOPE]
+        if row["activity__module__course_id"]:
+            scopes.append(course_scope(row["activity__module__course_id"]))
+        if row["activity__module__course__language_id"]:
+            scopes.append(language_scope(row["activity__module__course__language_id"]))
+        for scope in scopes:
+            total = totals[(scope, row["user_id"])]
+            total[0] += row["points"] or 0
+            total[1] += row["count"]
+    return {key: tuple(value) for key, value in totals.items()}
+
+
+class LeaderboardBackend(abc.ABC):
+    """Almacén de puntajes por ámbito."""
+
+    @abc.abstractmethod
+    def board(self, scope: str) -> ScoreBoard: ...
+
+    @abc.abstractmethod
+    def add(self, deltas: Scores) -> None:
+        """Suma `(puntos, actividades)` a cada (ámbito, usuario) de `deltas`."""
+
+    @abc.abstractmethod
+    def store(self, user_ids: List[int], scores: Scores) -> None:
+        """
+        Reemplaza los puntajes de `user_ids` por `scores`; los ámbitos donde
+        un usuario ya no tiene puntos se eliminan.
+        """
+
+    @abc.abstractmethod
+    def clear(self) -> None: ...
+
+    @abc.abstractmethod
+    def replace(self, fill: Callable[["LeaderboardBackend"], int]) -> int:
+        """
+        Reemplaza todo el contenido por lo que `fill` guarde en el backend que
+        recibe, sin que las lecturas vean el ranking vacío o a medio llenar.
+        """
+
+
+class DatabaseBackend(LeaderboardBackend):
+    def board(self, scope: str) -> ScoreBoard:
+        return DatabaseScoreBoard(scope)
+
+    def add(self, deltas: Scores) -> None:
+        now = timezone.now()
+        with transaction.atomic():
+            for (scope, user_id), (points, n) in deltas.items():
+                _, created = LeaderboardScore.objects.get_or_create(
+                    scope=scope,
+                    user_id=user_id,
+                    defaults={"total_points": points, "activities_count": n},
+                )
+                if not created:
+                    LeaderboardScore.objects.filter(
+                        scope=scope, user_id=user_id
+                    ).update(
+                        total_points=F("total_points") + points,
+                        activities_count=F("activities_count") + n,
+                        updated_at=now,
+                    )
+
+    def store(self, user_ids: List[int], scores: Scores) -> None:
+        LeaderboardScore.objects.bulk_create(
+            [
+                LeaderboardScore(
+                    scope=scope,
+                    user_id=user_id,
+                    total_points=points,
+                    activities_count=n,
+                )
+                for (scope, user_id), (points, n) in scores.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["scope", "user"],
+            update_fields=["total_points", "activities_count", "updated_at"],
+            batch_size=1000,
+        )
+        kept = defaultdict(list)
+        for scope, user_id in scores:
+            kept[user_id].append(scope)
+        stale = Q(pk__in=[])
+        for user_id in user_ids:
+            stale |= Q(user_id=user_id) & ~Q(scope__in=kept[user_id])
+        LeaderboardScore.objects.filter(stale).delete()
+
+    def clear(self) -> None:
+        LeaderboardScore.objects.all().delete()
+
+    def replace(self, fill: Callable[[LeaderboardBackend], int]) -> int:
+        with transaction.atomic():
+            self.clear()
+            return fill(self)
+
+
+# En un sorted set los empates se ordenan por miembro, y ZREVRANGE los
+# recorre en orden lexicográfico descendente. Guardar `MAX_USER_ID - user_id`
+# con ancho fijo hace que ese orden sea user_id ascendente.
+MAX_USER_ID = 10**12 - 1
+
+
+def _member(user_id: int) -> str:
+    return f"{MAX_USER_ID - user_id:012d}"
+
+
+def _user_id(member) -> int:
+    if isinstance(member, bytes):
+        member = member.decode()
+    return MAX_USER_ID - int(member)
+
+
+class SortedSetScoreBoard(ScoreBoard):
+    """
+    Ranking sobre un sorted set (`ZREVRANGE`, `ZREVRANK`, `ZSCORE`) más un
+    hash con la cantidad de actividades de cada usuario.
+    """
+
+    def __init__(self, backend: "SortedSetBackend", scope: str):
+        self.client = backend.client
+        self.key = backend.scores_key(scope)
+        self.counts_key = backend.counts_key(scope)
+
+    def _rows(self, start: int, end: int) -> List[dict]:
+        if end < start:
+            return []
+        pairs = self.client.zrevrange(self.key, start, end, withscores=True)
+        if not pairs:
+            return []
+        counts = self.client.hmget(self.counts_key, [m for m, _ in pairs])
+        return [
+            {
+                "user_id": _user_id(member),
+                "total_points": int(score),
+                "activities_count": int(count or 0),
+                "position": start + offset + 1,
+            }
+            for offset, ((member, score), count) in enumerate(zip(pairs, counts))
+        ]
+
+    def top(self, limit: int) -> List[dict]:
+        return self._rows(0, limit - 1)
+
+    def entry(self, user_id: int) -> Optional[dict]:
+        member = _member(user_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrevrank(self.key, member)
+        pipe.zscore(self.key, member)
+        pipe.hget(self.counts_key, member)
+        rank, score, count = pipe.execute()
+        if rank is None:
+            return None
+        return {
+            "user_id": user_id,
+            "total_points": int(score),
+            "activities_count": int(count or 0),
+            "position": rank + 1,
+        }
+
+    def neighbors(self, row: dict, k: int) -> List[dict]:
+        if k <= 0:
+            return []
+        rank = row["position"] - 1
+        above = self._rows(max(rank - k, 0), rank - 1)
+        below = self._rows(rank + 1, rank + k)
+        return above + below
+
+
+class SortedSetBackend(LeaderboardBackend):
+    """
+    Un sorted set por ámbito (`<prefix>scores:<scope>`) y un hash con las
+    cantidades (`<prefix>counts:<scope>`); `<prefix>scopes` registra los
+    ámbitos existentes para poder limpiar los que un usuario deja de tener.
+    """
+
+    def __init__(self, client, prefix: str = "leaderboard:"):
+        self.client = client
+        self.prefix = prefix
+
+    def scores_key(self, scope: str) -> str:
+        return f"{self.prefix}scores:{scope}"
+
+    def counts_key(self, scope: str) -> str:
+        return f"{self.prefix}counts:{scope}"
+
+    @property
+    def scopes_key(self) -> str:
+        return f"{self.prefix}scopes"
+
+    def _scopes(self) -> List[str]:
+        return [
+            s.decode() if isinstance(s, bytes) else s
+            for s in self.client.smembers(self.scopes_key)
+        ]
+
+    def board(self, scope: str) -> ScoreBoard:
+        return SortedSetScoreBoard(self, scope)
+
+    def add(self, deltas: Scores) -> None:
+        if not deltas:
+            return
+        pipe = self.client.pipeline(transaction=True)
+        pipe.sadd(self.scopes_key, *{scope for scope, _ in deltas})
+        for (scope, user_id), (points, n) in deltas.items():
+            pipe.zincrby(self.scores_key(scope), points, _member(user_id))
+            pipe.hincrby(self.counts_key(scope), _member(user_id), n)
+        pipe.execute()
+
+    def store(self, user_ids: List[int], scores: Scores) -> None:
+        by_scope = defaultdict(dict)
+        for (scope, user_id), value in scores.items():
+            by_scope[scope][_member(user_id)] = value
+
+        pipe = self.client.pipeline(transaction=False)
+        if by_scope:
+            pipe.sadd(self.scopes_key, *by_scope)
+        for scope in set(self._scopes()) | set(by_scope):
+            entries = by_scope.get(scope, {})
+            stale = [
+                _member(user_id)
+                for user_id in user_ids
+                if _member(user_id) not in entries
+            ]
+            if stale:
+                pipe.zrem(self.scores_key(scope), *stale)
+                pipe.hdel(self.counts_key(scope), *stale)
+            if entries:
+                pipe.zadd(
+                    self.scores_key(scope),
+                    {member: points for member, (points, _) in entries.items()},
+                )
+                pipe.hset(
+                    self.counts_key(scope),
+                    mapping={member: n for member, (_, n) in entries.items()},
+                )
+        pipe.execute()
+
+    def clear(self) -> None:
+        scopes = self._scopes()
+        keys = [self.scores_key(s) for s in scopes] + [
+            self.counts_key(s) for s in scopes
+        ]
+        self.client.delete(self.scopes_key, *keys)
+
+    def replace(self, fill: Callable[[LeaderboardBackend], int]) -> int:
+        # Se llena un juego de claves aparte y se intercambia con RENAME en
+        # una sola transacción.
+        staging = SortedSetBackend(self.client, f"{self.prefix}rebuild:")
+        staging.clear()
+        total = fill(staging)
+        scopes = staging._scopes()
+
+        pipe = self.client.pipeline(transaction=True)
+        for scope in set(self._scopes()) - set(scopes):
+            pipe.delete(self.scores_key(scope), self.counts_key(scope))
+        for scope in scopes:
+            pipe.rename(staging.scores_key(scope), self.scores_key(scope))
+            pipe.rename(staging.counts_key(scope), self.counts_key(scope))
+        if scopes:
+            pipe.rename(staging.scopes_key, self.scopes_key)
+        else:
+            pipe.delete(self.scopes_key)
+        pipe.execute()
+        return total
+
+
+class LocalSortedSets:
+    """
+    Subconjunto en memoria de los comandos de Redis que usa `SortedSetBackend`
+    (sorted sets, hashes y sets), con la misma semántica de orden.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._zsets: Dict[str, Tuple[Dict[str, float], List[Tuple[float, str]]]] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._sets: Dict[str, set] = {}
+
+    def _zset(self, name):
+        return self._zsets.setdefault(name, ({}, []))
+
+    def zadd(self, name, mapping):
+        with self._lock:
+            scores, ordered = self._zset(name)
+            for member, score in mapping.items():
+                if member in scores:
+                    ordered.remove((scores[member], member))
+                scores[member] = float(score)
+                bisect.insort(ordered, (float(score), member))
+            return len(mapping)
+
+    def zincrby(self, name, amount, member):
+        with self._lock:
+            score = (self._zset(name)[0].get(member) or 0) + float(amount)
+            self.zadd(name, {member: score})
+            return score
+
+    def zrem(self, name, *members):
+        with self._lock:
+            scores, ordered = self._zset(name)
+            removed = 0
+            for member in members:
+                if member in scores:
+                    ordered.remove((scores.pop(member), member))
+                    removed += 1
+            return removed
+
+    def zscore(self, name, member):
+        with self._lock:
+            return self._zset(name)[0].get(member)
+
+    def zrevrank(self, name, member):
+        with self._lock:
+            scores, ordered = self._zset(name)
+            if member not in scores:
+                return None
+            index = bisect.bisect_left(ordered, (scores[member], member))
+            return len(ordered) - 1 - index
+
+    def zrevrange(self, name, start, end, withscores=False):
+        with self._lock:
+            ordered = self._zset(name)[1]
+            size = len(ordered)
+            end = size - 1 if end < 0 else min(end, size - 1)
+            items = [ordered[size - 1 - i] for i in range(start, end + 1)]
+            if withscores:
+                return [(member, score) for score, member in items]
+            return [member for _, member in items]
+
+    def hset(self, name, mapping):
+        with self._lock:
+            self._hashes.setdefault(name, {}).update({
+                k: str(v) for k, v in mapping.items()
+            })
+            return len(mapping)
+
+    def hget(self, name, key):
+        with self._lock:
+            return self._hashes.get(name, {}).get(key)
+
+    def hmget(self, name, keys):
+        with self._lock:
+            values = self._hashes.get(name, {})
+            return [values.get(k) for k in keys]
+
+    def hincrby(self, name, key, amount=1):
+        with self._lock:
+            values = self._hashes.setdefault(name, {})
+            value = int(values.get(key) or 0) + amount
+            values[key] = str(value)
+            return value
+
+    def hdel(self, name, *keys):
+        with self._lock:
+            values = self._hashes.get(name, {})
+            return sum(values.pop(k, None) is not None for k in keys)
+
+    def sadd(self, name, *members):
+        with self._lock:
+            self._sets.setdefault(name, set()).update(members)
+            return len(members)
+
+    def smembers(self, name):
+        with self._lock:
+            return set(self._sets.get(name, set()))
+
+    def delete(self, *names):
+        with self._lock:
+            for name in names:
+                self._zsets.pop(name, None)
+                self._hashes.pop(name, None)
+                self._sets.pop(name, None)
+
+    def rename(self, src, dst):
+        with self._lock:
+            for values in (self._zsets, self._hashes, self._sets):
+                if src in values:
+                    self.delete(dst)
+                    values[dst] = values.pop(src)
+                    return True
+            raise KeyError(src)
+
+    def pipeline(self, transaction=True):
+        return _LocalPipeline(self)
+
+
+class _LocalPipeline:
+    def __init__(self, client: LocalSortedSets):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._calls.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        with self._client._lock:
+            calls, self._calls = self._calls, []
+            return [method(*args, **kwargs) for method, args, kwargs in calls]
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def build_backend(name: str) -> LeaderboardBackend:
+    if name == "database":
+        return DatabaseBackend()
+    if name == "local":
+        if not getattr(settings, "TESTING", False):
+            raise ImproperlyConfigured(
+                "LEADERBOARD_BACKEND='local' sólo puede usarse en los tests."
+            )
+        return SortedSetBackend(LocalSortedSets())
+    if name == "redis":
+        url = getattr(settings, "LEADERBOARD_REDIS_URL", "redis://localhost:6379/0")
+        return SortedSetBackend(redis.Redis.from_url(url, decode_responses=True))
+    raise ImproperlyConfigured(f"LEADERBOARD_BACKEND desconocido: {name}")
+
+
+def get_backend() -> LeaderboardBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = build_backend(getattr(settings, "LEADERBOARD_BACKEND", "redis"))
+        return _backend
+
+
+def reset_backend() -> None:
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+
+def display_name_key(user_id: int) -> str:
+    return f"leaderboard-name:{user_id}"
+
+
+def display_names(user_ids: Iterable[int]) -> Dict[int, Tuple[str, str]]:
+    """`{user_id: (username, nombre completo)}`, desde caché."""
+    keys = {display_name_key(u): u for u in set(user_ids)}
+    found = {keys[k]: tuple(v) for k, v in cache.get_many(keys).items()}
+
+    missing = [u for u in keys.values() if u not in found]
+    if missing:
+        loaded = {u: ("", "") for u in missing}
+        for person in (
+            Person.objects.filter(user_id__in=missing)
+            .select_related("user")
+            .only("user__id", "user__username", "first_name", "last_name")
+        ):
+            loaded[person.user_id] = (
+                person.user.username,
+                f"{person.first_name} {person.last_name}".strip(),
+            )
+        cache.set_many(
+            {display_name_key(u): names for u, names in loaded.items()},
+            getattr(settings, "LEADERBOARD_NAMES_CACHE_TIMEOUT", 3600),
+        )
+        found.update(loaded)
+    return found
+
+
+def invalidate_display_names(*user_ids) -> None:
+    user_ids = [u for u in user_ids if u]
+    if user_ids:
+        keys = [display_name_key(u) for u in user_ids]
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def add_first_correct(rows: Iterable[FirstCorrectAnswer]) -> Scores:
+    """
+    Suma al ranking los primeros aciertos recién insertados, al confirmarse
+    la transacción. Si el backend falla se registra y se sigue: el ranking
+    se corrige con `rebuild_leaderboard`.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for row in rows:
+        for scope in activity_scopes(row.activity):
+            delta = deltas[(scope, row.user_id)]
+            delta[0] += row.points
+            delta[1] += 1
+    deltas = {key: tuple(value) for key, value in deltas.items()}
+    if deltas:
+        transaction.on_commit(lambda: _apply(deltas), robust=True)
+    return deltas
+
+
+def _apply(deltas: Scores) -> None:
+    from live import services as live
+
+    get_backend().add(deltas)
+    course_ids = sorted({
+        (scope_course_id(scope), user_id)
+        for scope, user_id in deltas
+        if scope_course_id(scope)
+    })
+    live.publish(live.leaderboard_event(c, user_id) for c, user_id in course_ids)
+
+
+def refresh_scores(user_ids: Iterable[int]) -> Scores:
+    """Recalcula y guarda los puntajes de los usuarios dados en todos sus ámbitos."""
+    user_ids = list(user_ids)
+    scores = user_scores(user_ids)
+    get_backend().store(user_ids, scores)
+    return scores
+
+
+def rebuild(batch_size: int = 1000) -> int:
+    """Reemplaza el ranking por lo calculado desde `first_correct_answer`."""
+
+    def fill(backend: LeaderboardBackend) -> int:
+        user_ids = (
+            FirstCorrectAnswer.objects.order_by("user_id")
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+        total = 0
+        batch = []
+        for user_id in user_ids.iterator(chunk_size=batch_size):
+            batch.append(user_id)
+            if len(batch) >= batch_size:
+                backend.store(batch, user_scores(batch))
+                total += len(batch)
+                batch = []
+        if batch:
+            backend.store(batch, user_scores(batch))
+            total += len(batch)
+        return total
+
+    return get_backend().replace(fill)
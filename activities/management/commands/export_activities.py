@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from activities.bank import FORMATS, export_rows, guess_format, write_rows
+from activities.models.base import Activity
+from content.models import Exam
+from utils.enums import ActivityType
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta actividades en el mismo formato de banco que acepta "
+        "import_activities (JSONL o CSV)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="Archivo de salida (default: salida estándar)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Formato de salida (default: según la extensión, o jsonl)",
+        )
+        parser.add_argument(
+            "--type",
+            choices=ActivityType.values,
+            help="Opcional: limitar a un tipo de actividad",
+        )
+        parser.add_argument(
+            "--module-id",
+            type=int,
+            help="Opcional: limitar a un módulo específico (ID)",
+        )
+        parser.add_argument(
+            "--exam-id",
+            type=int,
+            help="Opcional: exportar las actividades de un examen (ID)",
+        )
+
+    def handle(self, *args, **opts):
+        activities = Activity.objects.all()
+        exam = None
+        if opts.get("type"):
+            activities = activities.filter(type=opts["type"])
+        if opts.get("module_id"):
+            activities = activities.filter(module_id=opts["module_id"])
+        if opts.get("exam_id"):
+            exam = Exam.objects.filter(pk=opts["exam_id"]).first()
+            if exam is None:
+                raise CommandError(f"El examen {opts['exam_id']} no existe.")
+            activities = activities.filter(exam_items__exam=exam)
+
+        output = opts.get("output")
+        fmt = opts["format"] or (guess_format(output) if output else "jsonl")
+        lines = write_rows(export_rows(activities, exam=exam), fmt)
+
+        if not output:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        count = -1 if fmt == "csv" else 0
+        with open(output, "w", encoding="utf-8", newline="") as stream:
+            for line in lines:
+                stream.write(line)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f"Exportadas {count} actividades."))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from datetime import time as dtime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from activities import log_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta respuestas, intentos de examen e inscripciones en Parquet, "
+        "Arrow IPC o CSV, leyendo por lotes con memoria constante."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output_dir", help="Directorio de salida")
+        parser.add_argument(
+            "--format",
+            choices=log_export.FORMATS,
+            help="Formato (default: parquet si pyarrow está instalado, si no csv)",
+        )
+        parser.add_argument(
+            "--tables",
+            nargs="+",
+            choices=list(log_export.TABLES),
+            default=list(log_export.TABLES),
+            help="Tablas a exportar (default: todas)",
+        )
+        parser.add_argument("--since", help="Desde esta fecha, incluida (YYYY-MM-DD)")
+        parser.add_argument("--until", help="Hasta esta fecha, excluida (YYYY-MM-DD)")
+        parser.add_argument(
+            "--course-id",
+            type=int,
+            help="Opcional: limitar a un curso específico (ID)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10_000,
+            help="Filas por lote (default: 10000)",
+        )
+
+    def handle(self, *args, **opts):
+        fmt = opts["format"] or log_export.default_format()
+        if fmt != "csv" and log_export.pa is None:
+            raise CommandError("pyarrow no está instalado; usa --format csv.")
+
+        filters = log_export.ExportFilters(
+            since=self._parse_date(opts.get("since")),
+            until=self._parse_date(opts.get("until")),
+            course_id=opts.get("course_id"),
+        )
+        output_dir = Path(opts["output_dir"])
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        for name in opts["tables"]:
+            path = output_dir / f"{name}.{log_export.EXTENSIONS[fmt]}"
+            started = time.perf_counter()
+            rows = log_export.write_table(
+                log_export.TABLES[name], filters, path, fmt, opts["chunk_size"]
+            )
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                self.style.SUCCESS(f"{path}: {rows} filas en {elapsed:.1f}s.")
+            )
+
+    def _parse_date(self, value):
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise CommandError(f"Fecha inválida: {value} (usa YYYY-MM-DD)")
+        return timezone.make_aware(datetime.combine(parsed, dtime.min))
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from activities.buffering import get_answer_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Vuelca las respuestas pendientes del buffer de escritura diferida, "
+        "incluidos los archivos que dejaron procesos caídos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Sigue volcando cada ANSWER_BUFFER_FLUSH_INTERVAL segundos",
+        )
+
+    def handle(self, *args, **opts):
+        buffer = get_answer_buffer()
+        while True:
+            written = buffer.flush()
+            if written or not opts["loop"]:
+                self.stdout.write(f"{written} respuestas escritas.")
+            if not opts["loop"]:
+                return
+            time.sleep(buffer.interval)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from activities.bank import FORMATS, ActivityBankImporter, guess_format, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa un banco de actividades (JSONL o CSV) de los cuatro tipos, "
+        "validando y creando por bloques."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo .jsonl o .csv")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Formato del archivo (default: según la extensión)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Filas validadas y escritas por transacción (default: 1000)",
+        )
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=20,
+            help="Cantidad máxima de errores a mostrar (default: 20)",
+        )
+
+    def handle(self, *args, **opts):
+        fmt = opts["format"] or guess_format(opts["path"])
+        importer = ActivityBankImporter(chunk_size=opts["chunk_size"])
+        try:
+            with open(opts["path"], encoding="utf-8-sig", newline="") as stream:
+                report = importer.run(read_rows(stream, fmt))
+        except OSError as exc:
+            raise CommandError(f"No se pudo leer el archivo: {exc}")
+
+        for line, message in report.errors[: opts["max_errors"]]:
+            self.stderr.write(f"Línea {line}: {message}")
+        if len(report.errors) > opts["max_errors"]:
+            self.stderr.write(f"... y {len(report.errors) - opts['max_errors']} más.")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Actividades creadas: {report.created} "
+                f"(vinculadas a exámenes: {report.linked}, "
+                f"errores: {len(report.errors)}) en {report.elapsed:.2f}s "
+                f"— {report.rows_per_second:.0f} filas/s."
+            )
+        )
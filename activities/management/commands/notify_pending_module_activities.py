@@ -8,7 +8,7 @@ from django.core.management.base import BaseCommand
 from django.template.loader import render_to_string
 from django.utils import timezone
 
-from activities.models.base import Activity, UserAnswer
+from activities.models.base import Activity, FirstCorrectAnswer
 from content.models import Course, Module
 from people.models import Student
 
@@ -100,7 +100,7 @@ class Command(BaseCommand):
                     )
                     continue
 
-                answered_ids = UserAnswer.objects.filter(
+                answered_ids = FirstCorrectAnswer.objects.filter(
                     user=user, activity__module=module
                 ).values_list("activity_id", flat=True)
 
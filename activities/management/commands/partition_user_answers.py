@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from activities import partitioning
+from activities.services import FirstCorrectAnswerService
+
+
+class Command(BaseCommand):
+    help = (
+        "Particiona user_answer por mes (PostgreSQL), crea las particiones de "
+        "los próximos meses y rellena la tabla first_correct_answer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Meses futuros para los que crear particiones (default: 3)",
+        )
+        parser.add_argument(
+            "--detach-before",
+            help="Opcional: desconectar particiones anteriores a este mes (YYYY-MM)",
+        )
+        parser.add_argument(
+            "--keep-legacy",
+            action="store_true",
+            help="Conserva la tabla original como user_answer_legacy tras copiarla",
+        )
+        parser.add_argument(
+            "--skip-rollup",
+            action="store_true",
+            help="No rellena first_correct_answer",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tamaño de lote para el relleno de first_correct_answer",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="No modifica nada; solo imprime el SQL que se ejecutaría",
+        )
+
+    def handle(self, *args, **opts):
+        detach_before = self._parse_month(opts.get("detach_before"))
+        dry_run = opts["dry_run"]
+
+        if not opts["skip_rollup"] and not dry_run:
+            inserted = FirstCorrectAnswerService.backfill(opts["batch_size"])
+            self.stdout.write(f"first_correct_answer: {inserted} filas nuevas.")
+
+        if not partitioning.supports_partitioning(connection):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{connection.vendor}: sin particiones nativas, se omite el "
+                    "particionado de user_answer."
+                )
+            )
+            return
+
+        today = timezone.localdate()
+        with connection.cursor() as cursor:
+            if partitioning.is_partitioned(cursor):
+                statements = partitioning.plan_ensure_partitions(
+                    cursor, today, opts["months_ahead"]
+                )
+            else:
+                try:
+                    statements = partitioning.plan_conversion(
+                        cursor, today, opts["months_ahead"], opts["keep_legacy"]
+                    )
+                except partitioning.PartitioningError as exc:
+                    raise CommandError(str(exc))
+
+        if detach_before:
+            if detach_before > partitioning.month_start(today):
+                raise CommandError("--detach-before no puede ser un mes futuro.")
+            if opts["skip_rollup"]:
+                raise CommandError(
+                    "--detach-before requiere rellenar first_correct_answer antes."
+                )
+            with connection.cursor() as cursor:
+                if partitioning.is_partitioned(cursor):
+                    statements += partitioning.plan_detach(cursor, detach_before)
+
+        if dry_run:
+            for sql in statements:
+                self.stdout.write(f"{sql};")
+            return
+
+        partitioning.apply(statements, connection)
+        self.stdout.write(
+            self.style.SUCCESS(f"user_answer: {len(statements)} sentencias aplicadas.")
+        )
+
+    def _parse_month(self, value):
+        if not value:
+            return None
+        try:
+            year, month = value.split("-")
+            return date(int(year), int(month), 1)
+        except ValueError:
+            raise CommandError(f"Mes inválido: {value} (usa YYYY-MM)")
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from activities import leaderboard
+from activities.services import FirstCorrectAnswerService
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el ranking en el backend configurado (LEADERBOARD_BACKEND) "
+        "a partir de las respuestas correctas de user_answer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--skip-backfill",
+            action="store_true",
+            help="No completar first_correct_answer desde user_answer antes",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Usuarios por lote (default: 1000)",
+        )
+
+    def handle(self, *args, **opts):
+        if not opts["skip_backfill"]:
+            created = FirstCorrectAnswerService.backfill(opts["batch_size"])
+            self.stdout.write(f"{created} aciertos nuevos en first_correct_answer.")
+
+        users = leaderboard.rebuild(opts["batch_size"])
+        backend = getattr(settings, "LEADERBOARD_BACKEND", "database")
+        self.stdout.write(
+            self.style.SUCCESS(f"Ranking reconstruido ({backend}): {users} usuarios.")
+        )
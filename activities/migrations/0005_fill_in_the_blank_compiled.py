@@ -0,0 +1,85 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:46
+
+import unicodedata
+
+from django.db import migrations, models
+
+# Copia de `activities.blanks` al momento de esta migración, para que cambios
+# posteriores en la app no alteren lo que hace.
+BLANK_PLACEHOLDER = "{{blank}}"
+
+
+def normalize_answer(value, accent_sensitive=True):
+    value = unicodedata.normalize("NFC", str(value)).strip().casefold()
+    if accent_sensitive:
+        return value
+    stripped = "".join(
+        c for c in unicodedata.normalize("NFD", value) if not unicodedata.combining(c)
+    )
+    return unicodedata.normalize("NFC", stripped)
+
+
+def compile_blanks(text, answers, accent_sensitive=True):
+    segments = text.split(BLANK_PLACEHOLDER)
+    offsets, position = [], 0
+    for segment in segments[:-1]:
+        position += len(segment)
+        offsets.append(position)
+        position += len(BLANK_PLACEHOLDER)
+
+    keys = list(answers)
+    return {
+        "blank_count": len(offsets),
+        "segments": segments,
+        "offsets": offsets,
+        "keys": keys,
+        "answers": [normalize_answer(answers[k], accent_sensitive) for k in keys],
+    }
+
+
+def compile_existing(apps, schema_editor):
+    FillInTheBlankActivity = apps.get_model("activities", "FillInTheBlankActivity")
+    batch = []
+    for activity in FillInTheBlankActivity.objects.iterator(chunk_size=500):
+        activity.compiled = compile_blanks(
+            activity.text, activity.correct_answers or {}, activity.accent_sensitive
+        )
+        batch.append(activity)
+        if len(batch) >= 500:
+            FillInTheBlankActivity.objects.bulk_update(batch, ["compiled"])
+            batch = []
+    if batch:
+        FillInTheBlankActivity.objects.bulk_update(batch, ["compiled"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activities", "0004_useranswer_exam_attempt_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fillintheblankactivity",
+            name="accent_sensitive",
+            field=models.BooleanField(
+                default=True,
+                help_text=(
+                    "Si está desmarcado, las tildes no cuentan al comparar respuestas"
+                ),
+            ),
+        ),
+        migrations.AddField(
+            model_name="fillintheblankactivity",
+            name="compiled",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text=(
+                    "Segmentos, posiciones y respuestas normalizadas "
+                    "(se calcula al guardar)"
+                ),
+            ),
+        ),
+        migrations.RunPython(compile_existing, migrations.RunPython.noop),
+    ]
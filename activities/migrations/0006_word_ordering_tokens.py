@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:47
+
+import re
+
+from django.db import migrations, models
+
+# Versión congelada de `activities.tokens.tokenize_sentence`: la migración no
+# depende del tokenizador actual de la app.
+PUNCTUATION_PATTERN = re.compile(r"\w+(?:['’-]\w+)*|[^\w\s]")
+
+
+def tokenize_sentence(sentence, tokenizer="whitespace"):
+    sentence = (sentence or "").strip()
+    if tokenizer == "punctuation":
+        return PUNCTUATION_PATTERN.findall(sentence)
+    return sentence.split()
+
+
+def tokenize_existing(apps, schema_editor):
+    WordOrderingActivity = apps.get_model("activities", "WordOrderingActivity")
+    batch = []
+    for activity in WordOrderingActivity.objects.iterator(chunk_size=500):
+        activity.tokens = tokenize_sentence(activity.sentence, activity.tokenizer)
+        batch.append(activity)
+        if len(batch) >= 500:
+            WordOrderingActivity.objects.bulk_update(batch, ["tokens"])
+            batch = []
+    if batch:
+        WordOrderingActivity.objects.bulk_update(batch, ["tokens"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activities", "0005_fill_in_the_blank_compiled"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="wordorderingactivity",
+            name="tokenizer",
+            field=models.CharField(
+                choices=[
+                    ("whitespace", "Separar por espacios"),
+                    ("punctuation", "Separar también la puntuación"),
+                ],
+                default="whitespace",
+                help_text="Cómo se divide la oración en fichas",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="wordorderingactivity",
+            name="tokens",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                help_text="Fichas en el orden correcto (se calcula al guardar)",
+            ),
+        ),
+        migrations.RunPython(tokenize_existing, migrations.RunPython.noop),
+    ]
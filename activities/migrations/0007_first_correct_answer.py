@@ -0,0 +1,109 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+def backfill_first_correct(apps, schema_editor):
+    UserAnswer = apps.get_model("activities", "UserAnswer")
+    FirstCorrectAnswer = apps.get_model("activities", "FirstCorrectAnswer")
+    rows = (
+        UserAnswer.objects.filter(
+            is_correct=True, user__isnull=False, activity__isnull=False
+        )
+        .values("user_id", "activity_id")
+        .annotate(first_correct_at=Min("answered_at"), points=Max("activity__points"))
+        .order_by()
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        batch.append(FirstCorrectAnswer(**row))
+        if len(batch) >= 1000:
+            FirstCorrectAnswer.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        FirstCorrectAnswer.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activities", "0006_word_ordering_tokens"),
+        ("content", "0006_vocabularycapture"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FirstCorrectAnswer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("first_correct_at", models.DateTimeField()),
+                (
+                    "points",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Puntos de la actividad al momento de acertarla",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "First Correct Answer",
+                "verbose_name_plural": "First Correct Answers",
+                "db_table": "first_correct_answer",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="useranswer",
+            index=models.Index(
+                fields=["answered_at"], name="user_answer_answere_ee7e2f_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="firstcorrectanswer",
+            name="activity",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="first_correct_answers",
+                to="activities.activity",
+            ),
+        ),
+        migrations.AddField(
+            model_name="firstcorrectanswer",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="first_correct_answers",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="firstcorrectanswer",
+            index=models.Index(
+                fields=["activity", "first_correct_at"],
+                name="first_corre_activit_a2d5a2_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="firstcorrectanswer",
+            index=models.Index(
+                fields=["first_correct_at"], name="first_corre_first_c_f67125_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="firstcorrectanswer",
+            constraint=models.UniqueConstraint(
+                fields=("user", "activity"), name="uq_first_correct_user_activity"
+            ),
+        ),
+        migrations.RunPython(backfill_first_correct, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_scores(apps, schema_editor):
+    FirstCorrectAnswer = apps.get_model("activities", "FirstCorrectAnswer")
+    LeaderboardScore = apps.get_model("activities", "LeaderboardScore")
+    groupings = {
+        "all": None,
+        "course": "activity__module__course_id",
+        "language": "activity__module__course__language_id",
+    }
+    for prefix, field in groupings.items():
+        keys = ["user_id"] + ([field] if field else [])
+        rows = (
+            FirstCorrectAnswer.objects.values(*keys)
+            .annotate(total_points=Sum("points"), activities_count=Count("id"))
+            .order_by()
+        )
+        if field:
+            rows = rows.filter(**{f"{field}__isnull": False})
+        batch = []
+        for row in rows.iterator(chunk_size=1000):
+            scope = f"{prefix}:{row[field]}" if field else prefix
+            batch.append(
+                LeaderboardScore(
+                    scope=scope,
+                    user_id=row["user_id"],
+                    total_points=row["total_points"] or 0,
+                    activities_count=row["activities_count"],
+                )
+            )
+            if len(batch) >= 1000:
+                LeaderboardScore.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        if batch:
+            LeaderboardScore.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activities", "0008_learner_features"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope", models.CharField(max_length=50)),
+                ("total_points", models.PositiveIntegerField(default=0)),
+                ("activities_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard_scores",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Leaderboard Score",
+                "verbose_name_plural": "Leaderboard Scores",
+                "db_table": "leaderboard_score",
+                "indexes": [
+                    models.Index(
+                        fields=["scope", "-total_points", "user"],
+                        name="leaderboard_scope_rank_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("scope", "user"), name="uq_leaderboard_scope_user"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+    ]
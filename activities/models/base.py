@@ -4,6 +4,13 @@ from content.models import Exam, Module
 from users.models import User
 from utils.enums import ActivityType, DifficultyLevel
 
+SUBCLASS_RELATIONS = (
+    "choiceactivity",
+    "fillintheblankactivity",
+    "matchingactivity",
+    "wordorderingactivity",
+)
+
 
 class Activity(models.Model):
     class Meta:
@@ -42,6 +49,17 @@ class Activity(models.Model):
     def __str__(self):
         return f"{self.title} ({self.get_type_display()}) - {self.get_difficulty_display()}"  # noqa: E501
 
+    def as_subclass(self, model):
+        """
+        Devuelve la actividad como instancia de `model`.
+
+        Si la fila hija ya vino con `select_related(*SUBCLASS_RELATIONS)` no
+        hace otra consulta.
+        """
+        if isinstance(self, model):
+            return self
+        return getattr(self, model._meta.model_name)
+
 
 class ExamActivity(models.Model):
     class Meta:
@@ -70,6 +88,7 @@ class UserAnswer(models.Model):
         indexes = [
             models.Index(fields=["user", "activity", "is_correct"]),
             models.Index(fields=["exam_attempt", "activity"]),
+            models.Index(fields=["answered_at"]),
         ]
 
     user = models.ForeignKey(
@@ -93,3 +112,92 @@ class UserAnswer(models.Model):
     response_data = models.JSONField()
     is_correct = models.BooleanField()
     answered_at = models.DateTimeField(auto_now_add=True)
+
+
+class FirstCorrectAnswer(models.Model):
+    """Primera respuesta correcta de cada usuario a cada actividad."""
+
+    class Meta:
+        db_table = "first_correct_answer"
+        verbose_name = "First Correct Answer"
+        verbose_name_plural = "First Correct Answers"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "activity"], name="uq_first_correct_user_activity"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["activity", "first_correct_at"]),
+            models.Index(fields=["first_correct_at"]),
+        ]
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="first_correct_answers"
+    )
+    activity = models.ForeignKey(
+        Activity, on_delete=models.CASCADE, related_name="first_correct_answers"
+    )
+    first_correct_at = models.DateTimeField()
+    points = models.PositiveIntegerField(
+        default=0, help_text="Puntos de la actividad al momento de acertarla"
+    )
+
+    def __str__(self):
+        return f"{self.user_id} - {self.activity_id}"
+
+
+class LearnerFeatures(models.Model):
+    """
+    Vector de características precalculado de un usuario para recomendar
+    actividades; se recalcula en segundo plano tras cada envío.
+    """
+
+    class Meta:
+        db_table = "learner_features"
+        verbose_name = "Learner Features"
+        verbose_name_plural = "Learner Features"
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="learner_features"
+    )
+    features = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Features de {self.user}"
+
+
+class LeaderboardScore(models.Model):
+    """
+    Puntaje acumulado de un usuario dentro de un ámbito del ranking.
+
+    `scope` es `all`, `course:<id>` o `language:<id>`; el índice
+    (scope, -total_points, user) sirve el top, la posición y los vecinos.
+    """
+
+    class Meta:
+        db_table = "leaderboard_score"
+        verbose_name = "Leaderboard Score"
+        verbose_name_plural = "Leaderboard Scores"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "user"], name="uq_leaderboard_scope_user"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["scope", "-total_points", "user"],
+                name="leaderboard_scope_rank_idx",
+            ),
+        ]
+
+    scope = models.CharField(max_length=50)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="leaderboard_scores"
+    )
+    total_points = models.PositiveIntegerField(default=0)
+    activities_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} [{self.scope}]: {self.total_points}"
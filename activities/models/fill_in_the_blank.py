@@ -1,5 +1,7 @@
 from django.db import models
 
+from activities.blanks import compile_blanks
+
 from .base import Activity
 
 
@@ -15,3 +17,26 @@ class FillInTheBlankActivity(Activity):
     correct_answers = models.JSONField(
         help_text="Diccionario de índices y respuestas correctas, p.ej. {'0': 'París'}"
     )
+    accent_sensitive = models.BooleanField(
+        default=True,
+        help_text="Si está desmarcado, las tildes no cuentan al comparar respuestas",
+    )
+    compiled = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Segmentos, posiciones y respuestas normalizadas (se calcula al guardar)",  # noqa: E501
+    )
+
+    def compile(self):
+        self.compiled = compile_blanks(
+            self.text, self.correct_answers or {}, self.accent_sensitive
+        )
+        return self.compiled
+
+    def save(self, *args, **kwargs):
+        self.compile()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "compiled"}
+        super().save(*args, **kwargs)
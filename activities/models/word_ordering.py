@@ -1,5 +1,8 @@
 from django.db import models
 
+from activities.tokens import tokenize_sentence
+from utils.enums import WordTokenizer
+
 from .base import Activity
 
 
@@ -12,3 +15,26 @@ class WordOrderingActivity(Activity):
     sentence = models.TextField(
         help_text="Oración correcta, p.ej. 'El gato está durmiendo'"
     )
+    tokenizer = models.CharField(
+        max_length=20,
+        choices=WordTokenizer.choices,
+        default=WordTokenizer.WHITESPACE,
+        help_text="Cómo se divide la oración en fichas",
+    )
+    tokens = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Fichas en el orden correcto (se calcula al guardar)",
+    )
+
+    def tokenize(self):
+        self.tokens = tokenize_sentence(self.sentence, self.tokenizer)
+        return self.tokens
+
+    def save(self, *args, **kwargs):
+        self.tokenize()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "tokens"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,262 @@
+"""
+Particionado mensual de `user_answer` por `answered_at` (solo PostgreSQL).
+
+Las funciones `plan_*` devuelven la lista de sentencias SQL a ejecutar, de
+modo que el comando de gestión pueda mostrarlas en modo `--dry-run` antes de
+aplicarlas con `apply`. En otros motores no hay particiones: el índice sobre
+`answered_at` y la tabla `first_correct_answer` cubren las consultas calientes.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from django.db import connection as default_connection
+from django.db import transaction
+
+from activities.models.base import UserAnswer
+
+TABLE = UserAnswer._meta.db_table
+LEGACY_TABLE = f"{TABLE}_legacy"
+SEQUENCE = f"{TABLE}_id_seq_part"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+class PartitioningError(Exception):
+    pass
+
+
+def supports_partitioning(connection=default_connection) -> bool:
+    return connection.vendor == "postgresql"
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def months_between(start: date, end: date):
+    month = month_start(start)
+    while month <= end:
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_bounds(month: date) -> str:
+    return f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+
+
+def create_partition_sql(month: date, qn) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {qn(partition_name(month))} "
+        f"PARTITION OF {qn(TABLE)} FOR VALUES {partition_bounds(month)}"
+    )
+
+
+def move_from_default_sql(month: date, qn) -> list[str]:
+    """
+    Crea la partición del mes sacando antes de la DEFAULT las filas que le
+    corresponden: Postgres no permite crearla mientras la DEFAULT las tenga.
+    """
+    name = qn(partition_name(month))
+    return [
+        f"CREATE TABLE {name} (LIKE {qn(TABLE)} INCLUDING DEFAULTS)",
+        f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} "
+        f"WHERE answered_at >= '{month.isoformat()}' "
+        f"AND answered_at < '{add_months(month, 1).isoformat()}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {qn(TABLE)} ATTACH PARTITION {name} "
+        f"FOR VALUES {partition_bounds(month)}",
+    ]
+
+
+def is_partitioned(cursor) -> bool:
+    cursor.execute(
+        "SELECT relkind FROM pg_class WHERE relname = %s AND relkind IN ('r', 'p')",
+        [TABLE],
+    )
+    row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def existing_partitions(cursor) -> list[str]:
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = %s
+        ORDER BY child.relname
+        """,
+        [TABLE],
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def referencing_foreign_keys(cursor) -> list[tuple[str, str]]:
+    """FKs de otras tablas hacia `user_answer`, como `(tabla, restricción)`."""
+    cursor.execute(
+        """
+        SELECT conrelid::regclass::text, conname
+        FROM pg_constraint
+        WHERE confrelid = %s::regclass AND contype = 'f'
+        ORDER BY 1, 2
+        """,
+        [TABLE],
+    )
+    return cursor.fetchall()
+
+
+def default_has_rows(cursor, month: date) -> bool:
+    qn = default_connection.ops.quote_name
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {qn(DEFAULT_PARTITION)} "
+        "WHERE answered_at >= %s AND answered_at < %s)",
+        [month, add_months(month, 1)],
+    )
+    return cursor.fetchone()[0]
+
+
+def plan_conversion(
+    cursor, today: date, months_ahead: int = 3, keep_legacy: bool = False
+) -> list[str]:
+    """
+    Convierte `user_answer` en una tabla particionada por rango de
+    `answered_at`, copiando los datos existentes.
+
+    La clave primaria pasa a ser `(id, answered_at)` (requisito de Postgres
+    para tablas particionadas) y `id` se alimenta de una secuencia propia. Se
+    conservan los nombres de índices y FKs para que las migraciones de Django
+    sigan encontrándolos.
+
+    Como `id` deja de ser único por sí solo, ninguna FK puede apuntar a
+    `user_answer.id`; si existe alguna se aborta sin tocar nada.
+    """
+    qn = default_connection.ops.quote_name
+
+    referencing = referencing_foreign_keys(cursor)
+    if referencing:
+        raise PartitioningError(
+            "No se puede particionar user_answer: la clave primaria pasa a ser "
+            "(id, answered_at) y estas FKs apuntan a user_answer.id: "
+            + ", ".join(f"{table}.{name}" for table, name in referencing)
+        )
+
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE tablename = %s AND indexname <> %s",
+        [TABLE, f"{TABLE}_pkey"],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f'
+        """,
+        [TABLE],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(f"SELECT MIN(answered_at), MAX(id) FROM {qn(TABLE)}")
+    oldest, max_id = cursor.fetchone()
+
+    first_month = month_start(oldest.date() if oldest else today)
+    last_month = add_months(month_start(today), months_ahead)
+
+    statements = [f"ALTER TABLE {qn(TABLE)} RENAME TO {qn(LEGACY_TABLE)}"]
+    for name, _ in indexes:
+        statements.append(
+            f"ALTER INDEX {qn(name)} RENAME TO {qn(f'{name[:55]}_legacy')}"
+        )
+    for name, _ in foreign_keys:
+        statements.append(
+            f"ALTER TABLE {qn(LEGACY_TABLE)} RENAME CONSTRAINT {qn(name)} "
+            f"TO {qn(f'{name[:55]}_legacy')}"
+        )
+
+    statements += [
+        f"CREATE TABLE {qn(TABLE)} (LIKE {qn(LEGACY_TABLE)} INCLUDING DEFAULTS) "
+        f"PARTITION BY RANGE (answered_at)",
+        f"CREATE SEQUENCE IF NOT EXISTS {qn(SEQUENCE)} OWNED BY {qn(TABLE)}.id",
+        f"ALTER TABLE {qn(TABLE)} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')",
+        f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(f'{TABLE}_pkey')} "
+        f"PRIMARY KEY (id, answered_at)",
+    ]
+    statements += [
+        create_partition_sql(month, qn)
+        for month in months_between(first_month, last_month)
+    ]
+    statements.append(
+        f"CREATE TABLE IF NOT EXISTS {qn(DEFAULT_PARTITION)} "
+        f"PARTITION OF {qn(TABLE)} DEFAULT"
+    )
+
+    statements.append(
+        f"INSERT INTO {qn(TABLE)} SELECT * FROM {qn(LEGACY_TABLE)} ORDER BY id"
+    )
+    statements.append(f"SELECT setval('{SEQUENCE}', {max(max_id or 0, 1)})")
+    statements += [definition for _, definition in indexes]
+    statements += [
+        f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(name)} {definition}"
+        for name, definition in foreign_keys
+    ]
+    if not keep_legacy:
+        statements.append(f"DROP TABLE {qn(LEGACY_TABLE)}")
+    return statements
+
+
+def plan_ensure_partitions(cursor, today: date, months_ahead: int = 3) -> list[str]:
+    """
+    Crea por adelantado las particiones de los próximos meses. Si la
+    partición DEFAULT ya recibió filas de alguno de esos meses, se mueven a la
+    partición nueva.
+    """
+    qn = default_connection.ops.quote_name
+    existing = set(existing_partitions(cursor))
+    statements = []
+    for month in months_between(
+        month_start(today), add_months(month_start(today), months_ahead)
+    ):
+        if partition_name(month) in existing:
+            continue
+        if DEFAULT_PARTITION in existing and default_has_rows(cursor, month):
+            statements += move_from_default_sql(month, qn)
+        else:
+            statements.append(create_partition_sql(month, qn))
+    return statements
+
+
+def plan_detach(cursor, before: date) -> list[str]:
+    """
+    Desconecta las particiones mensuales anteriores a `before`.
+
+    Las tablas quedan en la base como archivo y dejan de aparecer en las
+    consultas sobre `user_answer`.
+    """
+    qn = default_connection.ops.quote_name
+    prefix = f"{TABLE}_p"
+    cutoff = month_start(before)
+    statements = []
+    for name in existing_partitions(cursor):
+        suffix = name.removeprefix(prefix)
+        if name == suffix or not suffix.isdigit() or len(suffix) != 6:
+            continue
+        month = date(int(suffix[:4]), int(suffix[4:]), 1)
+        if month < cutoff:
+            statements.append(f"ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(name)}")
+    return statements
+
+
+def apply(statements: list[str], connection=default_connection) -> None:
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
@@ -0,0 +1,213 @@
+"""
+Recomendación de las próximas actividades de un curso para un estudiante.
+
+La petición no recorre `user_answer`: usa el vector de características del
+usuario (`LearnerFeatures`, recalculado por un job tras cada envío), los
+aciertos de `first_correct_answer` y un índice de candidatas por módulo
+guardado en caché.
+
+Cada módulo tiene una versión en la caché compartida que forma parte de la
+clave del índice. Invalidar cambia la versión en vez de borrar la entrada: lo
+que otra petición guarde con datos anteriores queda bajo una clave que ya no
+se lee.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from activities.models.base import (
+    Activity,
+    FirstCorrectAnswer,
+    LearnerFeatures,
+    UserAnswer,
+)
+from content.models import Module
+
+TARGET_SUCCESS = 0.7
+RECENT_FAILURES = 50
+WEIGHTS = {"fit": 0.4, "weakness": 0.2, "urgency": 0.25, "retry": 0.1, "points": 0.05}
+
+
+def _smoothed(stats: Dict[str, int] | None) -> float:
+    stats = stats or {}
+    return (stats.get("correct", 0) + 1) / (stats.get("attempts", 0) + 2)
+
+
+def compute_features(user_id: int) -> dict:
+    """Aciertos por dificultad y por tipo, y actividades falladas sin resolver."""
+    rows = (
+        UserAnswer.objects.filter(user_id=user_id, activity__isnull=False)
+        .values("activity__difficulty", "activity__type")
+        .annotate(attempts=Count("id"), correct=Count("id", filter=Q(is_correct=True)))
+        .order_by()
+    )
+    by_difficulty: Dict[str, Dict[str, int]] = {}
+    by_type: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        for bucket, key in (
+            (by_difficulty, row["activity__difficulty"]),
+            (by_type, row["activity__type"]),
+        ):
+            stats = bucket.setdefault(key, {"attempts": 0, "correct": 0})
+            stats["attempts"] += row["attempts"]
+            stats["correct"] += row["correct"]
+
+    solved = FirstCorrectAnswer.objects.filter(user_id=user_id).values("activity_id")
+    failed = list(
+        UserAnswer.objects.filter(user_id=user_id, is_correct=False)
+        .exclude(activity_id__in=solved)
+        .order_by("-answered_at")
+        .values_list("activity_id", flat=True)[: RECENT_FAILURES * 4]
+    )
+    return {
+        "difficulty": by_difficulty,
+        "type": by_type,
+        "failed": list(dict.fromkeys(failed))[:RECENT_FAILURES],
+    }
+
+
+def refresh_features(user_id: int) -> LearnerFeatures:
+    features, _ = LearnerFeatures.objects.update_or_create(
+        user_id=user_id, defaults={"features": compute_features(user_id)}
+    )
+    return features
+
+
+def candidates_version_key(module_id: int) -> str:
+    return f"recommendation-candidates:{module_id}:version"
+
+
+def candidates_cache_key(module_id: int, version: str) -> str:
+    return f"recommendation-candidates:{module_id}:{version}"
+
+
+def _new_versions(module_ids) -> Dict[int, str]:
+    versions = {m: uuid.uuid4().hex for m in module_ids}
+    cache.set_many(
+        {candidates_version_key(m): v for m, v in versions.items()}, timeout=None
+    )
+    return versions
+
+
+def invalidate_candidates(*module_ids) -> None:
+    """Cambia la versión de los módulos, ahora y al confirmar la transacción."""
+    module_ids = {m for m in module_ids if m}
+    if module_ids:
+        _new_versions(module_ids)
+        transaction.on_commit(lambda: _new_versions(module_ids))
+
+
+def candidate_versions(module_ids: List[int]) -> Dict[int, str]:
+    keys = {candidates_version_key(m): m for m in module_ids}
+    versions = {keys[k]: v for k, v in cache.get_many(keys).items()}
+    missing = [m for m in module_ids if m not in versions]
+    if missing:
+        versions.update(_new_versions(missing))
+    return versions
+
+
+def module_candidates(module_ids: List[int]) -> Dict[int, List[dict]]:
+    """Actividades de cada módulo (`{module_id: [fila, ...]}`), desde caché."""
+    versions = candidate_versions(module_ids)
+    keys = {candidates_cache_key(m, versions[m]): m for m in module_ids}
+    cached = cache.get_many(keys)
+    found = {keys[k]: v for k, v in cached.items()}
+
+    missing = [m for m in module_ids if m not in found]
+    if missing:
+        loaded = {m: [] for m in missing}
+        for row in (
+            Activity.objects.filter(module_id__in=missing)
+            .order_by("id")
+            .values("id", "title", "type", "difficulty", "points", "module_id")
+        ):
+            loaded[row["module_id"]].append(row)
+        timeout = getattr(settings, "RECOMMENDATION_CANDIDATES_CACHE_TIMEOUT", 3600)
+        cache.set_many(
+            {candidates_cache_key(m, versions[m]): rows for m, rows in loaded.items()},
+            timeout,
+        )
+        found.update(loaded)
+    return found
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    activity: dict
+    module_name: str
+    score: float
+
+
+class RecommendationService:
+    def __init__(self, user, course):
+        self.user = user
+        self.course = course
+
+    def _urgency(self, end_date, now) -> float:
+        if end_date is None:
+            return 0.0
+        days_left = (end_date - now).total_seconds() / 86400
+        if days_left < 0:
+            return 0.5
+        return 1 / (1 + days_left)
+
+    def recommend(self, limit: int = 5) -> List[Recommendation]:
+        now = timezone.now()
+        row = LearnerFeatures.objects.filter(user=self.user).first()
+        features = row.features if row else {}
+        by_difficulty = features.get("difficulty", {})
+        by_type = features.get("type", {})
+        failed = set(features.get("failed", []))
+
+        modules = {
+            m["id"]: m
+            for m in Module.objects.filter(course=self.course).values(
+                "id", "name", "end_date"
+            )
+        }
+        solved = set(
+            FirstCorrectAnswer.objects.filter(
+                user=self.user, activity__module__course=self.course
+            ).values_list("activity_id", flat=True)
+        )
+        candidates = module_candidates(list(modules))
+        max_points = max(
+            (a["points"] for rows in candidates.values() for a in rows), default=0
+        )
+
+        scored = []
+        for module_id, rows in candidates.items():
+            module = modules[module_id]
+            urgency = self._urgency(module["end_date"], now)
+            for activity in rows:
+                if activity["id"] in solved:
+                    continue
+                fit = 1 - abs(
+                    _smoothed(by_difficulty.get(activity["difficulty"]))
+                    - TARGET_SUCCESS
+                )
+                weakness = 1 - _smoothed(by_type.get(activity["type"]))
+                score = (
+                    WEIGHTS["fit"] * fit
+                    + WEIGHTS["weakness"] * weakness
+                    + WEIGHTS["urgency"] * urgency
+                    + WEIGHTS["retry"] * (activity["id"] in failed)
+                    + WEIGHTS["points"]
+                    * (activity["points"] / max_points if max_points else 0)
+                )
+                scored.append((score, activity["id"], activity, module["name"]))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            Recommendation(activity=activity, module_name=name, score=round(score, 4))
+            for score, _, activity, name in scored[:limit]
+        ]
@@ -1,12 +1,16 @@
 from rest_framework import serializers
 
+from utils.projections import ValuesProjection
+from utils.serializers import SelectableFieldsMixin
+from utils.shuffling import make_seed
+
 from .models.base import Activity, ExamActivity, UserAnswer
 from .models.choice import Choice
 from .models.matching import MatchingPair
 from .strategies.payload.registry import PayloadStrategyRegistry
 
 
-class ActivitySerializer(serializers.ModelSerializer):
+class ActivitySerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     payload = serializers.SerializerMethodField()
 
     class Meta:
@@ -21,10 +25,20 @@ class ActivitySerializer(serializers.ModelSerializer):
             "payload",
         )
 
+    def get_shuffle_seed(self, obj):
+        scope = self.context.get("shuffle_scope")
+        if scope is None:
+            user = getattr(self.context.get("request"), "user", None)
+            if not user or not user.is_authenticated:
+                # Sin usuario no hay orden que mantener: uno distinto por vez.
+                return None
+            scope = ("user", user.pk)
+        return make_seed(*scope, obj.pk)
+
     def get_payload(self, obj):
         strategy = PayloadStrategyRegistry.get_strategy(obj.type)
         if strategy:
-            return strategy.get_payload(obj)
+            return strategy.get_payload(obj, seed=self.get_shuffle_seed(obj))
         raise NotImplementedError(
             "No payload strategy found for activity type: {}".format(obj.type)
         )
@@ -69,6 +83,11 @@ class WordOrderingAnswerInputSerializer(serializers.Serializer):
 
 
 class UserAnswerSerializer(serializers.ModelSerializer):
+    """
+    Resultado de una respuesta. No incluye el id: con `ANSWER_BUFFER_ENABLED`
+    la fila se escribe después, en el volcado del buffer.
+    """
+
     class Meta:
         model = UserAnswer
         fields = ["is_correct"]
@@ -81,3 +100,20 @@ class LeaderboardEntrySerializer(serializers.Serializer):
     total_points = serializers.IntegerField()
     activities_count = serializers.IntegerField()
     position = serializers.IntegerField()
+
+
+class LeaderboardSerializer(serializers.Serializer):
+    top = LeaderboardEntrySerializer(many=True)
+    me = LeaderboardEntrySerializer(allow_null=True)
+    neighbors = LeaderboardEntrySerializer(many=True)
+
+
+class LeaderboardEntryProjection(ValuesProjection):
+    fields = {
+        "user_id": "user_id",
+        "username": "username",
+        "full_name": "full_name",
+        "total_points": "total_points",
+        "activities_count": "activities_count",
+        "position": "position",
+    }
@@ -1,20 +1,205 @@
 from datetime import timedelta
 from typing import Any, Dict, Iterable, List, Optional
 
-from django.db import transaction
-from django.db.models import Count, F, QuerySet, Sum, Window
-from django.db.models.functions import Rank
+from django.db import connections, router, transaction
+from django.db.models import Max, Min, QuerySet
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
-from activities.models.base import Activity, UserAnswer
-from activities.models.matching import MatchingActivity
+from activities import leaderboard
+from activities.models.base import (
+    SUBCLASS_RELATIONS,
+    Activity,
+    FirstCorrectAnswer,
+    UserAnswer,
+)
+from activities.models.matching import MatchingPair
 from activities.strategies.validation.registry import ValidationStrategyRegistry
-from content.models import Course, Vocabulary
-from people.models import Enrollment, EnrollmentStatus, Person, Student
+from activities.tasks import (
+    CAPTURE_VOCABULARY,
+    REFRESH_FEATURES,
+    UPDATE_PROGRESS,
+)
+from content import proctoring
+from content.models import Vocabulary, VocabularyCapture
+from jobs.services import JobQueue
+from people.models import Enrollment, EnrollmentStatus, Student
 from utils.enums import ActivityType
 
 
+class VocabularyCaptureService:
+    """
+    Captura el vocabulario de actividades de emparejamiento ya acertadas.
+
+    Las capturas se registran en `VocabularyCapture`; un set en memoria de
+    claves (student_id, activity_id) evita volver a consultar o escribir para
+    actividades que ya se capturaron en este proceso.
+    """
+
+    MAX_CACHED_KEYS = 50_000
+    _captured: set = set()
+
+    @classmethod
+    def clear_cache(cls):
+        cls._captured.clear()
+
+    @classmethod
+    def _remember(cls, student_id: int, activity_ids: Iterable[int]):
+        if len(cls._captured) >= cls.MAX_CACHED_KEYS:
+            cls._captured.clear()
+        cls._captured.update((student_id, a) for a in activity_ids)
+
+    @classmethod
+    def capture(cls, user, activity_ids: Iterable[int]) -> int:
+        activity_ids = set(activity_ids)
+        if not activity_ids:
+            return 0
+
+        student_id = (
+            Student.objects.filter(person__user=user)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if student_id is None:
+            return 0
+
+        pending = {a for a in activity_ids if (student_id, a) not in cls._captured}
+        if not pending:
+            return 0
+
+        already = set(
+            VocabularyCapture.objects.filter(
+                student_id=student_id, activity_id__in=pending
+            ).values_list("activity_id", flat=True)
+        )
+        cls._remember(student_id, already)
+        pending -= already
+        if not pending:
+            return 0
+
+        vocab_to_create = [
+            Vocabulary(
+                student_id=student_id,
+                word=row["left"],
+                meaning=row["right"],
+                difficulty=row["activity__difficulty"],
+            )
+            for row in MatchingPair.objects.filter(
+                activity_id__in=pending, is_vocabulary=True
+            ).values("left", "right", "activity__difficulty")
+        ]
+
+        with transaction.atomic():
+            if vocab_to_create:
+                Vocabulary.objects.bulk_create(vocab_to_create, ignore_conflicts=True)
+            VocabularyCapture.objects.bulk_create(
+                [
+                    VocabularyCapture(student_id=student_id, activity_id=a)
+                    for a in pending
+                ],
+                ignore_conflicts=True,
+            )
+        cls._remember(student_id, pending)
+        return len(vocab_to_create)
+
+
+class FirstCorrectAnswerService:
+    """Mantiene la tabla `FirstCorrectAnswer` a partir del log de respuestas."""
+
+    @classmethod
+    def record(cls, user_answers: Iterable[UserAnswer]) -> List[FirstCorrectAnswer]:
+        """
+        Registra los primeros aciertos y suma al ranking sólo los que esta
+        llamada insertó; devuelve esas filas.
+        """
+        rows = {}
+        for answer in user_answers:
+            if not answer.is_correct or not answer.user_id or not answer.activity_id:
+                continue
+            rows.setdefault(
+                (answer.user_id, answer.activity_id),
+                FirstCorrectAnswer(
+                    user_id=answer.user_id,
+                    activity=answer.activity,
+                    first_correct_at=answer.answered_at,
+                    points=answer.activity.points,
+                ),
+            )
+        if not rows:
+            return []
+        inserted = cls._insert_new(list(rows.values()))
+        created = [rows[key] for key in rows if key in inserted]
+        leaderboard.add_first_correct(created)
+        return created
+
+    @staticmethod
+    def _insert_new(rows: List[FirstCorrectAnswer], batch_size: int = 1000) -> set:
+        """
+        INSERT ... ON CONFLICT DO NOTHING RETURNING: devuelve los pares
+        (user_id, activity_id) que se insertaron, así dos peticiones
+        concurrentes no suman el mismo acierto dos veces.
+        """
+        opts = FirstCorrectAnswer._meta
+        connection = connections[router.db_for_write(FirstCorrectAnswer)]
+        fields = [
+            opts.get_field(name)
+            for name in ("user", "activity", "first_correct_at", "points")
+        ]
+        qn = connection.ops.quote_name
+        columns = ", ".join(qn(f.column) for f in fields)
+        key = ", ".join(qn(f.column) for f in fields[:2])
+        inserted = set()
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start : start + batch_size]
+                values = ", ".join(
+                    ["(%s)" % ", ".join(["%s"] * len(fields))] * len(batch)
+                )
+                params = [
+                    f.get_db_prep_save(getattr(row, f.attname), connection)
+                    for row in batch
+                    for f in fields
+                ]
+                cursor.execute(
+                    f"INSERT INTO {qn(opts.db_table)} ({columns}) VALUES {values} "
+                    f"ON CONFLICT ({key}) DO NOTHING RETURNING {key}",
+                    params,
+                )
+                inserted.update(map(tuple, cursor.fetchall()))
+        return inserted
+
+    @staticmethod
+    def backfill(batch_size: int = 1000, since=None) -> int:
+        """
+        Inserta los pares que falten a partir de `user_answer`; es idempotente.
+
+        Devuelve la cantidad de filas nuevas en `first_correct_answer`.
+        """
+        answers = UserAnswer.objects.filter(
+            is_correct=True, user__isnull=False, activity__isnull=False
+        )
+        if since is not None:
+            answers = answers.filter(answered_at__gte=since)
+        rows = (
+            answers.values("user_id", "activity_id")
+            .annotate(
+                first_correct_at=Min("answered_at"), points=Max("activity__points")
+            )
+            .order_by()
+        )
+
+        before = FirstCorrectAnswer.objects.count()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(FirstCorrectAnswer(**row))
+            if len(batch) >= batch_size:
+                FirstCorrectAnswer.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        if batch:
+            FirstCorrectAnswer.objects.bulk_create(batch, ignore_conflicts=True)
+        return FirstCorrectAnswer.objects.count() - before
+
+
 class AnswerSubmissionService:
     def __init__(self, user, activity_id, input_data, exam_attempt=None):
         self.user = user
@@ -23,22 +208,42 @@ class AnswerSubmissionService:
         self.exam_attempt = exam_attempt
 
     def execute(self):
+        from activities.buffering import buffer_enabled, get_answer_buffer
+
+        if self.exam_attempt is None and buffer_enabled():
+            user_answer = self._evaluate()
+            get_answer_buffer().add(user_answer)
+            return user_answer
+
+        user_answer = self._submit()
+        FirstCorrectAnswerService.record([user_answer])
+        self._enqueue_side_effects(self.user, [user_answer])
+        return user_answer
+
+    def _submit(self):
+        user_answer = self._evaluate()
+        user_answer.save(force_insert=True)
+        return user_answer
+
+    def _evaluate(self):
+        """Valida la respuesta y devuelve el `UserAnswer` aún sin guardar."""
         activity = self._get_activity()
         serializer = self._get_validated_serializer(activity)
         is_correct = self._validate_response(activity, serializer.validated_data)
-        user_answer = self._save_user_answer(
-            activity, serializer.validated_data, is_correct
+        return UserAnswer(
+            user=self.user,
+            activity=activity,
+            response_data=serializer.validated_data,
+            is_correct=is_correct,
+            exam_attempt=self.exam_attempt,
+            answered_at=timezone.now(),
         )
-        transaction.on_commit(lambda: self._create_vocabulary_if_applicable(activity))
-        module = activity.module
-        if module:
-            transaction.on_commit(
-                lambda: self._update_enrollment_progress(module.course)
-            )
-        return user_answer
 
     def _get_activity(self):
-        return get_object_or_404(Activity, pk=self.activity_id)
+        return get_object_or_404(
+            Activity.objects.select_related("module__course", *SUBCLASS_RELATIONS),
+            pk=self.activity_id,
+        )
 
     def _get_validated_serializer(self, activity):
         serializer_class = ValidationStrategyRegistry.get_serializer(activity.type)
@@ -55,49 +260,46 @@ class AnswerSubmissionService:
             raise ValueError(f"No estrategia para tipo '{activity.type}'")
         return strategy.validate(activity, validated_data)
 
-    def _save_user_answer(self, activity, response_data, is_correct):
-        return UserAnswer.objects.create(
-            user=self.user,
-            activity=activity,
-            response_data=response_data,
-            is_correct=is_correct,
-            exam_attempt=self.exam_attempt,
-        )
-
-    def _create_vocabulary_if_applicable(self, activity: Activity):
-        if activity.type != ActivityType.MATCH:
-            return
-
-        try:
-            matching_activity = MatchingActivity.objects.get(pk=activity.id)
-        except MatchingActivity.DoesNotExist:
-            return
-
-        try:
-            student = Student.objects.get(person__user=self.user)
-        except Student.DoesNotExist:
-            return
-
-        difficulty = matching_activity.difficulty
-        pairs_qs = matching_activity.pairs.filter(is_vocabulary=True).values(
-            "left", "right"
-        )
-
-        if not pairs_qs:
-            return
-
-        vocab_to_create = [
-            Vocabulary(
-                student=student,
-                word=row["left"],
-                meaning=row["right"],
-                difficulty=difficulty,
+    @staticmethod
+    def _enqueue_side_effects(user, user_answers: List[UserAnswer]):
+        """
+        Encola la captura de vocabulario, el recálculo de progreso y el de
+        las características usadas para recomendar actividades. El ranking
+        lo actualiza `FirstCorrectAnswerService.record` de forma incremental.
+
+        Las claves de deduplicación agrupan las respuestas de un mismo
+        usuario: varios envíos seguidos se resuelven con un solo recálculo.
+        """
+        jobs = [
+            JobQueue.build(
+                REFRESH_FEATURES,
+                {"user_id": user.pk},
+                dedup_key=f"{REFRESH_FEATURES}:{user.pk}",
             )
-            for row in pairs_qs
         ]
+        if any(
+            a.is_correct and a.activity.type == ActivityType.MATCH for a in user_answers
+        ):
+            jobs.append(
+                JobQueue.build(
+                    CAPTURE_VOCABULARY,
+                    {"user_id": user.pk},
+                    dedup_key=f"{CAPTURE_VOCABULARY}:{user.pk}",
+                )
+            )
 
-        if vocab_to_create:
-            Vocabulary.objects.bulk_create(vocab_to_create, ignore_conflicts=True)
+        course_ids = {
+            a.activity.module.course_id for a in user_answers if a.activity.module_id
+        }
+        for course_id in sorted(course_ids):
+            jobs.append(
+                JobQueue.build(
+                    UPDATE_PROGRESS,
+                    {"user_id": user.pk, "course_id": course_id},
+                    dedup_key=f"{UPDATE_PROGRESS}:{user.pk}:{course_id}",
+                )
+            )
+        JobQueue.enqueue_many(jobs)
 
     @classmethod
     @transaction.atomic
@@ -110,47 +312,103 @@ class AnswerSubmissionService:
                 input_data=item["input_data"],
                 exam_attempt=exam_attempt,
             )
-            created.append(svc.execute())
+            created.append(svc._submit())
+        FirstCorrectAnswerService.record(created)
+        cls._enqueue_side_effects(user, created)
+        if exam_attempt is not None:
+            proctoring.on_commit(
+                exam_attempt.exam_id,
+                "record_answers",
+                exam_attempt.pk,
+                [a.activity_id for a in created],
+            )
         return created
 
-    def _update_enrollment_progress(self, course: Course):
+    @staticmethod
+    def _update_enrollment_progress(user, course_id: int):
         from content.services import CourseProgressService
 
-        enrollment = Enrollment.objects.filter(
-            student__person__user=self.user,
-            course=course,
-            status=EnrollmentStatus.ACTIVE,
-        ).first()
+        enrollment = (
+            Enrollment.objects.select_related("course")
+            .filter(
+                student__person__user=user,
+                course_id=course_id,
+                status=EnrollmentStatus.ACTIVE,
+            )
+            .first()
+        )
 
         if not enrollment:
-            return
+            return None
 
-        progress_service = CourseProgressService(course=course, user=self.user)
+        progress_service = CourseProgressService(course=enrollment.course, user=user)
         progress_data = progress_service.compute()
 
         enrollment.progress_percent = progress_data.overall["percent"]
         enrollment.save(update_fields=["progress_percent"])
+        return progress_data
 
 
 class LeaderboardService:
+    """
+    Ranking de estudiantes por puntos de actividades acertadas.
+
+    El ranking acumulado (global, por curso o por idioma) se lee del backend
+    de `activities.leaderboard`; las ventanas de tiempo y los filtros por módulo se
+    agregan desde `first_correct_answer`.
+    """
+
     def __init__(
         self,
         request_user_id: Optional[int],
         limit: int = 10,
         time_window: str = "all",
         module_id: Optional[int] = None,
+        course_id: Optional[int] = None,
+        language_id: Optional[int] = None,
+        neighbors: int = 0,
     ):
         self.request_user_id = request_user_id
         self.limit = limit
         self.time_window = time_window
         self.module_id = module_id
+        self.course_id = course_id
+        self.language_id = language_id
+        self.neighbors = neighbors
 
     def execute(self) -> List[Dict[str, Any]]:
-        pairs_qs = self._pairs_correctos_unicos()
-        leaderboard_qs = self._leaderboard_qs(pairs_qs)
-        rows = self._top_n_mas_usuario(leaderboard_qs)
+        """Top N, con el usuario al final si no aparece en él."""
+        score_board = self.score_board()
+        rows = score_board.top(self.limit)
+        if self.request_user_id and not any(
+            r["user_id"] == self.request_user_id for r in rows
+        ):
+            me = score_board.entry(self.request_user_id)
+            if me:
+                rows.append(me)
         return self._armar_payload(rows)
 
+    def board(self) -> Dict[str, Any]:
+        """Top N, la posición exacta del usuario y sus vecinos."""
+        score_board = self.score_board()
+        top = score_board.top(self.limit)
+        me = score_board.entry(self.request_user_id) if self.request_user_id else None
+        neighbors = score_board.neighbors(me, self.neighbors) if me else []
+
+        payload = self._armar_payload(top + ([me] if me else []) + neighbors)
+        return {
+            "top": payload[: len(top)],
+            "me": payload[len(top)] if me else None,
+            "neighbors": payload[len(top) + (1 if me else 0) :],
+        }
+
+    def score_board(self) -> leaderboard.ScoreBoard:
+        if self._since_dt() is None and not self.module_id:
+            return leaderboard.get_backend().board(
+                leaderboard.scope_for(self.course_id, self.language_id)
+            )
+        return leaderboard.AggregateScoreBoard(self._pairs_correctos_unicos())
+
     def _since_dt(self):
         now = timezone.now()
         return {
@@ -160,66 +418,25 @@ class LeaderboardService:
             "all": None,
         }.get(self.time_window, None)
 
-    def _base_answers(self) -> QuerySet:
-        qs = UserAnswer.objects.filter(is_correct=True).select_related("activity")
+    def _pairs_correctos_unicos(self) -> QuerySet:
+        qs = FirstCorrectAnswer.objects.all()
         since = self._since_dt()
         if since:
-            qs = qs.filter(answered_at__gte=since)
+            qs = qs.filter(first_correct_at__gte=since)
         if self.module_id:
             qs = qs.filter(activity__module_id=self.module_id)
+        if self.course_id:
+            qs = qs.filter(activity__module__course_id=self.course_id)
+        if self.language_id:
+            qs = qs.filter(activity__module__course__language_id=self.language_id)
         return qs
 
-    def _pairs_correctos_unicos(self) -> QuerySet:
-        return (
-            self._base_answers()
-            .values("user_id", "activity_id")
-            .distinct()
-            .annotate(points=F("activity__points"))
-        )
-
-    def _leaderboard_qs(self, pairs_qs: QuerySet) -> QuerySet:
-        return (
-            pairs_qs.values("user_id")
-            .annotate(
-                total_points=Sum("points"),
-                activities_count=Count("activity_id"),
-            )
-            .annotate(
-                position=Window(
-                    expression=Rank(),
-                    order_by=(F("total_points").desc(), F("user_id").asc()),
-                )
-            )
-            .order_by(F("total_points").desc(), F("user_id").asc())
-        )
-
-    def _top_n_mas_usuario(self, qs: QuerySet) -> List[Dict[str, Any]]:
-        topn = list(qs[: self.limit])
-        if not self.request_user_id:
-            return topn
-        if any(r["user_id"] == self.request_user_id for r in topn):
-            return topn
-        extra = qs.filter(user_id=self.request_user_id).first()
-        if extra:
-            topn.append(extra)
-        return topn
-
-    def _person_map(self, user_ids: Iterable[int]) -> Dict[int, Person]:
-        persons = (
-            Person.objects.filter(user_id__in=list(user_ids))
-            .select_related("user")
-            .only("user__id", "user__username", "first_name", "last_name")
-        )
-        return {p.user_id: p for p in persons}
-
     def _armar_payload(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        user_ids = [r["user_id"] for r in rows]
-        pmap = self._person_map(user_ids)
+        rows = list(rows)
+        names = leaderboard.display_names(r["user_id"] for r in rows)
         out: List[Dict[str, Any]] = []
         for r in rows:
-            p = pmap.get(r["user_id"])
-            username = p.user.username if p and p.user_id else ""
-            full_name = f"{p.first_name} {p.last_name}".strip() if p else ""
+            username, full_name = names[r["user_id"]]
             out.append({
                 "user_id": r["user_id"],
                 "username": username,
@@ -0,0 +1,63 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from people.models import Person
+from users.models import User
+
+from .leaderboard import invalidate_display_names
+from .models.base import Activity
+from .models.choice import Choice, ChoiceActivity
+from .models.fill_in_the_blank import FillInTheBlankActivity
+from .models.matching import MatchingActivity, MatchingPair
+from .models.word_ordering import WordOrderingActivity
+from .recommendations import invalidate_candidates
+from .strategies.payload.base import PayloadStrategy
+
+ACTIVITY_MODELS = (
+    Activity,
+    ChoiceActivity,
+    FillInTheBlankActivity,
+    MatchingActivity,
+    WordOrderingActivity,
+)
+CHILD_MODELS = (Choice, MatchingPair)
+
+
+def invalidate_activity_payload(sender, instance, **kwargs):
+    PayloadStrategy.invalidate(instance.pk)
+    invalidate_candidates(instance.module_id)
+
+
+def invalidate_parent_payload(sender, instance, **kwargs):
+    PayloadStrategy.invalidate(instance.activity_id)
+
+
+def invalidate_user_name(sender, instance, **kwargs):
+    invalidate_display_names(instance.pk)
+
+
+def invalidate_person_name(sender, instance, **kwargs):
+    invalidate_display_names(instance.user_id)
+
+
+def invalidate_previous_module(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    previous = (
+        Activity.objects.filter(pk=instance.pk)
+        .values_list("module_id", flat=True)
+        .first()
+    )
+    if previous != instance.module_id:
+        invalidate_candidates(previous)
+
+
+for model in ACTIVITY_MODELS:
+    pre_save.connect(invalidate_previous_module, sender=model)
+
+for signal in (post_save, post_delete):
+    for model in ACTIVITY_MODELS:
+        signal.connect(invalidate_activity_payload, sender=model)
+    for model in CHILD_MODELS:
+        signal.connect(invalidate_parent_payload, sender=model)
+    signal.connect(invalidate_user_name, sender=User)
+    signal.connect(invalidate_person_name, sender=Person)
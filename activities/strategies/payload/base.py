@@ -1,3 +1,50 @@
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+PAYLOAD_CACHE_PREFIX = "activity-payload"
+
+
 class PayloadStrategy:
-    def get_payload(self, obj):
+    """
+    Construye el payload de una actividad en dos pasos.
+
+    `build` arma la versión canónica (sin barajar), que se guarda en caché por
+    actividad; `render` la convierte en la respuesta usando un `random.Random`
+    sembrado, así el mismo estudiante ve siempre el mismo orden.
+
+    La caché es la compartida (`CACHES`), así que invalidar desde un proceso
+    vale para todos. Se invalida también al confirmar la transacción, para
+    descartar lo que otra petición haya cacheado con los datos anteriores
+    mientras tanto.
+    """
+
+    def build(self, obj):
         raise NotImplementedError
+
+    def render(self, data, rng):
+        return data
+
+    @staticmethod
+    def cache_key(activity_id) -> str:
+        return f"{PAYLOAD_CACHE_PREFIX}:{activity_id}"
+
+    @classmethod
+    def invalidate(cls, activity_id):
+        key = cls.cache_key(activity_id)
+        cache.delete(key)
+        transaction.on_commit(lambda: cache.delete(key))
+
+    def get_canonical(self, obj):
+        key = self.cache_key(obj.pk)
+        data = cache.get(key)
+        if data is None:
+            data = self.build(obj)
+            timeout = getattr(settings, "ACTIVITY_PAYLOAD_CACHE_TIMEOUT", 300)
+            cache.set(key, data, timeout)
+        return data
+
+    def get_payload(self, obj, seed=None):
+        return self.render(self.get_canonical(obj), random.Random(seed))
@@ -7,7 +7,7 @@ from utils.enums import ActivityType
 
 @PayloadStrategyRegistry.register(ActivityType.CHOICE)
 class ChoicePayloadStrategy(PayloadStrategy):
-    def get_payload(self, obj):
-        obj = ChoiceActivity.objects.get(pk=obj.pk)
-        choices = ChoiceSerializer(obj.choices.all(), many=True).data
+    def build(self, obj):
+        obj = obj.as_subclass(ChoiceActivity)
+        choices = [dict(c) for c in ChoiceSerializer(obj.choices.all(), many=True).data]
         return {"choices": choices, "is_multiple": obj.is_multiple}
@@ -6,6 +6,11 @@ from utils.enums import ActivityType
 
 @PayloadStrategyRegistry.register(ActivityType.FILL)
 class FillInTheBlankPayloadStrategy(PayloadStrategy):
-    def get_payload(self, obj):
-        obj = FillInTheBlankActivity.objects.get(pk=obj.pk)
-        return {"text": obj.text}
+    def build(self, obj):
+        obj = obj.as_subclass(FillInTheBlankActivity)
+        compiled = obj.compiled or obj.compile()
+        return {
+            "text": obj.text,
+            "segments": compiled["segments"],
+            "blank_count": compiled["blank_count"],
+        }
@@ -1,22 +1,23 @@
-from random import shuffle
-
 from activities.models.matching import MatchingActivity
 from activities.strategies.payload.base import PayloadStrategy
 from activities.strategies.payload.registry import PayloadStrategyRegistry
 from utils.enums import ActivityType
+from utils.shuffling import seeded_shuffle
 
 
 @PayloadStrategyRegistry.register(ActivityType.MATCH)
 class MatchingPayloadStrategy(PayloadStrategy):
-    def get_payload(self, obj):
-        obj = MatchingActivity.objects.get(pk=obj.pk)
-        pairs = list(obj.pairs.all())
-
-        left_items = [pair.left for pair in pairs]
-        right_items = [pair.right for pair in pairs]
+    def build(self, obj):
+        obj = obj.as_subclass(MatchingActivity)
+        pairs = list(obj.pairs.values_list("left", "right"))
+        return {
+            "left": [left for left, _ in pairs],
+            "right": [right for _, right in pairs],
+        }
 
-        shuffle(left_items)
-        shuffle(right_items)
+    def render(self, data, rng):
+        left_items = seeded_shuffle(data["left"], rng=rng)
+        right_items = seeded_shuffle(data["right"], rng=rng)
 
         mixed_pairs = [
             {"left": left, "right": right}
@@ -1,7 +1,6 @@
-from random import shuffle
-
 from activities.models.word_ordering import WordOrderingActivity
 from utils.enums import ActivityType
+from utils.shuffling import seeded_shuffle
 
 from .base import PayloadStrategy
 from .registry import PayloadStrategyRegistry
@@ -9,8 +8,9 @@ from .registry import PayloadStrategyRegistry
 
 @PayloadStrategyRegistry.register(ActivityType.ORDER)
 class WordOrderingPayloadStrategy(PayloadStrategy):
-    def get_payload(self, obj):
-        obj = WordOrderingActivity.objects.get(pk=obj.pk)
-        words = obj.sentence.strip().split()
-        shuffle(words)
-        return {"words": words}
+    def build(self, obj):
+        obj = obj.as_subclass(WordOrderingActivity)
+        return {"words": list(obj.tokens or obj.tokenize())}
+
+    def render(self, data, rng):
+        return {"words": seeded_shuffle(data["words"], rng=rng)}
@@ -19,6 +19,6 @@ class ChoiceValidationStrategy(ValidationStrategy):
         return len(selected_ids) == 1 and selected_ids[0] in correct_choices
 
     def validate(self, activity: Activity, user_response: dict) -> bool:
-        activity = ChoiceActivity.objects.get(id=activity.id)
+        activity = activity.as_subclass(ChoiceActivity)
         selected_ids = user_response.get("selected_ids", [])
         return self._validate(activity, selected_ids)
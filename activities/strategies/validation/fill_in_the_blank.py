@@ -1,3 +1,4 @@
+from activities.blanks import normalize_answer
 from activities.models.base import Activity
 from activities.models.fill_in_the_blank import FillInTheBlankActivity
 from activities.serializers import FillInTheBlankAnswerInputSerializer
@@ -12,15 +13,18 @@ from .registry import ValidationStrategyRegistry
 )
 class FillInTheBlankValidationStrategy(ValidationStrategy):
     def validate(self, activity: Activity, user_response: dict) -> bool:
-        activity = FillInTheBlankActivity.objects.get(id=activity.id)
-        expected_answers = activity.correct_answers
+        activity = activity.as_subclass(FillInTheBlankActivity)
+        compiled = activity.compiled or activity.compile()
         user_answers = user_response.get("answers", {})
 
-        if set(expected_answers.keys()) != set(user_answers.keys()):
+        keys = compiled["keys"]
+        if len(user_answers) != len(keys):
             return False
 
-        for index, correct in expected_answers.items():
-            if user_answers.get(index, "").strip().lower() != correct.strip().lower():
+        accent_sensitive = activity.accent_sensitive
+        for key, expected in zip(keys, compiled["answers"]):
+            given = user_answers.get(key)
+            if given is None or normalize_answer(given, accent_sensitive) != expected:
                 return False
 
         return True
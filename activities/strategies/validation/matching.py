@@ -10,7 +10,7 @@ from .registry import ValidationStrategyRegistry
 @ValidationStrategyRegistry.register(ActivityType.MATCH, MatchingAnswerInputSerializer)
 class MatchingValidationStrategy(ValidationStrategy):
     def validate(self, activity: Activity, user_response: dict) -> bool:
-        activity = MatchingActivity.objects.get(id=activity.pk)
+        activity = activity.as_subclass(MatchingActivity)
         correct_pairs = {pair.left: pair.right for pair in activity.pairs.all()}
         user_pairs = user_response.get("pairs", {})
 
@@ -12,8 +12,6 @@ from .registry import ValidationStrategyRegistry
 )
 class WordOrderingValidationStrategy(ValidationStrategy):
     def validate(self, activity: Activity, user_response: dict) -> bool:
-        activity = WordOrderingActivity.objects.get(id=activity.pk)
-        correct_order = activity.sentence.strip().split()
-        user_order = user_response.get("words", [])
-
-        return correct_order == user_order
+        activity = activity.as_subclass(WordOrderingActivity)
+        correct_order = activity.tokens or activity.tokenize()
+        return correct_order == user_response.get("words", [])
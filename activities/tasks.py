@@ -0,0 +1,58 @@
+from jobs.registry import JobRegistry
+from live import services as live
+from users.models import User
+from utils.enums import ActivityType
+
+UPDATE_PROGRESS = "activities.update_progress"
+CAPTURE_VOCABULARY = "activities.capture_vocabulary"
+REFRESH_FEATURES = "activities.refresh_features"
+REFRESH_LEADERBOARD = "activities.refresh_leaderboard"
+
+
+@JobRegistry.register(UPDATE_PROGRESS)
+def update_progress(user_id: int, course_id: int):
+    from activities.services import AnswerSubmissionService
+
+    user = User.objects.filter(pk=user_id).first()
+    if not user:
+        return
+    progress = AnswerSubmissionService._update_enrollment_progress(user, course_id)
+    if progress is not None:
+        live.publish([live.progress_event(user_id, course_id, progress)])
+
+
+@JobRegistry.register(CAPTURE_VOCABULARY)
+def capture_vocabulary(user_id: int):
+    """Captura el vocabulario de todas las actividades de unir ya acertadas."""
+    from activities.models.base import FirstCorrectAnswer
+    from activities.services import VocabularyCaptureService
+
+    user = User.objects.filter(pk=user_id).first()
+    if not user:
+        return
+    activity_ids = FirstCorrectAnswer.objects.filter(
+        user=user, activity__type=ActivityType.MATCH
+    ).values_list("activity_id", flat=True)
+    VocabularyCaptureService.capture(user, activity_ids)
+
+
+@JobRegistry.register(REFRESH_FEATURES)
+def refresh_features(user_id: int):
+    from activities import recommendations
+
+    if User.objects.filter(pk=user_id).exists():
+        recommendations.refresh_features(user_id)
+
+
+@JobRegistry.register(REFRESH_LEADERBOARD)
+def refresh_leaderboard(user_id: int):
+    """
+    Recalcula desde cero los puntajes de un usuario. Las respuestas ya suman
+    de forma incremental; este job queda para reparar un usuario puntual.
+    """
+    from activities import leaderboard
+
+    scores = leaderboard.refresh_scores([user_id])
+    course_ids = {leaderboard.scope_course_id(scope) for scope, _ in scores}
+    course_ids.discard(None)
+    live.publish(live.leaderboard_event(c, user_id) for c in sorted(course_ids))
@@ -1,2 +1,785 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest.mock
+from datetime import date, timedelta
+from pathlib import Path
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from activities import leaderboard, log_export, partitioning
+from activities.bank import ActivityBankImporter, export_rows, read_rows, write_rows
+from activities.buffering import (
+    AnswerBuffer,
+    AnswerSpool,
+    serialize_answer,
+    write_answers,
+)
+from activities.models.base import (
+    Activity,
+    ExamActivity,
+    FirstCorrectAnswer,
+    UserAnswer,
+)
+from activities.models.choice import Choice, ChoiceActivity
+from activities.models.fill_in_the_blank import FillInTheBlankActivity
+from activities.models.matching import MatchingActivity, MatchingPair
+from activities.models.word_ordering import WordOrderingActivity
+from activities.partitioning import add_months
+from activities.serializers import ActivitySerializer
+from activities.services import (
+    AnswerSubmissionService,
+    FirstCorrectAnswerService,
+    LeaderboardService,
+    VocabularyCaptureService,
+)
+from activities.strategies.payload.registry import PayloadStrategyRegistry
+from activities.strategies.validation.registry import ValidationStrategyRegistry
+from activities.tasks import CAPTURE_VOCABULARY
+from content.models import Course, Exam, Module, Vocabulary, VocabularyCapture
+from jobs.models import Job
+from jobs.services import JobWorker
+from languages.models import Language
+from live.models import LiveEvent
+from people.models import Person, Student
+from users.models import User
+from utils.enums import ActivityType, ExamType, WordTokenizer
+from utils.shuffling import make_seed
+
+
+class VocabularyCaptureTestCase(TestCase):
+    def setUp(self):
+        VocabularyCaptureService.clear_cache()
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        person = Person.objects.create(user=self.user, date_of_birth=date(2000, 1, 1))
+        self.student = Student.objects.create(person=person)
+        self.activity = MatchingActivity.objects.create(
+            title="Animales", type=ActivityType.MATCH
+        )
+        MatchingPair.objects.create(
+            activity=self.activity, left="perro", right="dog", is_vocabulary=True
+        )
+        MatchingPair.objects.create(
+            activity=self.activity, left="gato", right="cat", is_vocabulary=True
+        )
+
+    def _submit(self, pairs):
+        AnswerSubmissionService(
+            user=self.user,
+            activity_id=self.activity.id,
+            input_data={"pairs": pairs},
+        ).execute()
+        JobWorker().run_pending()
+
+    def test_incorrect_answer_does_not_capture(self):
+        self._submit({"perro": "cat", "gato": "dog"})
+        self.assertFalse(Vocabulary.objects.exists())
+        self.assertFalse(VocabularyCapture.objects.exists())
+
+    def test_first_correct_answer_captures_once(self):
+        self._submit({"perro": "dog", "gato": "cat"})
+        self.assertEqual(
+            set(Vocabulary.objects.values_list("word", flat=True)), {"perro", "gato"}
+        )
+        self.assertEqual(VocabularyCapture.objects.count(), 1)
+
+        with self.assertNumQueries(1):
+            VocabularyCaptureService.capture(self.user, [self.activity.id])
+
+        VocabularyCaptureService.clear_cache()
+        with self.assertNumQueries(2):
+            VocabularyCaptureService.capture(self.user, [self.activity.id])
+        self.assertEqual(Vocabulary.objects.count(), 2)
+
+    def test_submit_many_batches_capture(self):
+        payload = [
+            {"activity_id": self.activity.id, "input_data": {"pairs": pairs}}
+            for pairs in (
+                {"perro": "dog", "gato": "cat"},
+                {"perro": "dog", "gato": "cat"},
+            )
+        ]
+        AnswerSubmissionService.submit_many(self.user, payload)
+        AnswerSubmissionService.submit_many(self.user, payload)
+        self.assertEqual(Job.objects.filter(name=CAPTURE_VOCABULARY).count(), 1)
+        JobWorker().run_pending()
+        self.assertEqual(VocabularyCapture.objects.count(), 1)
+        self.assertEqual(Vocabulary.objects.count(), 2)
+
+
+class ActivityBankTestCase(TestCase):
+    def setUp(self):
+        course = Course.objects.create(name="Inglés B1")
+        self.module = Module.objects.create(course=course, name="Unidad 1")
+        self.exam = Exam.objects.create(course=course, type=ExamType.FINAL)
+        self.rows = [
+            {
+                "type": "choice",
+                "title": "Capital",
+                "module": self.module.id,
+                "exam": self.exam.id,
+                "position": 1,
+                "choices": [
+                    {"text": "París", "is_correct": True},
+                    {"text": "Roma", "is_correct": False},
+                ],
+            },
+            {"type": "fill_in", "title": "Completa", "text": "Es [[París]] y [[Roma]]"},
+            {
+                "type": "matching",
+                "title": "Animales",
+                "pairs": [{"left": "perro", "right": "dog", "is_vocabulary": True}],
+            },
+            {"type": "order", "title": "Ordena", "sentence": "El gato duerme"},
+            {"type": "fill_in", "title": "Sin huecos", "text": "Nada que completar"},
+        ]
+
+    def _jsonl(self, rows):
+        return io.StringIO("\n".join(json.dumps(row) for row in rows) + "\nno-json\n")
+
+    def test_import_creates_all_types_in_bulk(self):
+        with self.assertNumQueries(12):
+            report = ActivityBankImporter().run(read_rows(self._jsonl(self.rows)))
+
+        self.assertEqual(report.created, 4)
+        self.assertEqual(report.linked, 1)
+        self.assertEqual([line for line, _ in report.errors], [5, 6])
+
+        fill = FillInTheBlankActivity.objects.get()
+        self.assertEqual(fill.text, "Es {{blank}} y {{blank}}")
+        self.assertEqual(fill.correct_answers, {"0": "París", "1": "Roma"})
+        self.assertEqual(fill.compiled["answers"], ["parís", "roma"])
+        choice = ChoiceActivity.objects.get()
+        self.assertEqual(choice.module, self.module)
+        self.assertEqual(choice.choices.filter(is_correct=True).get().text, "París")
+        self.assertEqual(MatchingActivity.objects.get().pairs.get().left, "perro")
+        self.assertEqual(WordOrderingActivity.objects.get().sentence, "El gato duerme")
+        self.assertEqual(
+            ExamActivity.objects.get(exam=self.exam).activity_id, choice.pk
+        )
+
+    def test_csv_export_round_trips(self):
+        ActivityBankImporter().run(read_rows(self._jsonl(self.rows[:4])))
+        csv_text = "".join(write_rows(export_rows(Activity.objects.all()), "csv"))
+        Activity.objects.all().delete()
+
+        report = ActivityBankImporter().run(read_rows(io.StringIO(csv_text), "csv"))
+        self.assertEqual((report.created, report.errors), (4, []))
+        self.assertEqual(
+            FillInTheBlankActivity.objects.get().correct_answers,
+            {"0": "París", "1": "Roma"},
+        )
+        self.assertEqual(Choice.objects.count(), 2)
+
+    def test_malformed_rows_are_reported(self):
+        rows = [
+            {"type": "choice", "title": "Malas", "choices": ["a"]},
+            {"type": "matching", "title": "Malos", "pairs": [["perro", "dog"]]},
+            {"type": ["choice"], "title": "Lista"},
+            {"type": {"name": "order"}, "title": "Objeto"},
+            self.rows[3],
+        ]
+        report = ActivityBankImporter().run(read_rows(self._jsonl(rows)))
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual(
+            report.errors,
+            [
+                (1, "La opción 1 debe ser un objeto."),
+                (2, "El par 1 debe ser un objeto."),
+                (3, "Tipo de actividad desconocido: ['choice']."),
+                (4, "Tipo de actividad desconocido: {'name': 'order'}."),
+                (6, "JSON inválido: Expecting value: line 1 column 1 (char 0)"),
+            ],
+        )
+
+    def test_prepare_rejects_non_object_rows(self):
+        with self.assertRaisesMessage(ValidationError, "debe ser un objeto"):
+            ActivityBankImporter().prepare(["choice"], set(), set())
+
+
+class CompiledFillInTheBlankTestCase(TestCase):
+    def setUp(self):
+        self.activity = FillInTheBlankActivity.objects.create(
+            title="Capitales",
+            type=ActivityType.FILL,
+            text="La capital de Francia es {{blank}} y la de Perú es {{blank}}.",
+            correct_answers={"0": "París", "1": "Lima"},
+        )
+        self.strategy = ValidationStrategyRegistry.get_strategy(ActivityType.FILL)
+
+    def test_compiled_on_save(self):
+        compiled = self.activity.compiled
+        self.assertEqual(compiled["blank_count"], 2)
+        self.assertEqual(compiled["answers"], ["parís", "lima"])
+        text = self.activity.text
+        self.assertEqual(
+            [text[i : i + len("{{blank}}")] for i in compiled["offsets"]],
+            ["{{blank}}", "{{blank}}"],
+        )
+
+        payload = PayloadStrategyRegistry.get_strategy(ActivityType.FILL).get_payload(
+            self.activity
+        )
+        self.assertEqual("{{blank}}".join(payload["segments"]), text)
+
+    def test_validation_normalizes_answers(self):
+        answer = {"answers": {"0": " PARÍS ", "1": "lima"}}
+        self.assertTrue(self.strategy.validate(self.activity, answer))
+        self.assertFalse(
+            self.strategy.validate(
+                self.activity, {"answers": {"0": "Paris", "1": "Lima"}}
+            )
+        )
+        self.assertFalse(
+            self.strategy.validate(self.activity, {"answers": {"0": "París"}})
+        )
+
+        self.activity.accent_sensitive = False
+        self.activity.save(update_fields=["accent_sensitive"])
+        self.assertTrue(
+            self.strategy.validate(
+                self.activity, {"answers": {"0": "Paris", "1": "Lima"}}
+            )
+        )
+
+
+class WordOrderingTokensTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        self.activity = WordOrderingActivity.objects.create(
+            title="Ordena",
+            type=ActivityType.ORDER,
+            sentence="¿Dónde está el gato?",
+            tokenizer=WordTokenizer.PUNCTUATION,
+        )
+
+    def test_tokens_maintained_on_save(self):
+        self.assertEqual(
+            self.activity.tokens, ["¿", "Dónde", "está", "el", "gato", "?"]
+        )
+        self.activity.tokenizer = WordTokenizer.WHITESPACE
+        self.activity.save(update_fields=["tokenizer"])
+        self.activity.refresh_from_db()
+        self.assertEqual(self.activity.tokens, ["¿Dónde", "está", "el", "gato?"])
+
+    def test_submission_validates_without_requerying(self):
+        service = AnswerSubmissionService(
+            user=self.user,
+            activity_id=self.activity.id,
+            input_data={"words": ["¿", "Dónde", "está", "el", "gato", "?"]},
+        )
+        with self.assertNumQueries(2):
+            answer = service._submit()
+        self.assertTrue(answer.is_correct)
+
+
+class SeededPayloadTestCase(TestCase):
+    def setUp(self):
+        self.activity = MatchingActivity.objects.create(
+            title="Números", type=ActivityType.MATCH
+        )
+        for i in range(8):
+            MatchingPair.objects.create(
+                activity=self.activity, left=f"izq {i}", right=f"der {i}"
+            )
+        self.strategy = PayloadStrategyRegistry.get_strategy(ActivityType.MATCH)
+
+    def test_same_seed_same_order(self):
+        seed = make_seed("attempt", 7, self.activity.pk)
+        first = self.strategy.get_payload(self.activity, seed=seed)
+        self.assertEqual(self.strategy.get_payload(self.activity, seed=seed), first)
+        self.assertNotEqual(
+            self.strategy.get_payload(self.activity, seed=seed + 1), first
+        )
+
+    def test_canonical_payload_is_cached_and_invalidated(self):
+        self.strategy.get_payload(self.activity, seed=1)
+        with self.assertNumQueries(0):
+            self.strategy.get_payload(self.activity, seed=2)
+
+        MatchingPair.objects.create(activity=self.activity, left="nuevo", right="new")
+        payload = self.strategy.get_payload(self.activity, seed=1)
+        self.assertIn("nuevo", [pair["left"] for pair in payload["pairs"]])
+
+    def test_anonymous_requests_are_not_seeded(self):
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        serializer = ActivitySerializer(context={"request": request})
+        self.assertIsNone(serializer.get_shuffle_seed(self.activity))
+
+
+class FirstCorrectAnswerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        self.activity = WordOrderingActivity.objects.create(
+            title="Ordena", type=ActivityType.ORDER, sentence="el gato duerme", points=3
+        )
+
+    def _submit(self, words):
+        return AnswerSubmissionService(
+            user=self.user, activity_id=self.activity.id, input_data={"words": words}
+        ).execute()
+
+    def test_submission_records_first_correct_once(self):
+        self._submit(["gato", "el", "duerme"])
+        self.assertFalse(FirstCorrectAnswer.objects.exists())
+
+        first = self._submit(["el", "gato", "duerme"])
+        self._submit(["el", "gato", "duerme"])
+        rollup = FirstCorrectAnswer.objects.get()
+        self.assertEqual(
+            (rollup.user, rollup.activity_id, rollup.points),
+            (self.user, self.activity.id, 3),
+        )
+        self.assertEqual(rollup.first_correct_at, first.answered_at)
+
+    def test_backfill_from_answer_log(self):
+        for _ in range(2):
+            UserAnswer.objects.create(
+                user=self.user,
+                activity=self.activity,
+                response_data={},
+                is_correct=True,
+            )
+        self.assertEqual(FirstCorrectAnswerService.backfill(), 1)
+        self.assertEqual(FirstCorrectAnswerService.backfill(), 0)
+
+        FirstCorrectAnswer.objects.all().delete()
+        out = io.StringIO()
+        call_command("partition_user_answers", stdout=out)
+        self.assertEqual(FirstCorrectAnswer.objects.count(), 1)
+        self.assertIn("sin particiones nativas", out.getvalue())
+
+    def test_leaderboard_adds_first_correct_only(self):
+        for _ in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._submit(["el", "gato", "duerme"])
+        with self.assertNumQueries(2):
+            rows = LeaderboardService(request_user_id=self.user.id).execute()
+        self.assertEqual(
+            [(r["user_id"], r["total_points"], r["activities_count"]) for r in rows],
+            [(self.user.id, 3, 1)],
+        )
+        # Los nombres quedan en caché: sólo se lee el ranking.
+        with self.assertNumQueries(1):
+            LeaderboardService(request_user_id=self.user.id).execute()
+
+    def test_partition_helpers(self):
+        self.assertEqual(add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+
+    def test_new_partition_moves_rows_out_of_default(self):
+        cursor = FakeCursor({
+            "pg_inherits": [("user_answer_default",), ("user_answer_p202510",)],
+            "SELECT EXISTS": [(True,)],
+        })
+        statements = partitioning.plan_ensure_partitions(
+            cursor, date(2025, 10, 15), months_ahead=1
+        )
+        self.assertEqual(
+            statements,
+            [
+                'CREATE TABLE "user_answer_p202511" '
+                '(LIKE "user_answer" INCLUDING DEFAULTS)',
+                'WITH moved AS (DELETE FROM "user_answer_default" '
+                "WHERE answered_at >= '2025-11-01' "
+                "AND answered_at < '2025-12-01' RETURNING *) "
+                'INSERT INTO "user_answer_p202511" SELECT * FROM moved',
+                'ALTER TABLE "user_answer" ATTACH PARTITION "user_answer_p202511" '
+                "FOR VALUES FROM ('2025-11-01') TO ('2025-12-01')",
+            ],
+        )
+
+    def test_conversion_refuses_foreign_keys_to_answers(self):
+        cursor = FakeCursor({"confrelid": [("answer_review", "fk_review_answer")]})
+        with self.assertRaisesMessage(
+            partitioning.PartitioningError, "answer_review.fk_review_answer"
+        ):
+            partitioning.plan_conversion(cursor, date(2025, 10, 15))
+
+
+class FakeCursor:
+    """Cursor que responde según un fragmento del SQL ejecutado."""
+
+    def __init__(self, results):
+        self.results = results
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        self.rows = next(
+            (rows for fragment, rows in self.results.items() if fragment in sql), []
+        )
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class LeaderboardTestCase(TestCase):
+    backend = "database"
+    board_queries = 5
+
+    def setUp(self):
+        overrides = override_settings(LEADERBOARD_BACKEND=self.backend)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        leaderboard.reset_backend()
+        self.addCleanup(leaderboard.reset_backend)
+
+        language = Language.objects.create(name="Inglés", icon="languages/en.png")
+        self.course = Course.objects.create(name="Inglés B1", language=language)
+        self.other = Course.objects.create(name="Inglés B2", language=language)
+        module = Module.objects.create(course=self.course, name="Unidad 1")
+        other_module = Module.objects.create(course=self.other, name="Unidad 1")
+        self.activities = [
+            Activity.objects.create(title=f"A{i}", type=ActivityType.ORDER, points=i)
+            for i in range(1, 6)
+        ]
+        Activity.objects.filter(pk__in=[a.pk for a in self.activities[:4]]).update(
+            module=module
+        )
+        Activity.objects.filter(pk=self.activities[4].pk).update(module=other_module)
+        self.users = [
+            User.objects.create_user(
+                username=f"u{i}", email=f"u{i}@example.com", password="secret"
+            )
+            for i in range(5)
+        ]
+        # Puntos en el curso: u0=4, u1=3, u2=3, u3=2, u4=1; u4 suma 5 en B2.
+        for user, activity in zip(self.users, [4, 3, 3, 2, 1]):
+            FirstCorrectAnswer.objects.create(
+                user=user,
+                activity=self.activities[activity - 1],
+                first_correct_at=timezone.now(),
+                points=activity,
+            )
+        FirstCorrectAnswer.objects.create(
+            user=self.users[4],
+            activity=self.activities[4],
+            first_correct_at=timezone.now(),
+            points=5,
+        )
+        leaderboard.refresh_scores([u.pk for u in self.users])
+
+    def _ids(self, rows):
+        return [(r["user_id"], r["position"]) for r in rows]
+
+    def test_scopes(self):
+        board = LeaderboardService(None, limit=2).board()
+        self.assertEqual(
+            self._ids(board["top"]), [(self.users[4].pk, 1), (self.users[0].pk, 2)]
+        )
+        board = LeaderboardService(None, limit=2, course_id=self.course.pk).board()
+        self.assertEqual(
+            self._ids(board["top"]), [(self.users[0].pk, 1), (self.users[1].pk, 2)]
+        )
+
+    def test_caller_rank_and_neighbors(self):
+        me = self.users[2]
+        # Lecturas del backend más una consulta de personas.
+        with self.assertNumQueries(self.board_queries + 1):
+            board = LeaderboardService(
+                me.pk, limit=1, course_id=self.course.pk, neighbors=1
+            ).board()
+        self.assertEqual(self._ids(board["top"]), [(self.users[0].pk, 1)])
+        self.assertEqual((board["me"]["user_id"], board["me"]["position"]), (me.pk, 3))
+        self.assertEqual(
+            self._ids(board["neighbors"]),
+            [(self.users[1].pk, 2), (self.users[3].pk, 4)],
+        )
+
+    def test_windowed_board_matches_rollup(self):
+        rows = LeaderboardService(
+            self.users[3].pk, limit=1, time_window="week", course_id=self.course.pk
+        ).execute()
+        self.assertEqual(
+            self._ids(rows), [(self.users[0].pk, 1), (self.users[3].pk, 4)]
+        )
+
+    def test_first_correct_answer_adds_points(self):
+        user, activity = self.users[3], self.activities[0]
+        answer = UserAnswer(
+            user=user,
+            activity=Activity.objects.select_related("module__course").get(
+                pk=activity.pk
+            ),
+            is_correct=True,
+            answered_at=timezone.now(),
+        )
+        with unittest.mock.patch.object(
+            leaderboard, "user_scores", side_effect=AssertionError
+        ):
+            for _ in range(2):
+                with self.captureOnCommitCallbacks(execute=True):
+                    FirstCorrectAnswerService.record([answer])
+
+        backend = leaderboard.get_backend()
+        row = backend.board(leaderboard.course_scope(self.course.pk)).entry(user.pk)
+        self.assertEqual((row["total_points"], row["activities_count"]), (3, 2))
+        self.assertEqual(backend.board("all").entry(user.pk)["total_points"], 3)
+        self.assertTrue(
+            LiveEvent.objects.filter(course_id=self.course.pk, user=user).exists()
+        )
+
+    def test_display_names_follow_profile_changes(self):
+        board = LeaderboardService(None, limit=1).board()
+        self.assertEqual(board["top"][0]["full_name"], "")
+        Person.objects.create(
+            user=self.users[4],
+            first_name="Ana",
+            last_name="Pérez",
+            date_of_birth=date(2000, 1, 1),
+        )
+        board = LeaderboardService(None, limit=1).board()
+        self.assertEqual(board["top"][0]["full_name"], "Ana Pérez")
+
+    def test_refresh_drops_vanished_scopes(self):
+        FirstCorrectAnswer.objects.filter(user=self.users[4]).delete()
+        leaderboard.refresh_scores([self.users[4].pk])
+        backend = leaderboard.get_backend()
+        for scope in ("all", leaderboard.course_scope(self.other.pk)):
+            self.assertIsNone(backend.board(scope).entry(self.users[4].pk))
+
+    def test_rebuild_command(self):
+        leaderboard.get_backend().clear()
+        out = io.StringIO()
+        call_command("rebuild_leaderboard", "--skip-backfill", stdout=out)
+        self.assertIn("5 usuarios", out.getvalue())
+        board = LeaderboardService(None, limit=5, course_id=self.course.pk).board()
+        self.assertEqual(len(board["top"]), 5)
+
+    def test_view(self):
+        client = APIClient()
+        client.force_authenticate(self.users[3])
+        response = client.get(
+            "/api/activities/leaderboard/",
+            {"limit": 2, "neighbors": 1, "course_id": self.course.pk},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["me"]["position"], 4)
+        self.assertEqual(len(response.data["neighbors"]), 2)
+        bad = client.get("/api/activities/leaderboard/", {"limit": "x"})
+        self.assertEqual(bad.status_code, 400)
+
+
+class LocalLeaderboardTestCase(LeaderboardTestCase):
+    """Mismos casos sobre los sorted sets en memoria del backend `local`."""
+
+    backend = "local"
+    board_queries = 0
+
+    def test_backend_interface_is_abstract(self):
+        class Partial(leaderboard.LeaderboardBackend):
+            def board(self, scope):
+                return leaderboard.DatabaseScoreBoard(scope)
+
+        with self.assertRaises(TypeError):
+            Partial()
+
+    def test_ties_follow_user_id(self):
+        backend = leaderboard.SortedSetBackend(leaderboard.LocalSortedSets())
+        scores = {("all", 3): (5, 1), ("all", 1): (5, 1), ("all", 2): (7, 2)}
+        backend.store([3, 1, 2], scores)
+        board = backend.board("all")
+        self.assertEqual(self._ids(board.top(3)), [(2, 1), (1, 2), (3, 3)])
+        self.assertEqual(board.entry(3)["position"], 3)
+
+    def test_rebuild_swaps_in_new_board(self):
+        backend = leaderboard.get_backend()
+        before = backend.board("all").top(10)
+        FirstCorrectAnswer.objects.filter(user=self.users[4]).delete()
+        user_ids = [u.pk for u in self.users]
+
+        def fill(staging):
+            staging.store(user_ids, leaderboard.user_scores(user_ids))
+            self.assertEqual(backend.board("all").top(10), before)
+            return len(user_ids)
+
+        self.assertEqual(backend.replace(fill), 5)
+        self.assertEqual(len(backend.board("all").top(10)), 4)
+        scope = leaderboard.course_scope(self.other.pk)
+        self.assertIsNone(backend.board(scope).entry(self.users[4].pk))
+
+    @override_settings(TESTING=False)
+    def test_local_backend_is_test_only(self):
+        with self.assertRaises(ImproperlyConfigured):
+            leaderboard.build_backend("local")
+
+
+class AnswerBufferTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        self.activity = WordOrderingActivity.objects.create(
+            title="Ordena", type=ActivityType.ORDER, sentence="el gato duerme"
+        )
+        self.spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.spool_dir.cleanup)
+
+    def _buffer(self):
+        return AnswerBuffer(
+            AnswerSpool(self.spool_dir.name, fsync=False), interval=60, max_batch=2
+        )
+
+    @override_settings(ANSWER_BUFFER_ENABLED=True)
+    def test_buffered_answers_are_flushed_in_batches(self):
+        buffer = self._buffer()
+        buffer._ensure_worker = lambda: None
+        with unittest.mock.patch(
+            "activities.buffering.get_answer_buffer", return_value=buffer
+        ):
+            for words in (["el", "gato", "duerme"], ["gato", "el", "duerme"]) * 2:
+                answer = AnswerSubmissionService(
+                    user=self.user,
+                    activity_id=self.activity.id,
+                    input_data={"words": words},
+                ).execute()
+                self.assertIsNone(answer.pk)
+        self.assertFalse(UserAnswer.objects.exists())
+
+        # Otra instancia del buffer retoma lo que quedó en disco.
+        self.assertEqual(self._buffer().flush(), 4)
+        self.assertEqual(UserAnswer.objects.filter(is_correct=True).count(), 2)
+        self.assertEqual(FirstCorrectAnswer.objects.count(), 1)
+        self.assertEqual(list(Path(self.spool_dir.name).iterdir()), [])
+
+    def test_flush_keeps_answer_time_and_resets_pending(self):
+        spool = AnswerSpool(self.spool_dir.name, fsync=False)
+        answered_at = timezone.now() - timedelta(hours=1)
+        record = serialize_answer(
+            UserAnswer(
+                user=self.user,
+                activity=self.activity,
+                response_data={"words": ["el"]},
+                is_correct=False,
+                answered_at=answered_at,
+            )
+        )
+        self.assertEqual([spool.append(record) for _ in range(2)], [1, 2])
+
+        self.assertEqual(AnswerBuffer(spool, interval=60, max_batch=2).flush(), 2)
+        self.assertEqual(spool.append(record), 1)
+        self.assertEqual(
+            list(UserAnswer.objects.values_list("answered_at", "response_data")),
+            [(answered_at, {"words": ["el"]})] * 2,
+        )
+
+    def _spool_answers(self, spool, count):
+        for _ in range(count):
+            spool.append(
+                serialize_answer(
+                    UserAnswer(
+                        user=self.user,
+                        activity=self.activity,
+                        response_data={"words": []},
+                        is_correct=False,
+                        answered_at=timezone.now(),
+                    )
+                )
+            )
+
+    def test_failed_flush_resumes_after_last_committed_batch(self):
+        buffer = self._buffer()
+        self._spool_answers(buffer.spool, 3)
+        buffer.spool.append({"user_id": self.user.pk})
+        self._spool_answers(buffer.spool, 2)
+
+        calls = []
+
+        def flaky_write(answers):
+            calls.append(len(answers))
+            if len(calls) == 2:
+                raise OperationalError("conexión perdida")
+            write_answers(answers)
+
+        with (
+            unittest.mock.patch(
+                "activities.buffering.write_answers", side_effect=flaky_write
+            ),
+            self.assertLogs("activities.buffering", "WARNING"),
+            self.assertRaises(OperationalError),
+        ):
+            buffer.flush()
+        self.assertEqual(UserAnswer.objects.count(), 2)
+
+        with self.assertLogs("activities.buffering", "WARNING"):
+            self.assertEqual(self._buffer().flush(), 3)
+        self.assertEqual(UserAnswer.objects.count(), 5)
+        spool_dir = Path(self.spool_dir.name)
+        self.assertEqual(
+            [p.name for p in spool_dir.iterdir()], [f"dead-{os.getpid()}.jsonl"]
+        )
+
+
+class AnswerLogExportTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        course = Course.objects.create(name="Inglés B1")
+        module = Module.objects.create(course=course, name="Unidad 1")
+        self.course_id = course.id
+        in_course = ChoiceActivity.objects.create(
+            title="Capital", type=ActivityType.CHOICE, module=module
+        )
+        other = ChoiceActivity.objects.create(title="Otra", type=ActivityType.CHOICE)
+        for activity in (in_course, in_course, other):
+            UserAnswer.objects.create(
+                user=self.user,
+                activity=activity,
+                response_data={"selected_ids": [1]},
+                is_correct=True,
+            )
+        self.output = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output.cleanup)
+
+    def test_csv_export_filters_by_course(self):
+        call_command(
+            "export_answer_logs",
+            self.output.name,
+            "--format",
+            "csv",
+            "--course-id",
+            str(self.course_id),
+            "--chunk-size",
+            "1",
+            stdout=io.StringIO(),
+        )
+        with open(Path(self.output.name) / "answers.csv", encoding="utf-8") as fh:
+            rows = list(csv.DictReader(fh))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(json.loads(rows[0]["response_data"]), {"selected_ids": [1]})
+        self.assertTrue((Path(self.output.name) / "enrollments.csv").exists())
+
+    def test_invalid_date_is_a_command_error(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "export_answer_logs", self.output.name, "--since", "2025-13-01"
+            )
+
+    def test_date_range_is_half_open(self):
+        spec = log_export.TABLES["answers"]
+        tomorrow = timezone.now() + timedelta(days=1)
+        filters = log_export.ExportFilters(until=tomorrow)
+        self.assertEqual(
+            sum(len(c["id"]) for c in log_export.iter_chunks(spec, filters, 2)), 3
+        )
+        filters = log_export.ExportFilters(since=tomorrow)
+        self.assertEqual(list(log_export.iter_chunks(spec, filters, 2)), [])
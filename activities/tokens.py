@@ -0,0 +1,18 @@
+import re
+
+from utils.enums import WordTokenizer
+
+PUNCTUATION_PATTERN = re.compile(r"\w+(?:['’-]\w+)*|[^\w\s]")
+
+
+def tokenize_sentence(sentence: str, tokenizer=WordTokenizer.WHITESPACE) -> list:
+    """
+    Divide la oración en las fichas que el estudiante debe ordenar.
+
+    `WHITESPACE` separa sólo por espacios (la puntuación queda pegada a la
+    palabra); `PUNCTUATION` además separa cada signo como una ficha propia.
+    """
+    sentence = (sentence or "").strip()
+    if tokenizer == WordTokenizer.PUNCTUATION:
+        return PUNCTUATION_PATTERN.findall(sentence)
+    return sentence.split()
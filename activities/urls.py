@@ -1,6 +1,11 @@
 from django.urls import path
 
-from .views import ActivityListView, LeaderboardTop10View, SubmitAnswerView
+from .views import (
+    ActivityListView,
+    LeaderboardTop10View,
+    LeaderboardView,
+    SubmitAnswerView,
+)
 
 urlpatterns = [
     path("", ActivityListView.as_view(), name="activity-list"),
@@ -9,6 +14,7 @@ urlpatterns = [
         SubmitAnswerView.as_view(),
         name="submit-answer",
     ),
+    path("leaderboard/", LeaderboardView.as_view(), name="leaderboard"),
     path(
         "leaderboard/top10/", LeaderboardTop10View.as_view(), name="leaderboard-top10"
     ),
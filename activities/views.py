@@ -4,25 +4,39 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from activities.models.base import Activity
+from activities.models.base import SUBCLASS_RELATIONS, Activity
 from activities.serializers import (
     ActivitySerializer,
+    LeaderboardEntryProjection,
     LeaderboardEntrySerializer,
+    LeaderboardSerializer,
     UserAnswerSerializer,
 )
 from activities.services import AnswerSubmissionService, LeaderboardService
+from utils.pagination import CURSOR_PAGINATION_PARAMETERS, CursorPaginatedAPIViewMixin
+from utils.streaming import StreamingListAPIViewMixin
 
 
-class ActivityListView(APIView):
+class ActivityListView(CursorPaginatedAPIViewMixin, StreamingListAPIViewMixin, APIView):
+    pagination_ordering = ("created_at", "id")
+
     @extend_schema(
         summary="Lista unificada de actividades",
         description="Devuelve una lista combinada de actividades de todos los tipos.",
+        parameters=CURSOR_PAGINATION_PARAMETERS,
         responses={200: ActivitySerializer(many=True)},
     )
     def get(self, request):
-        activities = Activity.objects.all().order_by("created_at")
-        serializer = ActivitySerializer(activities, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        activities = Activity.objects.select_related(*SUBCLASS_RELATIONS).order_by(
+            *self.pagination_ordering
+        )
+        page = self.paginate_queryset(activities)
+        if page is not None:
+            serializer = ActivitySerializer(
+                page, many=True, context=self.get_serializer_context()
+            )
+            return self.get_paginated_response(serializer.data)
+        return self.get_streaming_response(activities, ActivitySerializer)
 
 
 class SubmitAnswerView(APIView):
@@ -31,7 +45,12 @@ class SubmitAnswerView(APIView):
     @extend_schema(
         summary="Enviar respuesta de actividad",
         request=serializers.JSONField(),
-        description="Permite a un usuario enviar una respuesta para una actividad específica.",  # noqa: E501
+        description=(
+            "Permite a un usuario enviar una respuesta para una actividad "
+            "específica. La respuesta sólo indica si es correcta: con el buffer "
+            "de respuestas activo, la fila se guarda de forma diferida y aún "
+            "no tiene id."
+        ),
         responses={201: UserAnswerSerializer},
         examples=[
             OpenApiExample(
@@ -113,6 +132,68 @@ class LeaderboardTop10View(APIView):
         )
         payload = service.execute()
         return Response(
-            LeaderboardEntrySerializer(payload, many=True).data,
+            LeaderboardEntryProjection().represent_many(payload),
+            status=status.HTTP_200_OK,
+        )
+
+
+class LeaderboardView(APIView):
+    MAX_LIMIT = 100
+    MAX_NEIGHBORS = 25
+
+    @extend_schema(
+        summary="Ranking de estudiantes con posición y vecinos",
+        description=(
+            "Devuelve el top N, la posición exacta del usuario autenticado y "
+            "los K estudiantes inmediatamente por encima y por debajo. Permite "
+            "acotar por curso, idioma, módulo y ventana de tiempo."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "limit", int, description="Tamaño del top (default 10, máximo 100)"
+            ),
+            OpenApiParameter(
+                "neighbors",
+                int,
+                description="Vecinos a cada lado del usuario (default 0, máximo 25)",
+            ),
+            OpenApiParameter("time_window", str, description="day|week|month|all"),
+            OpenApiParameter("course_id", int, description="ID del curso"),
+            OpenApiParameter("language_id", int, description="ID del idioma"),
+            OpenApiParameter("module_id", int, description="ID del módulo"),
+        ],
+        responses={200: LeaderboardSerializer},
+    )
+    def get(self, request):
+        params = request.query_params
+        try:
+            limit = min(max(int(params.get("limit", 10)), 1), self.MAX_LIMIT)
+            neighbors = min(max(int(params.get("neighbors", 0)), 0), self.MAX_NEIGHBORS)
+            ids = {
+                name: int(params[name]) if params.get(name) else None
+                for name in ("course_id", "language_id", "module_id")
+            }
+        except ValueError:
+            return Response(
+                {"detail": "limit, neighbors y los IDs deben ser enteros."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        board = LeaderboardService(
+            request_user_id=request.user.id if request.user.is_authenticated else None,
+            limit=limit,
+            time_window=params.get("time_window", "all"),
+            neighbors=neighbors,
+            **ids,
+        ).board()
+        projection = LeaderboardEntryProjection()
+        return Response(
+            {
+                "top": projection.represent_many(board["top"]),
+                "me": projection.to_representation(board["me"])
+                if board["me"]
+                else None,
+                "neighbors": projection.represent_many(board["neighbors"]),
+            },
             status=status.HTTP_200_OK,
         )
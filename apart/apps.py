@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ApartConfig(AppConfig):
+    name = "apart"
+
+    def ready(self):
+        from . import checks  # noqa: F401
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def shared_cache_check(app_configs, **kwargs):
+    """
+    Los agregados y locks en caché (supervisión de exámenes, payloads,
+    candidatos de recomendación) se actualizan desde varios procesos: con una
+    caché por proceso cada uno vería su propia copia.
+    """
+    if getattr(settings, "TESTING", False):
+        return []
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend in PROCESS_LOCAL_CACHES:
+        return [
+            Error(
+                f"La caché por defecto ({backend}) no se comparte entre procesos.",
+                hint="Configura REDIS_URL o usa DatabaseCache.",
+                id="apart.E001",
+            )
+        ]
+    return []
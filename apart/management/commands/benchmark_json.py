@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import io
+import timeit
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from utils.renderers import ORJSONParser, ORJSONRenderer, orjson
+
+ANSWER_SAMPLES = (
+    {"selected_ids": [3, 5]},
+    {"answers": {"0": "París", "1": "Ecuador"}},
+    {"pairs": {"manzana": "apple", "perro": "dog"}},
+    {"words": ["El", "gato", "está", "durmiendo"]},
+)
+
+
+def _answers_payload(size: int):
+    return {
+        "attempt_id": 10,
+        "answers": [
+            {"activity_id": i, "input_data": ANSWER_SAMPLES[i % len(ANSWER_SAMPLES)]}
+            for i in range(size)
+        ],
+    }
+
+
+def _exam_snapshot(size: int):
+    now = timezone.now()
+    return [
+        {
+            "activity": {
+                "id": i,
+                "type": "choice",
+                "title": f"Pregunta {i}",
+                "instructions": _("Choose one answer."),
+                "difficulty": "medium",
+                "created_at": now - timedelta(minutes=i),
+                "payload": {
+                    "choices": [{"id": j, "text": f"Opción {j}"} for j in range(4)],
+                    "is_multiple": False,
+                },
+            },
+            "required": True,
+            "position": i,
+        }
+        for i in range(size)
+    ]
+
+
+def _progress_breakdown(size: int):
+    return {
+        "course": {"id": 1, "name": "Inglés B1"},
+        "overall": {
+            "total": size * 10,
+            "completed": size * 4,
+            "remaining": size * 6,
+            "percent": Decimal("40.00"),
+        },
+        "modules": [
+            {
+                "id": i,
+                "name": f"Módulo {i}",
+                "total": 10,
+                "completed": 4,
+                "remaining": 6,
+                "percent": Decimal("40.00"),
+            }
+            for i in range(size)
+        ],
+    }
+
+
+PAYLOADS = {
+    "answers": _answers_payload,
+    "exam_snapshot": _exam_snapshot,
+    "progress": _progress_breakdown,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark de JSONRenderer/JSONParser (stdlib) frente a "
+        "ORJSONRenderer/ORJSONParser sobre payloads representativos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=300,
+            help="Cantidad de elementos por payload (default: 300)",
+        )
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=200,
+            help="Repeticiones por medición (default: 200)",
+        )
+
+    def _measure(self, func, number):
+        return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+    def handle(self, *args, **opts):
+        if orjson is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "orjson no está instalado: ORJSONRenderer usa la librería "
+                    "estándar y los resultados serán equivalentes."
+                )
+            )
+
+        size, number = opts["size"], opts["number"]
+        stdlib_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+        stdlib_parser, fast_parser = JSONParser(), ORJSONParser()
+
+        self.stdout.write(
+            f"{'payload':<15}{'op':<8}{'stdlib µs':>12}{'orjson µs':>12}{'x':>8}"
+        )
+        for name, factory in PAYLOADS.items():
+            data = factory(size)
+            body = stdlib_renderer.render(data)
+
+            render_std = self._measure(lambda: stdlib_renderer.render(data), number)
+            render_fast = self._measure(lambda: fast_renderer.render(data), number)
+            parse_std = self._measure(
+                lambda: stdlib_parser.parse(io.BytesIO(body)), number
+            )
+            parse_fast = self._measure(
+                lambda: fast_parser.parse(io.BytesIO(body)), number
+            )
+
+            for op, std, fast in (
+                ("render", render_std, render_fast),
+                ("parse", parse_std, parse_fast),
+            ):
+                self.stdout.write(
+                    f"{name:<15}{op:<8}{std:>12.1f}{fast:>12.1f}{std / fast:>8.1f}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Listo."))
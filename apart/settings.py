@@ -32,6 +32,8 @@ SECRET_KEY = env("SECRET_KEY")
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = env.bool("DEBUG", default=True)
 
+TESTING = "test" in sys.argv
+
 
 ALLOWED_HOSTS = [
     "localhost",
@@ -89,6 +91,8 @@ INSTALLED_APPS = [
     "security",
     "drf_spectacular",
     "activities",
+    "jobs",
+    "live",
 ]
 
 SOCIALACCOUNT_PROVIDERS = {
@@ -141,6 +145,17 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "knox.auth.TokenAuthentication",
     ],
+    # orjson; para volver a la librería estándar usar
+    # rest_framework.renderers.JSONRenderer / rest_framework.parsers.JSONParser
+    "DEFAULT_RENDERER_CLASSES": [
+        "utils.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "utils.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 SPECTACULAR_SETTINGS = {
@@ -171,7 +186,7 @@ WSGI_APPLICATION = "apart.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-if "test" in sys.argv:
+if TESTING:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
@@ -198,6 +213,41 @@ else:
     }
 
 
+# Cache
+# La comparten los procesos web y los workers de `run_jobs` (agregados de
+# supervisión, locks, índices de candidatos), así que fuera de los tests debe
+# ser Redis o la base de datos (`manage.py createcachetable`).
+
+if TESTING:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+elif env("REDIS_URL", default=""):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+        }
+    }
+
+# Ranking
+# Fuera de los tests los puntajes viven en sorted sets de Redis; `database`
+# (tabla `leaderboard_score`) queda como alternativa sin Redis.
+
+LEADERBOARD_BACKEND = env(
+    "LEADERBOARD_BACKEND", default="database" if TESTING else "redis"
+)
+LEADERBOARD_REDIS_URL = env(
+    "LEADERBOARD_REDIS_URL",
+    default=env("REDIS_URL", default="redis://localhost:6379/0"),
+)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -10,6 +10,7 @@ urlpatterns = [
     path("activities/", include("activities.urls")),
     path("people/", include("people.urls")),
     path("content/", include("content.urls")),
+    path("live/", include("live.urls")),
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"
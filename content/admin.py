@@ -1,15 +1,23 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
 from django.urls import reverse
 from django.utils.html import format_html, format_html_join
 from django.utils.safestring import mark_safe
 from unfold.admin import ModelAdmin, TabularInline
+from unfold.decorators import action
+from unfold.forms import PaginationInlineFormSet
 
 from activities.models.base import Activity, ActivityType, ExamActivity
 from activities.models.choice import ChoiceActivity
 from activities.models.fill_in_the_blank import FillInTheBlankActivity
 from activities.models.matching import MatchingActivity
 from activities.models.word_ordering import WordOrderingActivity
+from utils.admin import related_count
 
+from .analytics import HISTOGRAM_BINS, ExamAnalyticsService
 from .models import Course, Exam, Module
 
 
@@ -50,6 +58,7 @@ class ModuleAdmin(ModelAdmin):
         css = {"all": ("admin/custom/buttons.css",)}
 
     list_display = ("name", "course", "end_date", "activities_count")
+    list_select_related = ("course",)
     fields = (
         "course",
         "name",
@@ -67,10 +76,16 @@ class ModuleAdmin(ModelAdmin):
         WordOrderingActivityInline,
     ]
 
-    def activities_count(self, obj):
-        return Activity.objects.filter(module=obj).count()
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(_activities_count=related_count(Activity.objects, "module"))
+        )
 
-    activities_count.short_description = "Actividades"
+    @admin.display(description="Actividades", ordering="_activities_count")
+    def activities_count(self, obj):
+        return obj._activities_count
 
     def add_activities(self, obj):
         if not obj or not obj.pk:
@@ -121,13 +136,85 @@ class CourseAdmin(ModelAdmin):
     inlines = [ModuleInline]
 
 
-class BaseExamActivityROInline(TabularInline):
+class PreloadedActivitySelect(AutocompleteSelect):
+    """Autocomplete que toma la etiqueta seleccionada de actividades precargadas."""
+
+    preloaded = None
+
+    def optgroups(self, name, value, attr=None):
+        if not self.preloaded:
+            return super().optgroups(name, value, attr)
+        selected = [self.preloaded.get(str(v)) for v in value if v]
+        if None in selected:
+            return super().optgroups(name, value, attr)
+        label = self.choices.field.label_from_instance
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, "", "", False, 0))
+        for activity in selected:
+            options.append(
+                self.create_option(
+                    name, activity.pk, label(activity), True, len(options)
+                )
+            )
+        return [(None, options, 0)]
+
+
+class PreloadedActivityChoiceField(forms.ModelChoiceField):
+    preloaded = None
+
+    def to_python(self, value):
+        if self.preloaded and str(value) in self.preloaded:
+            return self.preloaded[str(value)]
+        return super().to_python(value)
+
+
+class PreloadedExamItemsFormSet(PaginationInlineFormSet):
+    """
+    Formset que usa los ítems del examen ya cargados por `ExamAdmin`.
+
+    Evita que cada inline ejecute su propia consulta y que cada fila resuelva
+    su actividad por separado.
+    """
+
+    def __init__(self, *args, preloaded=None, **kwargs):
+        self.preloaded = preloaded
+        self.preloaded_activities = {
+            str(item.activity_id): item.activity for item in preloaded or ()
+        }
+        super().__init__(*args, **kwargs)
+
+    def get_queryset(self):
+        if self.preloaded is None:
+            return super().get_queryset()
+        return self.preloaded
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        field = form.fields.get("activity")
+        if field is not None and self.preloaded_activities:
+            field.preloaded = self.preloaded_activities
+            widget = getattr(field.widget, "widget", field.widget)
+            widget.preloaded = self.preloaded_activities
+        return form
+
+
+class ExamItemsInlineMixin:
+    formset = PreloadedExamItemsFormSet
+    activity_type = None
+
+    def filter_items(self, items):
+        if self.activity_type is None:
+            return items
+        return [item for item in items if item.activity.type == self.activity_type]
+
+
+class BaseExamActivityROInline(ExamItemsInlineMixin, TabularInline):
     model = ExamActivity
     extra = 0
     can_delete = False
     fields = ("activity_link", "required")
     readonly_fields = fields
-    activity_type = None
 
     def has_add_permission(self, request, obj=None):
         return False
@@ -165,12 +252,20 @@ class ExamWordOrderingInline(BaseExamActivityROInline):
     activity_type = ActivityType.ORDER
 
 
-class ExamActivityInline(TabularInline):
+class ExamActivityInline(ExamItemsInlineMixin, TabularInline):
     model = ExamActivity
     extra = 0
     fields = ("activity", "required")
     autocomplete_fields = ("activity",)
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == "activity":
+            kwargs["form_class"] = PreloadedActivityChoiceField
+            kwargs["widget"] = PreloadedActivitySelect(
+                db_field, self.admin_site, using=kwargs.get("using")
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
 
 @admin.register(Exam)
 class ExamAdmin(ModelAdmin):
@@ -178,6 +273,7 @@ class ExamAdmin(ModelAdmin):
         css = {"all": ("admin/custom/buttons.css",)}
 
     list_display = ("__str__", "course", "type", "is_published", "items_count")
+    list_select_related = ("course",)
     fields = (
         "course",
         "type",
@@ -189,6 +285,7 @@ class ExamAdmin(ModelAdmin):
         "add_activities",
     )
     readonly_fields = ("add_activities",)
+    actions_detail = ["view_analytics"]
 
     inlines = [
         ExamChoiceInline,
@@ -198,10 +295,57 @@ class ExamAdmin(ModelAdmin):
         ExamActivityInline,
     ]
 
-    def items_count(self, obj):
-        return obj.activities.count()
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(_items_count=related_count(ExamActivity.objects, "exam"))
+        )
 
-    items_count.short_description = "Actividades"
+    def _get_exam_items(self, request, obj):
+        cache = request.__dict__.setdefault("_exam_items", {})
+        if obj.pk not in cache:
+            items = list(
+                ExamActivity.objects.filter(exam=obj).select_related("activity")
+            )
+            for item in items:
+                item.exam = obj
+            cache[obj.pk] = items
+        return cache[obj.pk]
+
+    def get_formset_kwargs(self, request, obj, inline, prefix):
+        kwargs = super().get_formset_kwargs(request, obj, inline, prefix)
+        if obj is not None and obj.pk and isinstance(inline, ExamItemsInlineMixin):
+            kwargs["preloaded"] = inline.filter_items(
+                self._get_exam_items(request, obj)
+            )
+        return kwargs
+
+    @admin.display(description="Actividades", ordering="_items_count")
+    def items_count(self, obj):
+        return obj._items_count
+
+    @action(description="Analítica", url_path="analytics", permissions=["view"])
+    def view_analytics(self, request, object_id):
+        exam = get_object_or_404(Exam, pk=object_id)
+        analytics = ExamAnalyticsService(exam).get()
+        step = 100 // HISTOGRAM_BINS
+        histogram = [
+            (f"{i * step}–{(i + 1) * step}%", count)
+            for i, count in enumerate(analytics.histogram)
+        ]
+        return TemplateResponse(
+            request,
+            "admin/content/exam_analytics.html",
+            {
+                **self.admin_site.each_context(request),
+                "opts": self.model._meta,
+                "title": f"Analítica: {exam}",
+                "exam": exam,
+                "analytics": analytics,
+                "histogram": histogram,
+            },
+        )
 
     def add_activities(self, obj):
         if not obj or not obj.pk:
@@ -0,0 +1,219 @@
+"""
+Estadísticas de ítems de un examen sobre la matriz intentos × actividades.
+
+La matriz se arma con NumPy a partir de los pares (intento, actividad)
+acertados, y todas las métricas se calculan por columnas sin recorrer
+intentos en Python.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from activities.models.base import ExamActivity, UserAnswer
+from utils.enums import ExamAttemptStatus
+
+from .models import Exam, ExamAttempt
+
+FINISHED_STATUSES = (
+    ExamAttemptStatus.SUBMITTED,
+    ExamAttemptStatus.GRADED,
+    ExamAttemptStatus.EXPIRED,
+)
+HISTOGRAM_BINS = 10
+
+
+@dataclass
+class AnswerMatrix:
+    attempt_ids: np.ndarray
+    activity_ids: np.ndarray
+    points: np.ndarray
+    correct: np.ndarray  # (intentos, actividades), uint8
+
+    @property
+    def shape(self):
+        return self.correct.shape
+
+
+@dataclass
+class ExamAnalytics:
+    exam_id: int
+    attempts: int
+    max_points: int
+    mean_percent: Optional[float]
+    std_percent: Optional[float]
+    median_percent: Optional[float]
+    cronbach_alpha: Optional[float]
+    histogram: List[int]
+    items: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def load_answer_matrix(exam: Exam) -> AnswerMatrix:
+    items = list(
+        ExamActivity.objects.filter(exam=exam)
+        .order_by("activity_id")
+        .values_list("activity_id", "activity__points")
+    )
+    activity_ids = np.array([a for a, _ in items], dtype=np.int64)
+    points = np.array([p for _, p in items], dtype=np.float64)
+
+    attempt_qs = ExamAttempt.objects.filter(exam=exam, status__in=FINISHED_STATUSES)
+    attempt_ids = np.fromiter(
+        attempt_qs.order_by("id").values_list("id", flat=True).iterator(),
+        dtype=np.int64,
+    )
+
+    pairs = (
+        UserAnswer.objects.filter(
+            exam_attempt__exam=exam,
+            exam_attempt__status__in=FINISHED_STATUSES,
+            is_correct=True,
+            activity_id__in=activity_ids.tolist(),
+        )
+        .values_list("exam_attempt_id", "activity_id")
+        .order_by()
+        .distinct()
+    )
+    flat = np.fromiter(
+        (value for pair in pairs.iterator(chunk_size=10_000) for value in pair),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+
+    correct = np.zeros((len(attempt_ids), len(activity_ids)), dtype=np.uint8)
+    if len(flat) and len(attempt_ids) and len(activity_ids):
+        rows = np.searchsorted(attempt_ids, flat[:, 0])
+        cols = np.searchsorted(activity_ids, flat[:, 1])
+        # Intentos que terminaron entre una consulta y otra quedan fuera.
+        rows = np.minimum(rows, len(attempt_ids) - 1)
+        known = attempt_ids[rows] == flat[:, 0]
+        correct[rows[known], cols[known]] = 1
+    return AnswerMatrix(attempt_ids, activity_ids, points, correct)
+
+
+def _round(value) -> Optional[float]:
+    if value is None or not np.isfinite(value):
+        return None
+    return round(float(value), 4)
+
+
+def item_statistics(matrix: AnswerMatrix) -> Dict[str, np.ndarray]:
+    """
+    `p_values`: proporción de aciertos por ítem.
+    `discrimination`: correlación punto-biserial entre el ítem y el puntaje
+    del resto del examen (sin el propio ítem).
+    """
+    x = matrix.correct.astype(np.float64)
+    weighted = x * matrix.points
+    totals = weighted.sum(axis=1)
+
+    p_values = x.mean(axis=0)
+    rest = totals[:, None] - weighted
+    xc = x - p_values
+    rc = rest - rest.mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discrimination = (xc * rc).sum(axis=0) / np.sqrt(
+            (xc**2).sum(axis=0) * (rc**2).sum(axis=0)
+        )
+    return {
+        "p_values": p_values,
+        "discrimination": discrimination,
+        "totals": totals,
+        "weighted": weighted,
+    }
+
+
+def cronbach_alpha(weighted: np.ndarray) -> Optional[float]:
+    attempts, items = weighted.shape
+    if attempts < 2 or items < 2:
+        return None
+    total_var = weighted.sum(axis=1).var(ddof=1)
+    if total_var == 0:
+        return None
+    return items / (items - 1) * (1 - weighted.var(axis=0, ddof=1).sum() / total_var)
+
+
+def compute_analytics(exam: Exam) -> ExamAnalytics:
+    matrix = load_answer_matrix(exam)
+    attempts, _ = matrix.shape
+    max_points = int(matrix.points.sum())
+    stats = item_statistics(matrix)
+
+    details = {
+        activity_id: (title, position)
+        for activity_id, title, position in ExamActivity.objects.filter(
+            exam=exam
+        ).values_list("activity_id", "activity__title", "position")
+    }
+
+    percents = stats["totals"] / max_points * 100 if max_points else np.zeros(attempts)
+    histogram, _ = np.histogram(percents, bins=HISTOGRAM_BINS, range=(0, 100))
+    has_attempts = attempts > 0
+
+    items = []
+    for i, activity_id in enumerate(matrix.activity_ids.tolist()):
+        title, position = details.get(activity_id, ("", None))
+        items.append({
+            "activity_id": activity_id,
+            "title": title,
+            "position": position,
+            "points": int(matrix.points[i]),
+            "p_value": _round(stats["p_values"][i]) if has_attempts else None,
+            "discrimination": _round(stats["discrimination"][i]),
+        })
+    items.sort(key=lambda item: (item["position"] or 0, item["activity_id"]))
+
+    return ExamAnalytics(
+        exam_id=exam.pk,
+        attempts=attempts,
+        max_points=max_points,
+        mean_percent=_round(percents.mean()) if has_attempts else None,
+        std_percent=_round(percents.std()) if has_attempts else None,
+        median_percent=_round(np.median(percents)) if has_attempts else None,
+        cronbach_alpha=_round(cronbach_alpha(stats["weighted"])),
+        histogram=histogram.tolist(),
+        items=items,
+    )
+
+
+class ExamAnalyticsService:
+    """
+    Analítica de un examen, cacheada mientras no cambien sus intentos ni sus
+    ítems (incluidos sus puntos y posiciones).
+    """
+
+    def __init__(self, exam: Exam):
+        self.exam = exam
+
+    def _cache_key(self) -> str:
+        attempts = ExamAttempt.objects.filter(
+            exam=self.exam, status__in=FINISHED_STATUSES
+        ).aggregate(n=Count("id"), graded=Max("graded_at"), last=Max("finished_at"))
+        items = list(
+            ExamActivity.objects.filter(exam=self.exam)
+            .order_by("id")
+            .values_list("activity_id", "activity__points", "position")
+        )
+        stamp = f"{attempts['n']}:{attempts['graded']}:{attempts['last']}:{items}"
+        digest = hashlib.blake2b(stamp.encode(), digest_size=8).hexdigest()
+        return f"exam-analytics:{self.exam.pk}:{digest}"
+
+    def get(self, use_cache: bool = True) -> ExamAnalytics:
+        if not use_cache:
+            return compute_analytics(self.exam)
+        key = self._cache_key()
+        data = cache.get(key)
+        if data is None:
+            data = compute_analytics(self.exam).to_dict()
+            timeout = getattr(settings, "EXAM_ANALYTICS_CACHE_TIMEOUT", 3600)
+            cache.set(key, data, timeout)
+        return ExamAnalytics(**data)
@@ -1,2 +1,6 @@
 class NoAttemptsRemainingError(Exception):
     """Se lanza cuando el usuario ya no tiene intentos disponibles."""
+
+
+class EmptySubmissionError(Exception):
+    """Se lanza al finalizar un intento sin respuestas ni borradores."""
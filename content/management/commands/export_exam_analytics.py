@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from content.analytics import ExamAnalyticsService
+from content.models import Exam
+
+ITEM_FIELDS = [
+    "position",
+    "activity_id",
+    "title",
+    "points",
+    "p_value",
+    "discrimination",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta la analítica de ítems de un examen (dificultad, "
+        "discriminación, distribución de puntajes y alfa de Cronbach)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("exam_id", type=int, help="ID del examen")
+        parser.add_argument(
+            "--output",
+            help="Archivo de salida (default: salida estándar)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["json", "csv"],
+            default="json",
+            help="json: resumen completo; csv: una fila por ítem (default: json)",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Recalcula aunque haya un resultado en caché",
+        )
+
+    def handle(self, *args, **opts):
+        exam = Exam.objects.filter(pk=opts["exam_id"]).first()
+        if exam is None:
+            raise CommandError(f"No existe el examen {opts['exam_id']}.")
+
+        started = time.perf_counter()
+        analytics = ExamAnalyticsService(exam).get(use_cache=not opts["no_cache"])
+        elapsed = time.perf_counter() - started
+
+        buffer = io.StringIO()
+        if opts["format"] == "csv":
+            writer = csv.DictWriter(buffer, fieldnames=ITEM_FIELDS)
+            writer.writeheader()
+            writer.writerows(analytics.items)
+        else:
+            json.dump(analytics.to_dict(), buffer, ensure_ascii=False, indent=2)
+            buffer.write("\n")
+
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8", newline="") as out:
+                out.write(buffer.getvalue())
+        else:
+            self.stdout.write(buffer.getvalue(), ending="")
+
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"{analytics.attempts} intentos × {len(analytics.items)} ítems "
+                f"en {elapsed:.2f}s."
+            )
+        )
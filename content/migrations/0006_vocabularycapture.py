@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0004_useranswer_exam_attempt_and_more'),
+        ('content', '0005_course_students_module_end_date_and_more'),
+        ('people', '0009_alter_person_photo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VocabularyCapture',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('captured_at', models.DateTimeField(auto_now_add=True)),
+                ('activity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vocabulary_captures', to='activities.activity')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vocabulary_captures', to='people.student')),
+            ],
+            options={
+                'verbose_name': 'Vocabulary Capture',
+                'verbose_name_plural': 'Vocabulary Captures',
+                'db_table': 'vocabulary_capture',
+                'constraints': [models.UniqueConstraint(fields=('student', 'activity'), name='uq_vocab_capture_student_activity')],
+            },
+        ),
+    ]
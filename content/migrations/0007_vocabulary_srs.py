@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0006_vocabularycapture"),
+        ("people", "0009_alter_person_photo"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vocabulary",
+            name="due_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="vocabulary",
+            name="ease",
+            field=models.FloatField(
+                default=2.5, help_text="Factor de facilidad (SM-2)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="vocabulary",
+            name="interval_days",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="vocabulary",
+            name="last_reviewed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="vocabulary",
+            name="repetitions",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Repasos correctos consecutivos"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vocabulary",
+            index=models.Index(
+                fields=["student", "due_at"], name="vocabulary_student_ab7bee_idx"
+            ),
+        ),
+    ]
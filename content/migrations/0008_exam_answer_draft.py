@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activities", "0009_leaderboard_score"),
+        ("content", "0007_vocabulary_srs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExamAnswerDraft",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("input_data", models.JSONField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "activity",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exam_drafts",
+                        to="activities.activity",
+                    ),
+                ),
+                (
+                    "attempt",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="drafts",
+                        to="content.examattempt",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Exam Answer Draft",
+                "verbose_name_plural": "Exam Answer Drafts",
+                "db_table": "exam_answer_draft",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("attempt", "activity"),
+                        name="uq_exam_draft_attempt_activity",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -79,6 +79,9 @@ class Vocabulary(models.Model):
                 fields=["student", "word"], name="uq_vocab_student_word"
             )
         ]
+        indexes = [
+            models.Index(fields=["student", "due_at"]),
+        ]
 
     student = models.ForeignKey(
         Student, on_delete=models.CASCADE, related_name="vocabularies"
@@ -92,10 +95,43 @@ class Vocabulary(models.Model):
         blank=True,
     )
 
+    ease = models.FloatField(default=2.5, help_text="Factor de facilidad (SM-2)")
+    interval_days = models.PositiveIntegerField(default=0)
+    repetitions = models.PositiveIntegerField(
+        default=0, help_text="Repasos correctos consecutivos"
+    )
+    due_at = models.DateTimeField(default=timezone.now)
+    last_reviewed_at = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
         return f"{self.word} - {self.student}"
 
 
+class VocabularyCapture(models.Model):
+    class Meta:
+        verbose_name = "Vocabulary Capture"
+        verbose_name_plural = "Vocabulary Captures"
+        db_table = "vocabulary_capture"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "activity"], name="uq_vocab_capture_student_activity"
+            )
+        ]
+
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="vocabulary_captures"
+    )
+    activity = models.ForeignKey(
+        "activities.Activity",
+        on_delete=models.CASCADE,
+        related_name="vocabulary_captures",
+    )
+    captured_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.student} - {self.activity_id}"
+
+
 class Exam(models.Model):
     class Meta:
         db_table = "exam"
@@ -176,3 +212,34 @@ class ExamAttempt(models.Model):
     def is_expired(self):
         exp = self.expires_at()
         return bool(exp and timezone.now() > exp)
+
+
+class ExamAnswerDraft(models.Model):
+    """
+    Última respuesta guardada de un intento en curso para una actividad.
+
+    El cliente la guarda a medida que responde; al finalizar, el intento se
+    califica con estos borradores más lo que llegue en la entrega.
+    """
+
+    class Meta:
+        db_table = "exam_answer_draft"
+        verbose_name = "Exam Answer Draft"
+        verbose_name_plural = "Exam Answer Drafts"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["attempt", "activity"], name="uq_exam_draft_attempt_activity"
+            )
+        ]
+
+    attempt = models.ForeignKey(
+        ExamAttempt, on_delete=models.CASCADE, related_name="drafts"
+    )
+    activity = models.ForeignKey(
+        "activities.Activity", on_delete=models.CASCADE, related_name="exam_drafts"
+    )
+    input_data = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Borrador {self.attempt_id}/{self.activity_id}"
@@ -1,13 +1,16 @@
 # content/permissions.py
 from rest_framework.permissions import BasePermission
 
+from people.models import Enrollment, EnrollmentStatus
+from utils.enums import EnrollmentRole
+
 from .models import ExamAttempt, ExamAttemptStatus
 
 
 class HasStartedExam(BasePermission):
     """
     Permite acceso solo si existe un intento IN_PROGRESS del usuario sobre el examen
-    y no está expirado.
+    y no está expirado. El intento queda disponible en `view.attempt`.
     """
 
     def has_object_permission(self, request, view, obj):
@@ -24,4 +27,27 @@ class HasStartedExam(BasePermission):
             return False
         if attempt.is_expired():
             return False
+        view.attempt = attempt
         return True
+
+
+class IsCourseProctor(BasePermission):
+    """
+    Permite supervisar los exámenes de un curso al staff y a quienes tienen
+    una inscripción activa en él con rol de docente.
+    """
+
+    PROCTOR_ROLES = (EnrollmentRole.TEACHER,)
+
+    def has_object_permission(self, request, view, obj):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        if user.is_staff:
+            return True
+        return Enrollment.objects.filter(
+            course_id=obj,
+            student__person__user=user,
+            status=EnrollmentStatus.ACTIVE,
+            role__in=self.PROCTOR_ROLES,
+        ).exists()
@@ -0,0 +1,330 @@
+"""
+Estado en vivo de un examen para quien lo supervisa.
+
+El agregado de cada examen vive en la caché repartido en claves, para que los
+eventos de inicio, respuesta, entrega y vencimiento de intentos no compitan
+entre sí:
+
+- `<examen>`: la generación vigente del agregado.
+- `<examen>:<gen>:count:<estado>`: conteos por estado, con `cache.incr`.
+- `<examen>:<gen>:seq`: cantidad de intentos registrados, con `cache.incr`;
+  cada intento ocupa el slot `<examen>:<gen>:slot:<n>` con sus datos y las
+  actividades respondidas, y `<examen>:<gen>:attempt:<id>` apunta a su slot.
+
+Sólo las respuestas de un mismo intento se serializan, con un lock propio del
+slot. Consultar el agregado son tres lecturas de caché (generación, conteos y
+slots) sin importar cuántos estudiantes rinden. Si falta una clave o un
+evento no puede aplicarse, se descarta la generación y la siguiente lectura
+reconstruye todo desde la base de datos.
+
+Los eventos llegan desde los procesos web y desde los workers de `run_jobs`,
+así que el agregado requiere una caché compartida (ver `CACHES` y el check
+`apart.E001`). Con Redis `incr` es atómico; con la caché de base de datos no
+lo es, y un conteo perdido se corrige al reconstruir.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from activities.models.base import UserAnswer
+from utils.enums import ExamAttemptStatus
+
+from .models import Exam, ExamAnswerDraft, ExamAttempt
+
+logger = logging.getLogger(__name__)
+
+# Límites inferiores, en minutos, de los tramos de tiempo restante.
+REMAINING_BUCKETS = (("0-5", 0), ("5-15", 5), ("15-30", 15), ("30+", 30))
+LOCK_TIMEOUT = 5
+LOCK_RETRIES = 50
+
+
+def _expires_at(started_at, minutes) -> Optional[timezone.datetime]:
+    if not minutes or not started_at:
+        return None
+    return started_at + timedelta(minutes=minutes)
+
+
+class ExamProctorService:
+    def __init__(self, exam_id: int):
+        self.exam_id = exam_id
+
+    @property
+    def key(self) -> str:
+        return f"exam-proctor:{self.exam_id}"
+
+    def _key(self, generation: str, *parts) -> str:
+        return ":".join([self.key, generation, *map(str, parts)])
+
+    def _timeout(self) -> int:
+        return getattr(settings, "EXAM_PROCTOR_CACHE_TIMEOUT", 6 * 3600)
+
+    def invalidate(self) -> None:
+        cache.delete(self.key)
+
+    @contextmanager
+    def _lock(self, key: str, retries: int = LOCK_RETRIES):
+        lock_key = f"{key}:lock"
+        for attempt in range(retries):
+            if cache.add(lock_key, 1, LOCK_TIMEOUT):
+                break
+            if attempt + 1 < retries:
+                time.sleep(0.01)
+        else:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            cache.delete(lock_key)
+
+    def build(self) -> Dict[str, Any]:
+        exam = Exam.objects.only("id", "course_id", "time_limit_minutes").get(
+            pk=self.exam_id
+        )
+        attempts = ExamAttempt.objects.filter(exam_id=self.exam_id)
+        counts = dict(attempts.values_list("status").annotate(n=Count("id")).order_by())
+        in_progress = {
+            row["id"]: {
+                "user_id": row["user_id"],
+                "username": row["user__username"],
+                "started_at": row["started_at"],
+                "expires_at": _expires_at(
+                    row["started_at"],
+                    row["time_limit_minutes"] or exam.time_limit_minutes,
+                ),
+                "answered": set(),
+            }
+            for row in attempts.filter(status=ExamAttemptStatus.IN_PROGRESS).values(
+                "id", "user_id", "user__username", "started_at", "time_limit_minutes"
+            )
+        }
+        # Cuentan también los borradores, que `record_answers` suma al guardarse.
+        answered = (
+            UserAnswer.objects.filter(exam_attempt_id__in=list(in_progress))
+            .values_list("exam_attempt_id", "activity_id")
+            .order_by()
+            .union(
+                ExamAnswerDraft.objects.filter(
+                    attempt_id__in=list(in_progress)
+                ).values_list("attempt_id", "activity_id")
+            )
+        )
+        for attempt_id, activity_id in answered:
+            in_progress[attempt_id]["answered"].add(activity_id)
+        return {
+            "exam_id": exam.pk,
+            "course_id": exam.course_id,
+            "counts": counts,
+            "attempts": in_progress,
+        }
+
+    def _store(self, data: Dict[str, Any]) -> None:
+        generation = uuid.uuid4().hex
+        values = {
+            self._key(generation, "meta"): {
+                "exam_id": data["exam_id"],
+                "course_id": data["course_id"],
+            },
+            self._key(generation, "seq"): len(data["attempts"]),
+        }
+        for status in ExamAttemptStatus.values:
+            values[self._key(generation, "count", status)] = data["counts"].get(
+                status, 0
+            )
+        for slot, (attempt_id, entry) in enumerate(data["attempts"].items(), 1):
+            values[self._key(generation, "attempt", attempt_id)] = slot
+            values[self._key(generation, "slot", slot)] = {
+                "attempt_id": attempt_id,
+                **entry,
+            }
+        cache.set_many(values, self._timeout())
+        cache.set(self.key, generation, self._timeout())
+
+    def _load(self, generation: str) -> Optional[Dict[str, Any]]:
+        count_keys = {
+            self._key(generation, "count", status): status
+            for status in ExamAttemptStatus.values
+        }
+        meta_key, seq_key = self._key(generation, "meta"), self._key(generation, "seq")
+        head = cache.get_many([meta_key, seq_key, *count_keys])
+        if meta_key not in head or seq_key not in head:
+            return None
+        slots = cache.get_many([
+            self._key(generation, "slot", n) for n in range(1, head[seq_key] + 1)
+        ])
+        return {
+            **head[meta_key],
+            "counts": {
+                status: max(head.get(key, 0), 0) for key, status in count_keys.items()
+            },
+            "attempts": {entry["attempt_id"]: entry for entry in slots.values()},
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        generation = cache.get(self.key)
+        if generation is not None:
+            data = self._load(generation)
+            if data is not None:
+                return data
+        with self._lock(self.key, retries=1) as locked:
+            data = self.build()
+            if locked:
+                self._store(data)
+            return data
+
+    def _incr(self, generation: str, status: str, delta: int) -> bool:
+        try:
+            cache.incr(self._key(generation, "count", status), delta)
+        except ValueError:
+            self.invalidate()
+            return False
+        return True
+
+    def _update_slot(
+        self,
+        generation: str,
+        attempt_id: int,
+        change: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+    ) -> None:
+        """Aplica `change` al slot del intento; si devuelve None, lo borra."""
+        slot = cache.get(self._key(generation, "attempt", attempt_id))
+        if not slot:
+            return
+        slot_key = self._key(generation, "slot", slot)
+        with self._lock(slot_key) as locked:
+            if not locked:
+                logger.warning(
+                    "Lock ocupado en %s; se reconstruirá el agregado.", slot_key
+                )
+                self.invalidate()
+                return
+            entry = cache.get(slot_key)
+            if entry is None:
+                return
+            entry = change(entry)
+            if entry is None:
+                cache.delete(slot_key)
+            else:
+                cache.set(slot_key, entry, self._timeout())
+
+    def record_started(self, attempt: ExamAttempt, exam_limit=None) -> None:
+        generation = cache.get(self.key)
+        if generation is None:
+            return
+        attempt_key = self._key(generation, "attempt", attempt.pk)
+        if not cache.add(attempt_key, 0, self._timeout()):
+            return
+        try:
+            slot = cache.incr(self._key(generation, "seq"))
+        except ValueError:
+            self.invalidate()
+            return
+        cache.set(
+            self._key(generation, "slot", slot),
+            {
+                "attempt_id": attempt.pk,
+                "user_id": attempt.user_id,
+                "username": attempt.user.username,
+                "started_at": attempt.started_at,
+                "expires_at": _expires_at(
+                    attempt.started_at, attempt.time_limit_minutes or exam_limit
+                ),
+                "answered": set(),
+            },
+            self._timeout(),
+        )
+        cache.set(attempt_key, slot, self._timeout())
+        self._incr(generation, attempt.status, 1)
+
+    def record_status(self, attempt_id: int, previous: str, status: str) -> None:
+        if previous == status:
+            return
+        generation = cache.get(self.key)
+        if generation is None:
+            return
+        if not (
+            self._incr(generation, previous, -1) and self._incr(generation, status, 1)
+        ):
+            return
+        if status != ExamAttemptStatus.IN_PROGRESS:
+            self._update_slot(generation, attempt_id, lambda entry: None)
+
+    def record_answers(self, attempt_id: int, activity_ids: Iterable[int]) -> None:
+        activity_ids = set(activity_ids)
+        generation = cache.get(self.key)
+        if generation is None or not activity_ids:
+            return
+
+        def change(entry):
+            entry["answered"] |= activity_ids
+            return entry
+
+        self._update_slot(generation, attempt_id, change)
+
+    def report(self, now=None) -> Dict[str, Any]:
+        now = now or timezone.now()
+        data = self.snapshot()
+
+        attempts: List[Dict[str, Any]] = []
+        remaining = {label: 0 for label, _ in REMAINING_BUCKETS}
+        overdue = unlimited = 0
+        for attempt_id, entry in data["attempts"].items():
+            seconds = None
+            if entry["expires_at"] is None:
+                unlimited += 1
+            else:
+                seconds = max(int((entry["expires_at"] - now).total_seconds()), 0)
+                if seconds == 0:
+                    overdue += 1
+                else:
+                    label = [
+                        label
+                        for label, minutes in REMAINING_BUCKETS
+                        if seconds >= minutes * 60
+                    ][-1]
+                    remaining[label] += 1
+            attempts.append({
+                "attempt_id": attempt_id,
+                "user_id": entry["user_id"],
+                "username": entry["username"],
+                "started_at": entry["started_at"],
+                "remaining_seconds": seconds,
+                "answered_count": len(entry["answered"]),
+            })
+        attempts.sort(
+            key=lambda a: (a["remaining_seconds"] is None, a["remaining_seconds"] or 0)
+        )
+
+        return {
+            "exam_id": data["exam_id"],
+            "course_id": data["course_id"],
+            "counts": {
+                status: data["counts"].get(status, 0)
+                for status in ExamAttemptStatus.values
+            },
+            "remaining": [
+                {"label": label, "count": remaining[label]}
+                for label, _ in REMAINING_BUCKETS
+            ],
+            "overdue": overdue,
+            "unlimited": unlimited,
+            "attempts": attempts,
+        }
+
+
+def on_commit(exam_id: int, method: str, *args) -> None:
+    """Aplica un evento al agregado del examen al confirmar la transacción."""
+    transaction.on_commit(lambda: getattr(ExamProctorService(exam_id), method)(*args))
@@ -2,15 +2,24 @@ from typing import Any, Dict, List
 
 from rest_framework import serializers
 
-from activities.models.base import Activity
+from activities.models.base import Activity, ExamActivity
 from activities.strategies.validation.registry import ValidationStrategyRegistry
 from content.models import ExamAttempt
-from languages.serializers import LanguageSerializer
+from languages.serializers import LanguageReadProjection, LanguageSerializer
+from utils.enums import DifficultyLevel
+from utils.projections import (
+    Field,
+    Nested,
+    ValuesProjection,
+    choices_display,
+    file_url,
+)
+from utils.serializers import SelectableFieldsMixin
 
 from .models import Course, Exam, Module, Vocabulary
 
 
-class ModuleSerializer(serializers.ModelSerializer):
+class ModuleSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     difficulty = serializers.CharField(source="get_difficulty_display")
 
     class Meta:
@@ -18,7 +27,7 @@ class ModuleSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "description", "image", "difficulty")
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     difficulty = serializers.CharField(source="get_difficulty_display")
     language = LanguageSerializer(read_only=True)
 
@@ -27,6 +36,27 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "description", "image", "difficulty", "language")
 
 
+class ModuleReadProjection(ValuesProjection):
+    fields = {
+        "id": "id",
+        "name": "name",
+        "description": "description",
+        "image": Field(transform=file_url()),
+        "difficulty": Field(transform=choices_display(DifficultyLevel)),
+    }
+
+
+class CourseReadProjection(ValuesProjection):
+    fields = {
+        "id": "id",
+        "name": "name",
+        "description": "description",
+        "image": Field(transform=file_url()),
+        "difficulty": Field(transform=choices_display(DifficultyLevel)),
+        "language": Nested("language", LanguageReadProjection),
+    }
+
+
 class ExamSerializer(serializers.ModelSerializer):
     has_attempts_left = serializers.SerializerMethodField()
     remaining_attempts = serializers.SerializerMethodField()
@@ -93,10 +123,12 @@ class ExamSerializer(serializers.ModelSerializer):
         return any(a.passed for a in (attempts or []))
 
 
-class AnswerInputItemSerializer(serializers.Serializer):
+class AnswerItemSerializer(serializers.Serializer):
     activity_id = serializers.IntegerField()
     input_data = serializers.DictField()
 
+
+class AnswerInputItemSerializer(AnswerItemSerializer):
     def validate(self, attrs):
         attempt: ExamAttempt = self.context["attempt"]
         activity_id = attrs["activity_id"]
@@ -122,9 +154,8 @@ class AnswerInputItemSerializer(serializers.Serializer):
 
 
 class FinishAttemptRequestSerializer(serializers.Serializer):
-    answers = serializers.ListField(
-        child=AnswerInputItemSerializer(), allow_empty=False
-    )
+    # Puede venir vacío si las respuestas ya se guardaron como borradores.
+    answers = serializers.ListField(child=AnswerInputItemSerializer(), allow_empty=True)
 
     def validate(self, attrs):
         activity_ids = [item["activity_id"] for item in attrs["answers"]]
@@ -144,6 +175,63 @@ class FinishAttemptRequestSerializer(serializers.Serializer):
         return ret
 
 
+class ExamDraftRequestSerializer(serializers.Serializer):
+    """
+    Lote de borradores de un intento. Las actividades del lote se validan
+    contra el examen con una sola consulta.
+    """
+
+    MAX_ANSWERS = 200
+
+    attempt_id = serializers.IntegerField()
+    answers = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=MAX_ANSWERS
+    )
+
+    def validate_answers(self, answers):
+        attempt: ExamAttempt = self.context["attempt"]
+        items = []
+        for raw in answers:
+            item = AnswerItemSerializer(data=raw)
+            item.is_valid(raise_exception=True)
+            items.append(item.validated_data)
+
+        activity_ids = [item["activity_id"] for item in items]
+        if len(activity_ids) != len(set(activity_ids)):
+            raise serializers.ValidationError("Duplicated activity_id in answers.")
+        types = dict(
+            ExamActivity.objects.filter(
+                exam_id=attempt.exam_id, activity_id__in=activity_ids
+            ).values_list("activity_id", "activity__type")
+        )
+
+        for item in items:
+            activity_type = types.get(item["activity_id"])
+            if activity_type is None:
+                raise serializers.ValidationError({
+                    "activity_id": (
+                        f"Activity {item['activity_id']} doesn't belong to this exam."
+                    )
+                })
+            in_serializer_class = ValidationStrategyRegistry.get_serializer(
+                activity_type
+            )
+            if in_serializer_class is None:
+                raise serializers.ValidationError({
+                    "activity_id": f"No serializer for activity type '{activity_type}'"
+                })
+            in_ser = in_serializer_class(data=item["input_data"])
+            in_ser.is_valid(raise_exception=True)
+            item["input_data"] = in_ser.validated_data
+        return items
+
+
+class ExamDraftResponseSerializer(serializers.Serializer):
+    attempt_id = serializers.IntegerField()
+    saved = serializers.IntegerField()
+    drafts = serializers.IntegerField()
+
+
 class FinishAttemptResponseSerializer(serializers.ModelSerializer):
     attempt_id = serializers.IntegerField(source="id", read_only=True)
     percentage = serializers.FloatField(read_only=True)
@@ -164,6 +252,21 @@ class FinishAttemptResponseSerializer(serializers.ModelSerializer):
         )
 
 
+class ExamSubmissionTicketSerializer(serializers.Serializer):
+    attempt_id = serializers.IntegerField()
+    state = serializers.CharField()
+    status_url = serializers.CharField()
+
+
+class ExamSubmissionStatusSerializer(serializers.Serializer):
+    attempt_id = serializers.IntegerField()
+    state = serializers.CharField(
+        help_text="queued, grading, graded, failed o el estado del intento."
+    )
+    detail = serializers.CharField(required=False)
+    result = FinishAttemptResponseSerializer(required=False)
+
+
 class StartAttemptResponseSerializer(serializers.Serializer):
     attempt_id = serializers.IntegerField()
     attempt_number = serializers.IntegerField()
@@ -187,12 +290,60 @@ class ExamAttemptStartSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class VocabularySerializer(serializers.ModelSerializer):
+class VocabularySerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Vocabulary
         fields = ("id", "word", "meaning", "difficulty")
 
 
+class VocabularyReadProjection(ValuesProjection):
+    fields = {
+        "id": "id",
+        "word": "word",
+        "meaning": "meaning",
+        "difficulty": "difficulty",
+    }
+
+
+class VocabularyCardSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Vocabulary
+        fields = (
+            "id",
+            "word",
+            "meaning",
+            "difficulty",
+            "ease",
+            "interval_days",
+            "repetitions",
+            "due_at",
+            "last_reviewed_at",
+        )
+        read_only_fields = fields
+
+
+class VocabularyReviewItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    quality = serializers.IntegerField(min_value=0, max_value=5)
+
+
+class VocabularyReviewSerializer(serializers.Serializer):
+    reviews = VocabularyReviewItemSerializer(
+        many=True, allow_empty=False, max_length=500
+    )
+
+
+class RecommendationSerializer(serializers.Serializer):
+    activity_id = serializers.IntegerField(source="activity.id")
+    title = serializers.CharField(source="activity.title")
+    type = serializers.CharField(source="activity.type")
+    difficulty = serializers.CharField(source="activity.difficulty")
+    points = serializers.IntegerField(source="activity.points")
+    module_id = serializers.IntegerField(source="activity.module_id")
+    module_name = serializers.CharField()
+    score = serializers.FloatField()
+
+
 class ModuleProgressSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     name = serializers.CharField()
@@ -214,3 +365,26 @@ class CourseProgressSerializer(serializers.Serializer):
     overall = OverallProgressSerializer()
     modules = ModuleProgressSerializer(many=True)
     is_active = serializers.BooleanField(required=False)
+
+
+class ProctorAttemptSerializer(serializers.Serializer):
+    attempt_id = serializers.IntegerField()
+    user_id = serializers.IntegerField()
+    username = serializers.CharField()
+    started_at = serializers.DateTimeField()
+    remaining_seconds = serializers.IntegerField(allow_null=True)
+    answered_count = serializers.IntegerField()
+
+
+class ProctorBucketSerializer(serializers.Serializer):
+    label = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class ExamProctorSerializer(serializers.Serializer):
+    exam_id = serializers.IntegerField()
+    counts = serializers.DictField(child=serializers.IntegerField())
+    remaining = ProctorBucketSerializer(many=True)
+    overdue = serializers.IntegerField()
+    unlimited = serializers.IntegerField()
+    attempts = ProctorAttemptSerializer(many=True)
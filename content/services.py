@@ -5,16 +5,20 @@ from datetime import timedelta
 from typing import Any, Dict, List, Optional
 
 from django.db import transaction
-from django.db.models import Count, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models import Count, Max, Sum, Value
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from activities.models.base import Activity, UserAnswer
-from content.models import Course, Module
+from activities.models.base import Activity, FirstCorrectAnswer, UserAnswer
+from content import proctoring, srs
+from content.models import Course, ExamAnswerDraft, Module, Vocabulary
+from content.tasks import GRADE_ATTEMPT
+from jobs.models import Job
+from jobs.services import JobQueue
 from users.models import User
-from utils.enums import CONSUME_STATUSES
+from utils.enums import CONSUME_STATUSES, JobStatus
 
-from .exceptions import NoAttemptsRemainingError
+from .exceptions import EmptySubmissionError, NoAttemptsRemainingError
 from .models import Exam, ExamAttempt, ExamAttemptStatus
 
 
@@ -32,7 +36,7 @@ class StartAttemptResult:
 
 class ExamGradingService:
     @staticmethod
-    def finalize_and_grade(attempt_id: int) -> ExamAttempt:
+    def finalize_and_grade(attempt_id: int, finished_at=None) -> ExamAttempt:
         attempt = ExamAttempt.objects.select_related("exam").get(pk=attempt_id)
         exam = attempt.exam
 
@@ -40,6 +44,7 @@ class ExamGradingService:
             return attempt
         if attempt.status == ExamAttemptStatus.GRADED:
             return attempt
+        previous_status = attempt.status
 
         exam_activity_qs = exam.activities.all().only("id", "points")
         total_questions = exam_activity_qs.count()
@@ -47,23 +52,13 @@ class ExamGradingService:
             exam_activity_qs.aggregate(s=Coalesce(Sum("points"), Value(0)))["s"] or 0
         )
 
-        correct_base = (
-            UserAnswer.objects.filter(exam_attempt=attempt, is_correct=True)
-            .values("activity_id")
-            .distinct()
-            .annotate(
-                activity_points=Subquery(
-                    Activity.objects.filter(pk=OuterRef("activity_id")).values(
-                        "points"
-                    )[:1]
-                )
-            )
-        )
-        score_points = (
-            correct_base.aggregate(s=Coalesce(Sum("activity_points"), Value(0)))["s"]
-            or 0
-        )
-        correct_count = correct_base.count()
+        correct = Activity.objects.filter(
+            pk__in=UserAnswer.objects.filter(
+                exam_attempt=attempt, is_correct=True
+            ).values("activity_id")
+        ).aggregate(points=Coalesce(Sum("points"), Value(0)), count=Count("id"))
+        score_points = correct["points"]
+        correct_count = correct["count"]
 
         percentage = (score_points / max_points * 100) if max_points > 0 else 0.0
         passed = percentage >= exam.pass_mark_percent
@@ -74,7 +69,7 @@ class ExamGradingService:
         attempt.total_questions = total_questions
         attempt.percentage = round(percentage, 2)
         attempt.passed = passed
-        attempt.finished_at = attempt.finished_at or timezone.now()
+        attempt.finished_at = attempt.finished_at or finished_at or timezone.now()
         attempt.graded_at = timezone.now()
 
         if attempt.status in (
@@ -98,6 +93,9 @@ class ExamGradingService:
                 "status",
             ]
         )
+        proctoring.on_commit(
+            exam.pk, "record_status", attempt.pk, previous_status, attempt.status
+        )
         return attempt
 
 
@@ -109,16 +107,15 @@ class CourseProgressService:
     def compute(self) -> CourseProgressResult:
         total_activities = Activity.objects.filter(module__course=self.course).count()
 
-        completed_activities = (
-            UserAnswer.objects.filter(
-                user=self.user,
-                activity__module__course=self.course,
-                is_correct=True,
+        completed_by_module = dict(
+            FirstCorrectAnswer.objects.filter(
+                user=self.user, activity__module__course=self.course
             )
-            .values("activity_id")
-            .distinct()
-            .count()
+            .values_list("activity__module_id")
+            .annotate(n=Count("id"))
+            .order_by()
         )
+        completed_activities = sum(completed_by_module.values())
 
         percent = (
             round((completed_activities * 100 / total_activities), 2)
@@ -128,22 +125,13 @@ class CourseProgressService:
 
         modules_qs = (
             Module.objects.filter(course=self.course)
-            .annotate(
-                total=Count("activities", distinct=True),
-                completed=Count(
-                    "activities",
-                    filter=Q(
-                        activities__answers__user=self.user,
-                        activities__answers__is_correct=True,
-                    ),
-                    distinct=True,
-                ),
-            )
-            .values("id", "name", "total", "completed")
+            .annotate(total=Count("activities"))
+            .values("id", "name", "total")
         )
 
         modules = []
         for m in modules_qs:
+            m["completed"] = completed_by_module.get(m["id"], 0)
             m_percent = (
                 round((m["completed"] * 100 / m["total"]), 2) if m["total"] else 0.0
             )
@@ -210,6 +198,13 @@ class ExamAttemptService:
             return False
 
         attempt.refresh_from_db(fields=("status", "finished_at"))
+        proctoring.on_commit(
+            exam.pk,
+            "record_status",
+            attempt.pk,
+            ExamAttemptStatus.IN_PROGRESS,
+            ExamAttemptStatus.EXPIRED,
+        )
         return True
 
     @staticmethod
@@ -239,7 +234,7 @@ class ExamAttemptService:
 
     @staticmethod
     def create_attempt(*, exam: Exam, user, attempt_number: int) -> ExamAttempt:
-        return ExamAttempt.objects.create(
+        attempt = ExamAttempt.objects.create(
             exam=exam,
             user=user,
             attempt_number=attempt_number,
@@ -247,6 +242,10 @@ class ExamAttemptService:
             status=ExamAttemptStatus.IN_PROGRESS,
             started_at=timezone.now(),
         )
+        proctoring.on_commit(
+            exam.pk, "record_started", attempt, exam.time_limit_minutes
+        )
+        return attempt
 
     @classmethod
     def _expire_last_attempt_if_needed(
@@ -276,3 +275,189 @@ class ExamAttemptService:
             return StartAttemptResult(attempt=last, created=False)
 
         return cls._create_attempt_strict(exam_id=exam_id, user=user)
+
+
+class ExamDraftService:
+    """Borradores de respuestas de un intento en curso."""
+
+    def __init__(self, attempt: ExamAttempt):
+        self.attempt = attempt
+
+    def save(self, answers: List[Dict[str, Any]]) -> int:
+        """Guarda o reemplaza el borrador de cada actividad; es idempotente."""
+        ExamAnswerDraft.objects.bulk_create(
+            [
+                ExamAnswerDraft(
+                    attempt=self.attempt,
+                    activity_id=item["activity_id"],
+                    input_data=item["input_data"],
+                )
+                for item in answers
+            ],
+            update_conflicts=True,
+            unique_fields=["attempt", "activity"],
+            update_fields=["input_data", "updated_at"],
+        )
+        proctoring.on_commit(
+            self.attempt.exam_id,
+            "record_answers",
+            self.attempt.pk,
+            [item["activity_id"] for item in answers],
+        )
+        return len(answers)
+
+    def count(self) -> int:
+        return ExamAnswerDraft.objects.filter(attempt=self.attempt).count()
+
+    def merge(self, answers: List[Dict[str, Any]], until=None) -> List[Dict[str, Any]]:
+        """
+        Borradores guardados con las respuestas de `answers` por encima. Con
+        `until`, se ignoran los borradores guardados después de ese momento.
+        """
+        drafts = ExamAnswerDraft.objects.filter(attempt=self.attempt)
+        if until is not None:
+            drafts = drafts.filter(updated_at__lte=until)
+        merged = dict(drafts.values_list("activity_id", "input_data"))
+        merged.update({item["activity_id"]: item["input_data"] for item in answers})
+        return [
+            {"activity_id": activity_id, "input_data": input_data}
+            for activity_id, input_data in sorted(merged.items())
+        ]
+
+    def clear(self) -> None:
+        ExamAnswerDraft.objects.filter(attempt=self.attempt).delete()
+
+
+class ExamSubmissionService:
+    """
+    Entrega de un intento: en línea (`finish`) o aceptada para calificarse
+    después en el pool de jobs (`accept`).
+    """
+
+    def __init__(self, attempt: ExamAttempt):
+        self.attempt = attempt
+
+    @property
+    def job_key(self) -> str:
+        return f"{GRADE_ATTEMPT}:{self.attempt.pk}"
+
+    def finish(self, answers: List[Dict[str, Any]], submitted_at=None) -> ExamAttempt:
+        """Califica los borradores más `answers` (ya validadas)."""
+        from activities.services import AnswerSubmissionService
+
+        attempt = self.attempt
+        drafts = ExamDraftService(attempt)
+        answers = drafts.merge(answers, until=submitted_at)
+        if not answers:
+            raise EmptySubmissionError(
+                "No hay respuestas ni borradores para este intento."
+            )
+
+        AnswerSubmissionService.submit_many(
+            user=attempt.user,
+            answers_payload=answers,
+            exam_attempt=attempt,
+        )
+        drafts.clear()
+
+        expires_at = attempt.expires_at()
+        if (
+            attempt.status == ExamAttemptStatus.IN_PROGRESS
+            and expires_at
+            and (submitted_at or timezone.now()) > expires_at
+        ):
+            previous_status = attempt.status
+            attempt.status = ExamAttemptStatus.EXPIRED
+            attempt.finished_at = attempt.finished_at or submitted_at or timezone.now()
+            attempt.save(update_fields=["status", "finished_at"])
+            proctoring.on_commit(
+                attempt.exam_id,
+                "record_status",
+                attempt.pk,
+                previous_status,
+                attempt.status,
+            )
+
+        return ExamGradingService.finalize_and_grade(
+            attempt.id, finished_at=submitted_at
+        )
+
+    def accept(self, raw_answers: List[Any]) -> None:
+        """
+        Guarda la entrega tal como llegó, con un solo insert, para que la
+        califique el handler `content.grade_attempt`. Reenviar la misma entrega
+        mientras está en cola no crea otra.
+        """
+        JobQueue.enqueue(
+            GRADE_ATTEMPT,
+            {
+                "attempt_id": self.attempt.pk,
+                "answers": raw_answers,
+                "submitted_at": timezone.now().isoformat(),
+            },
+            dedup_key=self.job_key,
+        )
+
+    def state(self) -> Dict[str, Any]:
+        job = (
+            Job.objects.filter(dedup_key=self.job_key)
+            .order_by("-id")
+            .values("status", "last_error")
+            .first()
+        )
+        if job and job["status"] == JobStatus.PENDING:
+            return {"state": "queued"}
+        if job and job["status"] == JobStatus.RUNNING:
+            return {"state": "grading"}
+        if self.attempt.graded_at:
+            return {"state": "graded", "result": self.attempt}
+        if job and job["status"] == JobStatus.FAILED:
+            return {"state": "failed", "detail": job["last_error"]}
+        return {"state": self.attempt.status}
+
+
+class VocabularyReviewService:
+    """Repaso espaciado del vocabulario de un estudiante."""
+
+    MAX_DUE = 200
+
+    def __init__(self, student_id: int):
+        self.student_id = student_id
+
+    def due(self, limit: int = 20, now=None):
+        now = now or timezone.now()
+        return Vocabulary.objects.filter(
+            student_id=self.student_id, due_at__lte=now
+        ).order_by("due_at", "id")[: min(limit, self.MAX_DUE)]
+
+    @transaction.atomic
+    def submit(self, reviews: List[Dict[str, int]], now=None) -> List[Vocabulary]:
+        """
+        Aplica un lote de repasos `[{"id": ..., "quality": 0-5}, ...]`.
+
+        Las tarjetas se bloquean y se actualizan con un solo `bulk_update`; los
+        ids que no pertenecen al estudiante se ignoran.
+        """
+        now = now or timezone.now()
+        quality_by_id = {r["id"]: r["quality"] for r in reviews}
+        cards = list(
+            Vocabulary.objects.select_for_update()
+            .filter(student_id=self.student_id, id__in=quality_by_id)
+            .order_by("id")
+        )
+        for card in cards:
+            state = srs.schedule(
+                srs.ReviewState(card.ease, card.interval_days, card.repetitions),
+                quality_by_id[card.id],
+            )
+            card.ease = state.ease
+            card.interval_days = state.interval_days
+            card.repetitions = state.repetitions
+            card.last_reviewed_at = now
+            card.due_at = srs.next_due(now, state)
+
+        Vocabulary.objects.bulk_update(
+            cards,
+            ["ease", "interval_days", "repetitions", "last_reviewed_at", "due_at"],
+        )
+        return cards
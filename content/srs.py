@@ -0,0 +1,44 @@
+"""Planificador de repasos espaciados (SM-2) para el vocabulario."""
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+MIN_EASE = 1.3
+PASSING_QUALITY = 3
+MAX_QUALITY = 5
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    ease: float
+    interval_days: int
+    repetitions: int
+
+
+def schedule(state: ReviewState, quality: int) -> ReviewState:
+    """
+    Siguiente estado de una tarjeta según la calidad del repaso (0-5).
+
+    Con calidad menor a 3 la tarjeta vuelve a empezar (intervalo de 1 día);
+    el factor de facilidad se ajusta siempre y nunca baja de 1.3.
+    """
+    ease = state.ease + (
+        0.1 - (MAX_QUALITY - quality) * (0.08 + (MAX_QUALITY - quality) * 0.02)
+    )
+    ease = max(MIN_EASE, round(ease, 4))
+
+    if quality < PASSING_QUALITY:
+        return ReviewState(ease=ease, interval_days=1, repetitions=0)
+
+    repetitions = state.repetitions + 1
+    if repetitions == 1:
+        interval = 1
+    elif repetitions == 2:
+        interval = 6
+    else:
+        interval = round(state.interval_days * ease)
+    return ReviewState(ease=ease, interval_days=interval, repetitions=repetitions)
+
+
+def next_due(reviewed_at, state: ReviewState):
+    return reviewed_at + timedelta(days=state.interval_days)
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from jobs.exceptions import PermanentJobError
+from jobs.registry import JobRegistry
+
+GRADE_ATTEMPT = "content.grade_attempt"
+
+
+@JobRegistry.register(GRADE_ATTEMPT)
+def grade_attempt(attempt_id: int, answers, submitted_at: str):
+    """
+    Valida y califica una entrega aceptada por el modo asíncrono. El intento
+    puede haber vencido mientras la entrega esperaba en la cola (p. ej. al
+    iniciar otro intento), así que se califica todo intento que aún no tenga
+    nota. El lock sobre el intento evita que dos entregas del mismo intento
+    (una reenviada mientras la otra corría) lo califiquen dos veces.
+    """
+    from content.exceptions import EmptySubmissionError
+    from content.models import ExamAttempt, ExamAttemptStatus
+    from content.serializers import FinishAttemptRequestSerializer
+    from content.services import ExamSubmissionService
+
+    with transaction.atomic():
+        attempt = (
+            ExamAttempt.objects.select_for_update(of=("self",))
+            .select_related("exam", "user")
+            .filter(pk=attempt_id)
+            .first()
+        )
+        if (
+            attempt is None
+            or attempt.graded_at is not None
+            or attempt.status
+            not in (ExamAttemptStatus.IN_PROGRESS, ExamAttemptStatus.EXPIRED)
+        ):
+            return
+
+        serializer = FinishAttemptRequestSerializer(
+            data={"answers": answers}, context={"attempt": attempt}
+        )
+        if not serializer.is_valid():
+            raise PermanentJobError(str(serializer.errors))
+        try:
+            ExamSubmissionService(attempt).finish(
+                serializer.validated_data["answers"],
+                submitted_at=parse_datetime(submitted_at),
+            )
+        except EmptySubmissionError as exc:
+            raise PermanentJobError(str(exc)) from exc
@@ -0,0 +1,737 @@
+import io
+import json
+import unittest.mock
+from datetime import date, timedelta
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from activities.bank import ActivityBankImporter
+from activities.models.base import (
+    Activity,
+    ExamActivity,
+    FirstCorrectAnswer,
+    UserAnswer,
+)
+from activities.models.choice import ChoiceActivity
+from activities.models.word_ordering import WordOrderingActivity
+from activities.recommendations import RecommendationService
+from activities.services import AnswerSubmissionService
+from content.analytics import ExamAnalyticsService
+from content.models import Course, Exam, ExamAttempt, Module
+from content.proctoring import ExamProctorService
+from content.serializers import (
+    CourseReadProjection,
+    CourseSerializer,
+    ModuleReadProjection,
+    ModuleSerializer,
+)
+from content.services import (
+    CourseProgressService,
+    ExamAttemptService,
+    ExamGradingService,
+)
+from content.tasks import GRADE_ATTEMPT, grade_attempt
+from jobs.models import Job
+from jobs.services import JobWorker
+from languages.models import Language
+from people.models import Enrollment, Person, Student
+from users.models import User
+from utils.enums import (
+    ActivityType,
+    DifficultyLevel,
+    EnrollmentRole,
+    EnrollmentStatus,
+    ExamAttemptStatus,
+    ExamType,
+    JobStatus,
+)
+
+
+class CourseListPaginationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = "/api/content/courses/"
+        for i in range(5):
+            Course.objects.create(name=f"Curso {i}")
+
+    def test_unpaginated_list_is_backwards_compatible(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([c["name"] for c in body], [f"Curso {i}" for i in range(5)])
+
+    def test_indented_json_is_not_streamed(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="application/json; indent=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+        self.assertIn(b'\n  {\n    "id"', response.content)
+        self.assertEqual(len(json.loads(response.content)), 5)
+
+    def test_errors_on_first_chunk_are_raised_before_streaming(self):
+        with (
+            unittest.mock.patch.object(
+                CourseReadProjection, "to_representation", side_effect=ValueError
+            ),
+            self.assertRaises(ValueError),
+        ):
+            self.client.get(self.url)
+
+    def test_cursor_pagination_walks_all_pages(self):
+        names = []
+        url = f"{self.url}?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertLessEqual(len(body["results"]), 2)
+            names += [c["name"] for c in body["results"]]
+            url = body["next"]
+        self.assertEqual(names, [f"Curso {i}" for i in range(5)])
+
+    def test_field_selection(self):
+        response = self.client.get(f"{self.url}?page_size=1&fields=id,name")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()["results"][0]), {"id", "name"})
+
+
+class ReadProjectionTestCase(TestCase):
+    def setUp(self):
+        self.language = Language.objects.create(name="Inglés", icon="languages/en.png")
+        self.course = Course.objects.create(
+            name="Inglés B1",
+            description="Curso intermedio",
+            image="courses/images/b1.png",
+            language=self.language,
+            difficulty=DifficultyLevel.HARD,
+        )
+        Course.objects.create(name="Sin idioma")
+        Module.objects.create(course=self.course, name="Unidad 1")
+
+    def test_course_projection_matches_serializer(self):
+        expected = CourseSerializer(Course.objects.order_by("id"), many=True).data
+        projection = CourseReadProjection()
+        rows = projection.project(Course.objects.order_by("id"))
+        self.assertEqual(
+            projection.represent_many(rows), json.loads(json.dumps(expected))
+        )
+
+    def test_module_projection_matches_serializer(self):
+        expected = ModuleSerializer(Module.objects.all(), many=True).data
+        projection = ModuleReadProjection()
+        rows = projection.project(Module.objects.all())
+        self.assertEqual(
+            projection.represent_many(rows), json.loads(json.dumps(expected))
+        )
+
+    def test_field_selection_limits_selected_columns(self):
+        projection = CourseReadProjection(context={"fields": {"id", "name"}})
+        rows = projection.project(Course.objects.all())
+        self.assertEqual(set(rows.query.values_select), {"id", "name"})
+
+
+class AdminChangelistQueriesTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="secret"
+        )
+        self.client.force_login(self.admin)
+        course = Course.objects.create(name="Inglés B1")
+        for i in range(3):
+            module = Module.objects.create(course=course, name=f"Unidad {i}")
+            for j in range(i):
+                ChoiceActivity.objects.create(
+                    title=f"Pregunta {j}", type=ActivityType.CHOICE, module=module
+                )
+
+    def _changelist_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/admin/content/module/?o=4")
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_module_counts_are_annotated(self):
+        response, queries = self._changelist_queries()
+        counts = [m._activities_count for m in response.context["cl"].result_list]
+        self.assertEqual(counts, [0, 1, 2])
+
+        Module.objects.create(course=Course.objects.get(), name="Unidad extra")
+        _, more_queries = self._changelist_queries()
+        self.assertEqual(queries, more_queries)
+
+    def test_module_counts_ignore_joined_filters(self):
+        request = RequestFactory().get("/admin/content/module/")
+        request.user = self.admin
+        modules = (
+            admin.site._registry[Module]
+            .get_queryset(request)
+            .filter(activities__title__startswith="Pregunta")
+            .distinct()
+        )
+        self.assertEqual(sorted(m._activities_count for m in modules), [1, 2])
+
+
+class ExamAdminChangeQueriesTestCase(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="secret"
+        )
+        self.client.force_login(admin)
+        course = Course.objects.create(name="Inglés B1")
+        self.exam = Exam.objects.create(course=course, type=ExamType.FINAL)
+        self.add_items(3)
+
+    def add_items(self, count):
+        start = ExamActivity.objects.filter(exam=self.exam).count()
+        for i in range(start, start + count):
+            activity = ChoiceActivity.objects.create(
+                title=f"Pregunta {i}", type=ActivityType.CHOICE
+            )
+            ExamActivity.objects.create(exam=self.exam, activity=activity, position=i)
+
+    def change_page_queries(self):
+        url = f"/admin/content/exam/{self.exam.pk}/change/"
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_change_page_queries_do_not_grow_with_items(self):
+        self.change_page_queries()
+        response, queries = self.change_page_queries()
+        self.assertContains(response, "Pregunta 2")
+        self.add_items(20)
+        response, more_queries = self.change_page_queries()
+        self.assertContains(response, "Pregunta 22")
+        self.assertEqual(queries, more_queries)
+
+
+class ExamActivitiesShuffleTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        course = Course.objects.create(name="Inglés B1")
+        self.exam = Exam.objects.create(
+            course=course, type=ExamType.FINAL, is_published=True
+        )
+        for i in range(10):
+            activity = WordOrderingActivity.objects.create(
+                title=f"Ordena {i}",
+                type=ActivityType.ORDER,
+                sentence="uno dos tres cuatro cinco seis",
+            )
+            ExamActivity.objects.create(exam=self.exam, activity=activity, position=i)
+        self.client.post(f"/api/content/exams/{self.exam.id}/start/")
+
+    def test_shuffled_order_is_stable_within_attempt(self):
+        url = f"/api/content/exams/{self.exam.id}/activities/?shuffle=true"
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.client.get(url).json(), first.json())
+        self.assertNotEqual(
+            [item["position"] for item in first.json()], list(range(10))
+        )
+
+
+class FirstCorrectReadsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        self.course = Course.objects.create(name="Inglés B1")
+        self.modules = [
+            Module.objects.create(course=self.course, name=f"Unidad {i}")
+            for i in range(2)
+        ]
+        self.activities = [
+            ChoiceActivity.objects.create(
+                title=f"Pregunta {i}", type=ActivityType.CHOICE, module=module
+            )
+            for i, module in enumerate(self.modules * 2)
+        ]
+
+    def test_course_progress_counts_rollup_rows(self):
+        for activity in self.activities[:3]:
+            FirstCorrectAnswer.objects.create(
+                user=self.user, activity=activity, first_correct_at=timezone.now()
+            )
+        result = CourseProgressService(course=self.course, user=self.user).compute()
+        self.assertEqual(result.overall["completed"], 3)
+        self.assertEqual([m["completed"] for m in result.modules], [2, 1])
+
+    def test_exam_grading_stays_per_attempt(self):
+        exam = Exam.objects.create(course=self.course, type=ExamType.FINAL)
+        for i, activity in enumerate(self.activities):
+            ExamActivity.objects.create(exam=exam, activity=activity, position=i)
+        attempt = ExamAttempt.objects.create(exam=exam, user=self.user)
+        FirstCorrectAnswer.objects.create(
+            user=self.user, activity=self.activities[0], first_correct_at=timezone.now()
+        )
+        for activity in self.activities[1:3] * 2:
+            UserAnswer.objects.create(
+                user=self.user,
+                activity=activity,
+                exam_attempt=attempt,
+                response_data={},
+                is_correct=True,
+            )
+        graded = ExamGradingService.finalize_and_grade(attempt.id)
+        self.assertEqual((graded.correct_count, graded.total_questions), (2, 4))
+
+
+class ExamAnalyticsTestCase(TestCase):
+    def setUp(self):
+        course = Course.objects.create(name="Inglés B1")
+        self.exam = Exam.objects.create(course=course, type=ExamType.FINAL)
+        self.activities = []
+        for i in range(3):
+            activity = ChoiceActivity.objects.create(
+                title=f"Pregunta {i}", type=ActivityType.CHOICE, points=1
+            )
+            ExamActivity.objects.create(exam=self.exam, activity=activity, position=i)
+            self.activities.append(activity)
+
+        self.matrix = [[1, 1, 1], [1, 1, 0], [1, 0, 0], [0, 0, 0]]
+        for n, row in enumerate(self.matrix):
+            user = User.objects.create_user(
+                username=f"u{n}", email=f"u{n}@example.com", password="secret"
+            )
+            attempt = ExamAttempt.objects.create(
+                exam=self.exam, user=user, status=ExamAttemptStatus.GRADED
+            )
+            for activity, correct in zip(self.activities, row):
+                UserAnswer.objects.create(
+                    user=user,
+                    activity=activity,
+                    exam_attempt=attempt,
+                    response_data={},
+                    is_correct=bool(correct),
+                )
+        ExamAttempt.objects.create(
+            exam=self.exam,
+            user=User.objects.get(username="u0"),
+            attempt_number=2,
+        )
+
+    def test_item_statistics(self):
+        analytics = ExamAnalyticsService(self.exam).get(use_cache=False)
+        self.assertEqual(analytics.attempts, 4)
+        self.assertEqual([i["p_value"] for i in analytics.items], [0.75, 0.5, 0.25])
+        self.assertEqual(analytics.mean_percent, 50.0)
+        self.assertEqual(sum(analytics.histogram), 4)
+        # alfa = 3/2 * (1 - (0.25 + 0.3333 + 0.25) / 1.6667)
+        self.assertEqual(analytics.cronbach_alpha, 0.75)
+        self.assertTrue(all(i["discrimination"] > 0 for i in analytics.items))
+
+    def test_results_are_cached_until_attempts_change(self):
+        service = ExamAnalyticsService(self.exam)
+        first = service.get()
+        with self.assertNumQueries(2):
+            self.assertEqual(service.get(), first)
+
+        ExamAttempt.objects.filter(status=ExamAttemptStatus.IN_PROGRESS).update(
+            status=ExamAttemptStatus.GRADED
+        )
+        self.assertEqual(service.get().attempts, 5)
+
+    def test_cache_follows_item_points(self):
+        service = ExamAnalyticsService(self.exam)
+        service.get()
+        Activity.objects.filter(pk=self.activities[0].pk).update(points=3)
+        self.assertEqual(service.get().items[0]["points"], 3)
+
+    def test_export_command_writes_to_stdout(self):
+        out = io.StringIO()
+        call_command(
+            "export_exam_analytics",
+            str(self.exam.pk),
+            "--format",
+            "csv",
+            stdout=out,
+            stderr=io.StringIO(),
+        )
+        self.assertEqual(len(out.getvalue().splitlines()), 4)
+
+    def test_admin_view(self):
+        admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="secret"
+        )
+        self.client.force_login(admin)
+        response = self.client.get(
+            reverse("admin:content_exam_view_analytics", args=[self.exam.pk])
+        )
+        self.assertContains(response, "Pregunta 2")
+
+
+class RecommendationsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.course = Course.objects.create(name="Inglés B1")
+        soon = Module.objects.create(
+            course=self.course,
+            name="Cierra pronto",
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        later = Module.objects.create(course=self.course, name="Sin fecha")
+        self.solved, self.failed, self.fresh = [
+            WordOrderingActivity.objects.create(
+                title=title, type=ActivityType.ORDER, sentence="uno dos", module=module
+            )
+            for title, module in (
+                ("Resuelta", soon),
+                ("Fallada", later),
+                ("Nueva", later),
+            )
+        ]
+        for activity, words in (
+            (self.solved, ["uno", "dos"]),
+            (self.failed, ["dos", "uno"]),
+        ):
+            AnswerSubmissionService(self.user, activity.id, {"words": words}).execute()
+        JobWorker().run_pending()
+
+    def test_recommends_unsolved_with_failed_first(self):
+        url = f"/api/content/courses/{self.course.id}/recommendations/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["activity_id"] for r in response.json()],
+            [self.failed.id, self.fresh.id],
+        )
+
+        course = Course.objects.get()
+        with self.assertNumQueries(3):
+            RecommendationService(self.user, course).recommend()
+
+    def test_candidate_index_invalidated_on_save(self):
+        RecommendationService(self.user, self.course).recommend()
+        self.fresh.module = None
+        self.fresh.save()
+        ids = [
+            r.activity["id"]
+            for r in RecommendationService(self.user, self.course).recommend()
+        ]
+        self.assertEqual(ids, [self.failed.id])
+
+    def test_candidate_index_invalidated_on_bank_import(self):
+        RecommendationService(self.user, self.course).recommend()
+        row = {
+            "type": ActivityType.ORDER,
+            "title": "Importada",
+            "sentence": "uno dos",
+            "module": self.fresh.module_id,
+        }
+        report = ActivityBankImporter().run([(1, row)])
+        self.assertEqual(report.created, 1)
+        titles = [
+            r.activity["title"]
+            for r in RecommendationService(self.user, self.course).recommend()
+        ]
+        self.assertIn("Importada", titles)
+
+
+class ExamProctorTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        course = Course.objects.create(name="Inglés B1")
+        self.exam = Exam.objects.create(
+            course=course, type=ExamType.FINAL, is_published=True, time_limit_minutes=30
+        )
+        self.activities = []
+        for i in range(2):
+            activity = WordOrderingActivity.objects.create(
+                title=f"Ordena {i}", type=ActivityType.ORDER, sentence="uno dos"
+            )
+            ExamActivity.objects.create(exam=self.exam, activity=activity, position=i)
+            self.activities.append(activity)
+        self.students = [
+            User.objects.create_user(
+                username=f"s{i}", email=f"s{i}@example.com", password="secret"
+            )
+            for i in range(2)
+        ]
+        self.service = ExamProctorService(self.exam.pk)
+
+    def _events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = ExamAttemptService.start_attempt(
+                exam_id=self.exam.pk, user=self.students[0]
+            ).attempt
+            second = ExamAttemptService.start_attempt(
+                exam_id=self.exam.pk, user=self.students[1]
+            ).attempt
+            AnswerSubmissionService.submit_many(
+                self.students[0],
+                [{"activity_id": self.activities[0].id, "input_data": {"words": []}}],
+                exam_attempt=first,
+            )
+            ExamGradingService.finalize_and_grade(second.id)
+        return first
+
+    def test_events_update_cached_aggregate(self):
+        self.service.report()
+        first = self._events()
+
+        with self.assertNumQueries(0):
+            report = self.service.report()
+        self.assertEqual(report["counts"][ExamAttemptStatus.IN_PROGRESS], 1)
+        self.assertEqual(report["counts"][ExamAttemptStatus.GRADED], 1)
+        self.assertEqual(
+            [(a["attempt_id"], a["answered_count"]) for a in report["attempts"]],
+            [(first.id, 1)],
+        )
+        self.assertEqual(
+            {b["label"]: b["count"] for b in report["remaining"]}["15-30"], 1
+        )
+
+        cache.clear()
+        rebuilt = self.service.report()
+        self.assertEqual(rebuilt["counts"], report["counts"])
+        self.assertEqual(rebuilt["attempts"], report["attempts"])
+
+    def test_busy_attempt_invalidates_instead_of_dropping_answers(self):
+        self.service.report()
+        with self.captureOnCommitCallbacks(execute=True):
+            attempt = ExamAttemptService.start_attempt(
+                exam_id=self.exam.pk, user=self.students[0]
+            ).attempt
+        generation = cache.get(self.service.key)
+        slot = cache.get(self.service._key(generation, "attempt", attempt.id))
+        cache.add(f"{self.service._key(generation, 'slot', slot)}:lock", 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AnswerSubmissionService.submit_many(
+                self.students[0],
+                [{"activity_id": self.activities[0].id, "input_data": {"words": []}}],
+                exam_attempt=attempt,
+            )
+
+        self.assertIsNone(cache.get(self.service.key))
+        report = self.service.report()
+        self.assertEqual(
+            [(a["attempt_id"], a["answered_count"]) for a in report["attempts"]],
+            [(attempt.id, 1)],
+        )
+
+    def test_proctor_view_requires_staff_or_teacher(self):
+        self._events()
+        url = f"/api/content/exams/{self.exam.pk}/proctor/"
+        client = APIClient()
+        client.force_authenticate(self.students[0])
+        self.assertEqual(client.get(url).status_code, 403)
+        self.assertIsNone(cache.get(self.service.key))
+
+        staff = User.objects.create_user(
+            username="staff", email="staff@example.com", password="x", is_staff=True
+        )
+        client.force_authenticate(staff)
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["counts"][ExamAttemptStatus.IN_PROGRESS], 1)
+
+    def test_proctor_view_allows_course_teacher(self):
+        teacher = User.objects.create_user(
+            username="teacher", email="teacher@example.com", password="x"
+        )
+        person = Person.objects.create(user=teacher, date_of_birth=date(1980, 1, 1))
+        enrollment = Enrollment.objects.create(
+            student=Student.objects.create(person=person),
+            course=self.exam.course,
+            status=EnrollmentStatus.ACTIVE,
+        )
+        url = f"/api/content/exams/{self.exam.pk}/proctor/"
+        client = APIClient()
+        client.force_authenticate(teacher)
+        self.assertEqual(client.get(url).status_code, 403)
+
+        enrollment.role = EnrollmentRole.TEACHER
+        enrollment.save(update_fields=["role"])
+        self.assertEqual(client.get(url).status_code, 200)
+
+
+class ExamDraftTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        course = Course.objects.create(name="Inglés B1")
+        self.exam = Exam.objects.create(
+            course=course, type=ExamType.FINAL, is_published=True
+        )
+        self.activities = []
+        for i in range(3):
+            activity = WordOrderingActivity.objects.create(
+                title=f"Ordena {i}", type=ActivityType.ORDER, sentence="uno dos"
+            )
+            ExamActivity.objects.create(exam=self.exam, activity=activity, position=i)
+            self.activities.append(activity)
+        response = self.client.post(f"/api/content/exams/{self.exam.id}/start/")
+        self.attempt_id = response.data["attempt_id"]
+        self.url = f"/api/content/exams/{self.exam.id}/drafts/"
+
+    def _put(self, answers):
+        return self.client.put(
+            self.url, {"attempt_id": self.attempt_id, "answers": answers}, format="json"
+        )
+
+    def _answer(self, index, words):
+        return {
+            "activity_id": self.activities[index].id,
+            "input_data": {"words": words},
+        }
+
+    def test_drafts_are_upserted_and_graded_on_finish(self):
+        for _ in range(2):
+            response = self._put([self._answer(0, ["uno", "dos"]), self._answer(1, [])])
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["drafts"], 2)
+        self._put([self._answer(1, ["dos", "uno"])])
+
+        drafts = self.client.get(self.url, {"attempt_id": self.attempt_id}).json()
+        self.assertEqual(
+            [d["input_data"]["words"] for d in drafts], [["uno", "dos"], ["dos", "uno"]]
+        )
+
+        finish = self.client.post(
+            f"/api/content/exams/{self.exam.id}/finish/",
+            {
+                "attempt_id": self.attempt_id,
+                "answers": [self._answer(2, ["uno", "dos"])],
+            },
+            format="json",
+        )
+        self.assertEqual(finish.status_code, 200)
+        self.assertEqual(
+            (finish.data["correct_count"], finish.data["total_questions"]), (2, 3)
+        )
+        self.assertEqual(
+            UserAnswer.objects.filter(exam_attempt_id=self.attempt_id).count(), 3
+        )
+        self.assertEqual(self._put([self._answer(0, ["uno"])]).status_code, 409)
+
+    def test_invalid_attempt_id_is_rejected(self):
+        response = self.client.put(
+            self.url, {"attempt_id": "x", "answers": []}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_proctor_rebuild_counts_drafts(self):
+        self._put([self._answer(0, ["uno"]), self._answer(1, [])])
+        cache.clear()
+        report = ExamProctorService(self.exam.pk).report()
+        self.assertEqual(report["attempts"][0]["answered_count"], 2)
+
+    def test_rejects_activities_outside_the_exam(self):
+        other = WordOrderingActivity.objects.create(
+            title="Fuera", type=ActivityType.ORDER, sentence="uno dos"
+        )
+        response = self._put([{"activity_id": other.id, "input_data": {"words": []}}])
+        self.assertEqual(response.status_code, 400)
+
+
+class ExamAsyncFinishTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        course = Course.objects.create(name="Inglés B1")
+        self.exam = Exam.objects.create(
+            course=course, type=ExamType.FINAL, is_published=True
+        )
+        self.activity = WordOrderingActivity.objects.create(
+            title="Ordena", type=ActivityType.ORDER, sentence="uno dos"
+        )
+        ExamActivity.objects.create(exam=self.exam, activity=self.activity, position=0)
+        response = self.client.post(f"/api/content/exams/{self.exam.id}/start/")
+        self.attempt_id = response.data["attempt_id"]
+
+    def _finish(self, answers):
+        return self.client.post(
+            f"/api/content/exams/{self.exam.id}/finish/?mode=async",
+            {"attempt_id": self.attempt_id, "answers": answers},
+            format="json",
+        )
+
+    def test_submission_is_queued_and_graded_by_worker(self):
+        answers = [
+            {"activity_id": self.activity.id, "input_data": {"words": ["uno", "dos"]}}
+        ]
+        with self.assertNumQueries(2):
+            response = self._finish(answers)
+        self.assertEqual(response.status_code, 202)
+        self._finish(answers)
+        self.assertEqual(Job.objects.filter(name=GRADE_ATTEMPT).count(), 1)
+        self.assertFalse(UserAnswer.objects.exists())
+
+        status_url = response.data["status_url"]
+        self.assertEqual(self.client.get(status_url).data["state"], "queued")
+
+        self.assertEqual(JobWorker(names=[GRADE_ATTEMPT]).run_pending(), 1)
+        data = self.client.get(status_url).data
+        self.assertEqual(data["state"], "graded")
+        self.assertEqual(data["result"]["correct_count"], 1)
+        self.assertEqual(self._finish(answers).status_code, 409)
+
+    def test_submission_is_graded_after_attempt_expires_in_queue(self):
+        answers = [
+            {"activity_id": self.activity.id, "input_data": {"words": ["uno", "dos"]}}
+        ]
+        self.exam.time_limit_minutes = 30
+        self.exam.attempts_allowed = 2
+        self.exam.save()
+        ExamAttempt.objects.filter(pk=self.attempt_id).update(time_limit_minutes=30)
+        self._finish(answers)
+        ExamAttempt.objects.filter(pk=self.attempt_id).update(
+            started_at=timezone.now() - timedelta(minutes=31)
+        )
+        ExamAttemptService.start_attempt(exam_id=self.exam.id, user=self.user)
+        attempt = ExamAttempt.objects.get(pk=self.attempt_id)
+        self.assertEqual(attempt.status, ExamAttemptStatus.EXPIRED)
+
+        JobWorker().run_pending()
+        attempt.refresh_from_db()
+        self.assertIsNotNone(attempt.graded_at)
+        self.assertEqual(attempt.correct_count, 1)
+
+    def test_repeated_job_grades_once(self):
+        answers = [
+            {"activity_id": self.activity.id, "input_data": {"words": ["uno", "dos"]}}
+        ]
+        for _ in range(2):
+            grade_attempt(self.attempt_id, answers, timezone.now().isoformat())
+        self.assertEqual(
+            UserAnswer.objects.filter(exam_attempt_id=self.attempt_id).count(), 1
+        )
+
+    def test_invalid_submission_ends_as_failed_job(self):
+        self._finish([{"activity_id": 0, "input_data": {}}])
+        with self.assertLogs("jobs.services", "WARNING"):
+            JobWorker().run_pending()
+        self.assertEqual(Job.objects.get().status, JobStatus.FAILED)
+
+        response = self.client.get(
+            f"/api/content/exams/{self.exam.id}/attempts/{self.attempt_id}/status/"
+        )
+        self.assertEqual(response.data["state"], "failed")
+        attempt = ExamAttempt.objects.get(pk=self.attempt_id)
+        self.assertEqual(attempt.status, ExamAttemptStatus.IN_PROGRESS)
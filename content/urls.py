@@ -6,8 +6,12 @@ from .views import (
     CourseModuleActivitiesView,
     CourseModulesView,
     CourseProgressView,
+    CourseRecommendationsView,
     CourseStudentsView,
     ExamActivitiesView,
+    ExamDraftsView,
+    ExamProctorView,
+    ExamSubmissionStatusView,
     FinishAttemptAndSubmitAnswersView,
     StartAttemptView,
 )
@@ -28,6 +32,11 @@ urlpatterns = [
         name="course-students",
     ),
     path("courses/<int:pk>/exams/", CourseExamsView.as_view(), name="course-exams"),
+    path(
+        "courses/<int:pk>/recommendations/",
+        CourseRecommendationsView.as_view(),
+        name="course-recommendations",
+    ),
     path(
         "courses/<int:pk>/modules/<int:module_pk>/activities/",
         CourseModuleActivitiesView.as_view(),
@@ -44,4 +53,13 @@ urlpatterns = [
         FinishAttemptAndSubmitAnswersView.as_view(),
         name="exam-finish",
     ),
+    path(
+        "exams/<int:exam_id>/attempts/<int:attempt_id>/status/",
+        ExamSubmissionStatusView.as_view(),
+        name="exam-attempt-status",
+    ),
+    path("exams/<int:exam_id>/drafts/", ExamDraftsView.as_view(), name="exam-drafts"),
+    path(
+        "exams/<int:exam_id>/proctor/", ExamProctorView.as_view(), name="exam-proctor"
+    ),
 ]
@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.db.models import Count, Prefetch, Q
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
+from django.urls import reverse
 from drf_spectacular.utils import (
     OpenApiExample,
     OpenApiParameter,
@@ -10,39 +11,65 @@ from drf_spectacular.utils import (
     extend_schema,
 )
 from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from activities.models.base import ExamActivity
+from activities.models.base import SUBCLASS_RELATIONS, ExamActivity
+from activities.recommendations import RecommendationService
 from activities.serializers import ActivitySerializer, ExamActivityItemSerializer
-from activities.services import AnswerSubmissionService
 from people.serializers import StudentProfileSerializer
 from utils.enums import CONSUME_STATUSES
+from utils.pagination import CURSOR_PAGINATION_PARAMETERS, CursorPaginatedAPIViewMixin
+from utils.shuffling import make_seed, seeded_shuffle
+from utils.streaming import StreamingListAPIViewMixin
 
-from .exceptions import NoAttemptsRemainingError
+from . import proctoring
+from .exceptions import EmptySubmissionError, NoAttemptsRemainingError
 from .models import Course, Exam, ExamAttempt, ExamAttemptStatus
-from .permissions import HasStartedExam
+from .permissions import HasStartedExam, IsCourseProctor
 from .serializers import (
+    AnswerItemSerializer,
     CourseProgressSerializer,
+    CourseReadProjection,
     CourseSerializer,
     ExamAttemptStartSerializer,
+    ExamDraftRequestSerializer,
+    ExamDraftResponseSerializer,
+    ExamProctorSerializer,
     ExamSerializer,
+    ExamSubmissionStatusSerializer,
+    ExamSubmissionTicketSerializer,
     FinishAttemptRequestSerializer,
     FinishAttemptResponseSerializer,
+    ModuleReadProjection,
     ModuleSerializer,
+    RecommendationSerializer,
+)
+from .services import (
+    CourseProgressService,
+    ExamAttemptService,
+    ExamDraftService,
+    ExamSubmissionService,
 )
-from .services import CourseProgressService, ExamAttemptService, ExamGradingService
 
 
-class CourseListView(APIView):
+class CourseListView(CursorPaginatedAPIViewMixin, StreamingListAPIViewMixin, APIView):
     @extend_schema(
         summary="Listar todos los cursos (sin módulos)",
+        parameters=CURSOR_PAGINATION_PARAMETERS,
         responses=CourseSerializer(many=True),
     )
     def get(self, request):
-        courses = Course.objects.all()
-        serializer = CourseSerializer(courses, many=True, context={"request": request})
-        return Response(serializer.data)
+        projection = CourseReadProjection(context=self.get_serializer_context())
+        courses = projection.project(
+            Course.objects.order_by(*self.pagination_ordering),
+            extra=self.pagination_ordering,
+        )
+        page = self.paginate_queryset(courses)
+        if page is not None:
+            return self.get_paginated_response(projection.represent_many(page))
+        return self.get_streaming_response(courses, CourseReadProjection)
 
 
 class CourseProgressView(APIView):
@@ -77,45 +104,110 @@ class CourseProgressView(APIView):
         return Response(serializer.data)
 
 
-class CourseModulesView(APIView):
+class CourseModulesView(
+    CursorPaginatedAPIViewMixin, StreamingListAPIViewMixin, APIView
+):
     @extend_schema(
-        summary="Obtener los módulos de un curso", responses=ModuleSerializer(many=True)
+        summary="Obtener los módulos de un curso",
+        parameters=CURSOR_PAGINATION_PARAMETERS,
+        responses=ModuleSerializer(many=True),
     )
     def get(self, request, pk):
         course = get_object_or_404(Course, pk=pk)
-        modules = course.modules.all()
-        serializer = ModuleSerializer(modules, many=True, context={"request": request})
-        return Response(serializer.data)
+        projection = ModuleReadProjection(context=self.get_serializer_context())
+        modules = projection.project(
+            course.modules.order_by(*self.pagination_ordering),
+            extra=self.pagination_ordering,
+        )
+        page = self.paginate_queryset(modules)
+        if page is not None:
+            return self.get_paginated_response(projection.represent_many(page))
+        return self.get_streaming_response(modules, ModuleReadProjection)
+
+
+class CourseRecommendationsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        tags=["Courses"],
+        summary="Actividades recomendadas de un curso",
+        description=(
+            "Sugiere las próximas actividades sin resolver del curso según el "
+            "historial del usuario por dificultad y tipo, los intentos fallidos, "
+            "los puntos y la cercanía del cierre de cada módulo."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "limit",
+                int,
+                description="Cantidad de actividades (default 5, máximo 50)",
+            )
+        ],
+        responses={200: RecommendationSerializer(many=True)},
+    )
+    def get(self, request, pk):
+        course = get_object_or_404(Course, pk=pk)
+        try:
+            limit = min(max(int(request.query_params.get("limit", 5)), 1), 50)
+        except ValueError:
+            return Response(
+                {"detail": "limit debe ser un entero."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        recommendations = RecommendationService(request.user, course).recommend(limit)
+        return Response(RecommendationSerializer(recommendations, many=True).data)
 
 
-class CourseModuleActivitiesView(APIView):
+class CourseModuleActivitiesView(
+    CursorPaginatedAPIViewMixin, StreamingListAPIViewMixin, APIView
+):
     @extend_schema(
         summary="Obtener las actividades de un módulo",
-        responses=ModuleSerializer(many=True),
+        parameters=CURSOR_PAGINATION_PARAMETERS,
+        responses=ActivitySerializer(many=True),
     )
     def get(self, request, pk, module_pk):
         course = get_object_or_404(Course, pk=pk)
         module = get_object_or_404(course.modules, pk=module_pk)
-        activities = module.activities.all()
-        serializer = ActivitySerializer(
-            activities, many=True, context={"request": request}
+        activities = module.activities.select_related(*SUBCLASS_RELATIONS).order_by(
+            *self.pagination_ordering
         )
-        return Response(serializer.data)
+        page = self.paginate_queryset(activities)
+        if page is not None:
+            serializer = ActivitySerializer(
+                page, many=True, context=self.get_serializer_context()
+            )
+            return self.get_paginated_response(serializer.data)
+        return self.get_streaming_response(activities, ActivitySerializer)
 
 
-class CourseStudentsView(APIView):
+class CourseStudentsView(
+    CursorPaginatedAPIViewMixin, StreamingListAPIViewMixin, APIView
+):
     @extend_schema(
         summary="Obtener los estudiantes de un curso",
+        parameters=CURSOR_PAGINATION_PARAMETERS,
         responses=StudentProfileSerializer(many=True),
     )
     def get(self, request, pk):
         course = get_object_or_404(Course, pk=pk)
-        students = course.students.select_related("person").all()
-        persons = [student.person for student in students if student.person]
-        serializer = StudentProfileSerializer(
-            persons, many=True, context={"request": request}
+        students = (
+            course.students.filter(person__isnull=False)
+            .select_related("person__user", "active_course__language")
+            .prefetch_related("language_proficiencies__language")
+            .order_by(*self.pagination_ordering)
+        )
+        page = self.paginate_queryset(students)
+        if page is not None:
+            serializer = StudentProfileSerializer(
+                [student.person for student in page],
+                many=True,
+                context=self.get_serializer_context(),
+            )
+            return self.get_paginated_response(serializer.data)
+        return self.get_streaming_response(
+            students, StudentProfileSerializer, item_getter=lambda s: s.person
         )
-        return Response(serializer.data)
 
 
 class CourseExamsView(APIView):
@@ -245,7 +337,7 @@ class ExamActivitiesView(APIView):
     @extend_schema(
         tags=["Exams"],
         summary="Obtener actividades de un examen",
-        description="Devuelve la lista de actividades asociadas a un examen publicado. Usa `shuffle` para barajar el orden.",  # noqa: E501
+        description="Devuelve la lista de actividades asociadas a un examen publicado. Usa `shuffle` para barajar el orden; el orden es estable dentro del intento.",  # noqa: E501
         parameters=[
             OpenApiParameter(
                 name="shuffle",
@@ -285,17 +377,17 @@ class ExamActivitiesView(APIView):
         exam = self.get_object(exam_id)
         self.check_object_permissions(request, exam)
 
-        qs = ExamActivity.objects.select_related("activity").filter(exam=exam)
+        qs = ExamActivity.objects.select_related(
+            "activity", *(f"activity__{rel}" for rel in SUBCLASS_RELATIONS)
+        ).filter(exam=exam)
 
+        scope = ("attempt", self.attempt.pk)
         shuffle = request.query_params.get("shuffle")
         if shuffle in ("1", "true", "True"):
-            qs = list(qs)
-            import random
-
-            random.shuffle(qs)
+            qs = seeded_shuffle(qs, make_seed(*scope))
 
         data = ExamActivityItemSerializer(
-            qs, many=True, context={"request": request}
+            qs, many=True, context={"request": request, "shuffle_scope": scope}
         ).data
         return Response(data, status=status.HTTP_200_OK)
 
@@ -306,14 +398,22 @@ class FinishAttemptAndSubmitAnswersView(APIView):
     @extend_schema(
         tags=["Exams"],
         summary="Finalizar intento y enviar respuestas",
-        description="Recibe las respuestas del usuario para un examen y finaliza el intento.",  # noqa: E501
+        description=(
+            "Recibe las respuestas del usuario para un examen y finaliza el "
+            "intento. Se califica con los borradores guardados más las "
+            "respuestas enviadas, que tienen prioridad. Con `mode=async` (o "
+            '`EXAM_FINISH_MODE = "async"`) la entrega se guarda tal cual, se '
+            "responde 202 y se califica en el pool de jobs; el resultado se "
+            "consulta en `status_url`."
+        ),
         parameters=[
             OpenApiParameter(
                 name="attempt_id",
                 type=OpenApiTypes.INT,
                 location=OpenApiParameter.PATH,
                 description="ID del intento de examen",
-            )
+            ),
+            OpenApiParameter("mode", str, enum=["sync", "async"]),
         ],
         request=OpenApiRequest(
             request=FinishAttemptRequestSerializer,
@@ -348,7 +448,8 @@ class FinishAttemptAndSubmitAnswersView(APIView):
                         },
                     )
                 ],
-            )
+            ),
+            202: ExamSubmissionTicketSerializer,
         },
     )
     def post(self, request, exam_id: int):
@@ -357,25 +458,153 @@ class FinishAttemptAndSubmitAnswersView(APIView):
         if attempt.user_id != request.user.id:
             return Response({"detail": "Forbidden."}, status=status.HTTP_403_FORBIDDEN)
 
+        mode = request.query_params.get("mode") or getattr(
+            settings, "EXAM_FINISH_MODE", "sync"
+        )
+        if mode == "async":
+            return self._accept(request, attempt)
+
         req_ser = FinishAttemptRequestSerializer(
             data=request.data, context={"attempt": attempt}
         )
         req_ser.is_valid(raise_exception=True)
-        answers = req_ser.validated_data["answers"]
+        try:
+            graded = ExamSubmissionService(attempt).finish(
+                req_ser.validated_data["answers"]
+            )
+        except EmptySubmissionError as exc:
+            return Response({"answers": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        resp_ser = FinishAttemptResponseSerializer(graded)
+
+        return Response(resp_ser.data, status=status.HTTP_200_OK)
+
+    def _accept(self, request, attempt: ExamAttempt) -> Response:
+        if attempt.status != ExamAttemptStatus.IN_PROGRESS:
+            return Response(
+                {"detail": "El intento ya fue finalizado."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        answers = request.data.get("answers", [])
+        if not isinstance(answers, list):
+            return Response(
+                {"answers": ["Debe ser una lista."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        ExamSubmissionService(attempt).accept(answers)
+        data = {
+            "attempt_id": attempt.pk,
+            "state": "queued",
+            "status_url": reverse(
+                "exam-attempt-status", args=[attempt.exam_id, attempt.pk]
+            ),
+        }
+        return Response(
+            ExamSubmissionTicketSerializer(data).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class ExamSubmissionStatusView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
 
-        AnswerSubmissionService.submit_many(
-            user=request.user,
-            answers_payload=answers,
-            exam_attempt=attempt,
+    @extend_schema(
+        tags=["Exams"],
+        summary="Estado de la calificación de un intento",
+        description=(
+            "Para entregas en modo asíncrono: `queued` mientras espera en la "
+            "cola, `grading` mientras se califica, `graded` con el resultado y "
+            "`failed` si la entrega no pudo calificarse."
+        ),
+        responses={200: ExamSubmissionStatusSerializer},
+    )
+    def get(self, request, exam_id: int, attempt_id: int):
+        attempt = get_object_or_404(
+            ExamAttempt, pk=attempt_id, exam_id=exam_id, user=request.user
         )
+        data = {"attempt_id": attempt.pk, **ExamSubmissionService(attempt).state()}
+        return Response(ExamSubmissionStatusSerializer(data).data)
 
-        if attempt.is_expired():
-            attempt.status = ExamAttemptStatus.EXPIRED
-            attempt.finished_at = attempt.finished_at or timezone.now()
-            attempt.save(update_fields=["status", "finished_at"])
 
-        graded = ExamGradingService.finalize_and_grade(attempt.id)
+class ExamProctorView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsCourseProctor]
 
-        resp_ser = FinishAttemptResponseSerializer(graded)
+    @extend_schema(
+        tags=["Exams"],
+        summary="Supervisión en vivo de un examen",
+        description=(
+            "Conteo de intentos por estado, distribución del tiempo restante y "
+            "cantidad de respuestas de cada intento en curso. Se sirve desde un "
+            "agregado en caché que se actualiza con cada inicio, respuesta, "
+            "entrega y vencimiento."
+        ),
+        responses={200: ExamProctorSerializer},
+    )
+    def get(self, request, exam_id: int):
+        course_id = (
+            Exam.objects.filter(pk=exam_id).values_list("course_id", flat=True).first()
+        )
+        if course_id is None:
+            return Response(
+                {"detail": "No encontrado."}, status=status.HTTP_404_NOT_FOUND
+            )
+        self.check_object_permissions(request, course_id)
+        report = proctoring.ExamProctorService(exam_id).report()
+        return Response(ExamProctorSerializer(report).data)
 
-        return Response(resp_ser.data, status=status.HTTP_200_OK)
+
+class ExamDraftsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def _attempt(self, request, exam_id: int, attempt_id) -> ExamAttempt:
+        if not str(attempt_id or "").isdigit():
+            raise ValidationError({"detail": "attempt_id debe ser un entero."})
+        return get_object_or_404(
+            ExamAttempt, pk=attempt_id, exam_id=exam_id, user=request.user
+        )
+
+    @extend_schema(
+        tags=["Exams"],
+        summary="Borradores guardados de un intento",
+        parameters=[
+            OpenApiParameter("attempt_id", int, required=True),
+        ],
+        responses={200: AnswerItemSerializer(many=True)},
+    )
+    def get(self, request, exam_id: int):
+        attempt = self._attempt(
+            request, exam_id, request.query_params.get("attempt_id")
+        )
+        return Response(ExamDraftService(attempt).merge([]))
+
+    @extend_schema(
+        tags=["Exams"],
+        summary="Guardar borradores de respuestas",
+        description=(
+            "Guarda o reemplaza la respuesta en curso de cada actividad del "
+            "lote. Repetir el mismo envío no tiene efecto adicional."
+        ),
+        request=ExamDraftRequestSerializer,
+        responses={200: ExamDraftResponseSerializer},
+    )
+    def put(self, request, exam_id: int):
+        attempt = self._attempt(request, exam_id, request.data.get("attempt_id"))
+        if attempt.status != ExamAttemptStatus.IN_PROGRESS or attempt.is_expired():
+            return Response(
+                {"detail": "El intento ya no está en curso."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        serializer = ExamDraftRequestSerializer(
+            data=request.data, context={"attempt": attempt}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        drafts = ExamDraftService(attempt)
+        saved = drafts.save(serializer.validated_data["answers"])
+        return Response(
+            ExamDraftResponseSerializer({
+                "attempt_id": attempt.pk,
+                "saved": saved,
+                "drafts": drafts.count(),
+            }).data
+        )
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from unfold.admin import ModelAdmin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(ModelAdmin):
+    list_display = ("id", "name", "status", "dedup_key", "attempts", "run_after")
+    list_filter = ("status", "name")
+    search_fields = ("name", "dedup_key")
+    readonly_fields = ("created_at", "locked_at", "last_error")
+    ordering = ("-id",)
@@ -0,0 +1,5 @@
+class PermanentJobError(Exception):
+    """
+    Error que no se resuelve reintentando (p. ej. datos inválidos): el job
+    queda fallido de inmediato con este mensaje en `last_error`.
+    """
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.services import JobWorker
+
+
+class Command(BaseCommand):
+    help = "Ejecuta los jobs pendientes de la cola en la base de datos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Procesa lo pendiente y termina en lugar de quedar escuchando",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Jobs a tomar por vuelta (default: 50)",
+        )
+        parser.add_argument(
+            "--names",
+            nargs="+",
+            help="Procesar sólo estos jobs (p. ej. un pool dedicado a calificar)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Segundos de espera cuando la cola está vacía (default: 1)",
+        )
+
+    def handle(self, *args, **opts):
+        worker = JobWorker(batch_size=opts["batch_size"], names=opts["names"])
+        total = 0
+        while True:
+            processed = worker.run_pending()
+            total += processed
+            close_old_connections()
+            if processed:
+                continue
+            if opts["once"]:
+                break
+            time.sleep(opts["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"{total} jobs procesados."))
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.5 on 2026-10-19 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(fields=["dedup_key"], name="job_dedup_k_c26b35_idx"),
+        ),
+    ]
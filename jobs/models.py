@@ -0,0 +1,47 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from utils.enums import JobStatus
+
+
+class Job(models.Model):
+    """
+    Tarea diferida en la cola de la base de datos.
+
+    Mientras un job está pendiente, `dedup_key` es único: encolar otro con la
+    misma clave no crea una fila nueva y ambos se resuelven en una sola
+    ejecución. Los jobs terminados se borran; los fallidos quedan para revisión.
+    """
+
+    class Meta:
+        db_table = "job"
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedup_key"],
+                condition=Q(status=JobStatus.PENDING),
+                name="uq_job_pending_dedup_key",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+            models.Index(fields=["dedup_key"]),
+        ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    dedup_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(
+        max_length=20, choices=JobStatus.choices, default=JobStatus.PENDING
+    )
+    run_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
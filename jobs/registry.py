@@ -0,0 +1,14 @@
+class JobRegistry:
+    _handlers = {}
+
+    @classmethod
+    def register(cls, name):
+        def decorator(func):
+            cls._handlers[name] = func
+            return func
+
+        return decorator
+
+    @classmethod
+    def get_handler(cls, name):
+        return cls._handlers.get(name)
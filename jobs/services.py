@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import logging
+import traceback
+from datetime import timedelta
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from utils.enums import JobStatus
+
+from .exceptions import PermanentJobError
+from .models import Job
+from .registry import JobRegistry
+
+logger = logging.getLogger(__name__)
+
+LOST_WORKER_ERROR = "El worker que lo ejecutaba no terminó (lock vencido)."
+
+
+class JobQueue:
+    @staticmethod
+    def build(
+        name: str,
+        payload: Optional[dict] = None,
+        dedup_key: Optional[str] = None,
+        delay: Optional[timedelta] = None,
+    ) -> Job:
+        return Job(
+            name=name,
+            payload=payload or {},
+            dedup_key=dedup_key,
+            run_after=timezone.now() + (delay or timedelta()),
+        )
+
+    @classmethod
+    def enqueue(cls, name: str, payload=None, dedup_key=None, delay=None) -> None:
+        cls.enqueue_many([cls.build(name, payload, dedup_key, delay)])
+
+    @staticmethod
+    def enqueue_many(jobs: Iterable[Job]) -> None:
+        """
+        Encola varios jobs en una sola consulta.
+
+        Si ya hay un job pendiente con la misma `dedup_key`, el nuevo se
+        descarta: el pendiente hará el mismo trabajo.
+        """
+        jobs = list(jobs)
+        if jobs:
+            Job.objects.bulk_create(jobs, ignore_conflicts=True)
+
+
+class JobWorker:
+    def __init__(self, batch_size: int = 50, names: Optional[Iterable[str]] = None):
+        self.batch_size = batch_size
+        self.names = list(names) if names else None
+
+    def claim(self) -> List[Job]:
+        """
+        Toma un lote de jobs pendientes. Los que quedaron RUNNING con el lock
+        vencido (su worker murió) cuentan como un intento fallido, para que un
+        job que tumba al worker no se reintente para siempre.
+        """
+        now = timezone.now()
+        lock_timeout = getattr(settings, "JOBS_LOCK_TIMEOUT_SECONDS", 300)
+        stale = now - timedelta(seconds=lock_timeout)
+        candidates = Job.objects.filter(
+            Q(status=JobStatus.PENDING, run_after__lte=now)
+            | Q(status=JobStatus.RUNNING, locked_at__lt=stale)
+        )
+        if self.names:
+            candidates = candidates.filter(name__in=self.names)
+        with transaction.atomic():
+            jobs = list(
+                candidates.select_for_update(skip_locked=True).order_by(
+                    "run_after", "id"
+                )[: self.batch_size]
+            )
+            reclaimed = [j for j in jobs if j.status == JobStatus.RUNNING]
+            if reclaimed:
+                Job.objects.filter(pk__in=[j.pk for j in reclaimed]).update(
+                    attempts=F("attempts") + 1, last_error=LOST_WORKER_ERROR
+                )
+                for job in reclaimed:
+                    job.attempts += 1
+                    job.last_error = LOST_WORKER_ERROR
+                lost = [j for j in reclaimed if j.attempts >= j.max_attempts]
+                if lost:
+                    logger.error("Jobs descartados tras perder su worker: %s", lost)
+                    Job.objects.filter(pk__in=[j.pk for j in lost]).update(
+                        status=JobStatus.FAILED, locked_at=None
+                    )
+                    jobs = [j for j in jobs if j not in lost]
+            if jobs:
+                Job.objects.filter(pk__in=[j.pk for j in jobs]).update(
+                    status=JobStatus.RUNNING, locked_at=now
+                )
+        return jobs
+
+    def run_pending(self) -> int:
+        """Ejecuta un lote de jobs; devuelve cuántos se procesaron."""
+        jobs = self.claim()
+        for job in jobs:
+            self.run(job)
+        return len(jobs)
+
+    def run(self, job: Job) -> None:
+        handler = JobRegistry.get_handler(job.name)
+        try:
+            if handler is None:
+                raise ValueError(f"No hay handler para el job '{job.name}'")
+            with transaction.atomic():
+                handler(**job.payload)
+        except PermanentJobError as exc:
+            logger.warning("Job %s (%s) descartado: %s", job.pk, job.name, exc)
+            self._fail(job, str(exc), permanent=True)
+        except Exception:
+            logger.exception("Falló el job %s (%s)", job.pk, job.name)
+            self._fail(job, traceback.format_exc())
+        else:
+            job.delete()
+
+    def _fail(self, job: Job, error: str, permanent: bool = False) -> None:
+        job.attempts += 1
+        job.last_error = error
+        job.locked_at = None
+        if permanent or job.attempts >= job.max_attempts:
+            job.status = JobStatus.FAILED
+        else:
+            job.status = JobStatus.PENDING
+            job.run_after = timezone.now() + timedelta(seconds=2**job.attempts)
+        try:
+            with transaction.atomic():
+                job.save()
+        except IntegrityError:
+            # Ya hay otro pendiente con la misma clave que lo reemplaza.
+            job.delete()
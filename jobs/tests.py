@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from activities.models.word_ordering import WordOrderingActivity
+from activities.services import AnswerSubmissionService
+from activities.tasks import UPDATE_PROGRESS
+from content.models import Course, Module
+from people.models import Enrollment, EnrollmentStatus, Person, Student
+from users.models import User
+from utils.enums import ActivityType, JobStatus
+
+from .exceptions import PermanentJobError
+from .models import Job
+from .registry import JobRegistry
+from .services import JobQueue, JobWorker
+
+calls = []
+
+
+@JobRegistry.register("tests.flaky")
+def flaky(fail: bool):
+    calls.append(fail)
+    if fail:
+        raise RuntimeError("falla")
+
+
+@JobRegistry.register("tests.invalid")
+def invalid():
+    raise PermanentJobError("payload inválido")
+
+
+class JobQueueTestCase(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_pending_jobs_with_same_key_coalesce(self):
+        for _ in range(10):
+            JobQueue.enqueue("tests.flaky", {"fail": False}, dedup_key="k")
+        JobQueue.enqueue("tests.flaky", {"fail": False}, dedup_key="otra")
+        self.assertEqual(Job.objects.count(), 2)
+
+        self.assertEqual(JobWorker().run_pending(), 2)
+        self.assertEqual(calls, [False, False])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        JobQueue.enqueue("tests.flaky", {"fail": True}, dedup_key="k")
+        with self.assertLogs("jobs.services", "ERROR"):
+            JobWorker().run_pending()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (JobStatus.PENDING, 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("RuntimeError", job.last_error)
+
+        Job.objects.update(run_after=timezone.now(), attempts=job.max_attempts - 1)
+        with self.assertLogs("jobs.services", "ERROR"):
+            JobWorker().run_pending()
+        self.assertEqual(Job.objects.get().status, JobStatus.FAILED)
+
+    def test_permanent_error_fails_without_retry(self):
+        JobQueue.enqueue("tests.invalid", {}, dedup_key="k")
+        JobQueue.enqueue("tests.flaky", {"fail": False}, dedup_key="otra")
+        with self.assertLogs("jobs.services", "WARNING"):
+            self.assertEqual(JobWorker(names=["tests.invalid"]).run_pending(), 1)
+        job = Job.objects.get(name="tests.invalid")
+        self.assertEqual(
+            (job.status, job.last_error), (JobStatus.FAILED, "payload inválido")
+        )
+        self.assertEqual(Job.objects.get(name="tests.flaky").status, JobStatus.PENDING)
+        self.assertEqual(calls, [])
+
+    @override_settings(JOBS_LOCK_TIMEOUT_SECONDS=60)
+    def test_stale_running_job_counts_as_attempt(self):
+        JobQueue.enqueue("tests.flaky", {"fail": False}, dedup_key="k")
+        locked_at = timezone.now() - timedelta(seconds=120)
+        Job.objects.update(status=JobStatus.RUNNING, locked_at=locked_at)
+
+        self.assertEqual(len(JobWorker().claim()), 1)
+        self.assertEqual(Job.objects.get().attempts, 1)
+
+        Job.objects.update(locked_at=locked_at, attempts=4)
+        with self.assertLogs("jobs.services", "ERROR"):
+            self.assertEqual(JobWorker().claim(), [])
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (JobStatus.FAILED, 5))
+
+
+class ProgressJobTestCase(TestCase):
+    def test_progress_updates_collapse_into_one_recompute(self):
+        user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        person = Person.objects.create(user=user, date_of_birth=date(2000, 1, 1))
+        student = Student.objects.create(person=person)
+        course = Course.objects.create(name="Inglés B1")
+        module = Module.objects.create(course=course, name="Unidad 1")
+        enrollment = Enrollment.objects.create(
+            student=student, course=course, status=EnrollmentStatus.ACTIVE
+        )
+        activity = WordOrderingActivity.objects.create(
+            title="Ordena", type=ActivityType.ORDER, sentence="uno dos", module=module
+        )
+        for _ in range(10):
+            AnswerSubmissionService(
+                user, activity.id, {"words": ["uno", "dos"]}
+            ).execute()
+
+        self.assertEqual(Job.objects.filter(name=UPDATE_PROGRESS).count(), 1)
+        JobWorker().run_pending()
+        enrollment.refresh_from_db()
+        self.assertEqual(enrollment.progress_percent, 100)
@@ -1,9 +1,14 @@
 from rest_framework import serializers
 
 from languages.models import Language
+from utils.projections import Field, ValuesProjection, file_url
 
 
 class LanguageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Language
         fields = ("id", "name", "icon")
+
+
+class LanguageReadProjection(ValuesProjection):
+    fields = {"id": "id", "name": "name", "icon": Field(transform=file_url())}
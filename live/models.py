@@ -0,0 +1,40 @@
+from django.db import models
+
+from content.models import Course
+from users.models import User
+from utils.enums import LiveEventKind
+
+
+class LiveEvent(models.Model):
+    """
+    Cambio de un curso para los clientes conectados por SSE.
+
+    Los publican los jobs tras confirmar el envío de respuestas; cada proceso
+    web los lee en lote y los reparte a sus suscriptores. Se borran después de
+    `LIVE_EVENT_RETENTION_SECONDS`.
+    """
+
+    class Meta:
+        db_table = "live_event"
+        verbose_name = "Live Event"
+        verbose_name_plural = "Live Events"
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    kind = models.CharField(max_length=20, choices=LiveEventKind.choices)
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="live_events"
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="live_events",
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} en curso {self.course_id}"
@@ -0,0 +1,247 @@
+"""
+Eventos en vivo de progreso y ranking por curso.
+
+El job que recalcula el progreso y la suma de puntos al ranking publican
+filas en `live_event`. Cada proceso ASGI tiene un `LiveHub` que, mientras haya clientes conectados,
+lee los eventos nuevos de todos los cursos suscritos con una sola consulta
+por intervalo. Los eventos de ranking de un mismo curso se agrupan en un solo
+recálculo del top, que se envía igual a todos sus suscriptores; el progreso
+se envía sólo a las conexiones del usuario afectado.
+
+Los eventos se insertan en transacciones concurrentes, así que una
+fila con pk menor puede confirmarse después de que ya se leyó otra mayor. Por
+eso cada lectura vuelve a mirar los últimos `LIVE_EVENT_LATE_SECONDS` y
+descarta los pk ya entregados.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from utils.enums import LiveEventKind
+from utils.renderers import dumps
+
+from .models import LiveEvent
+
+logger = logging.getLogger(__name__)
+
+Message = Tuple[str, dict]
+
+_last_prune = 0.0
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def progress_event(user_id: int, course_id: int, progress) -> LiveEvent:
+    return LiveEvent(
+        kind=LiveEventKind.PROGRESS,
+        course_id=course_id,
+        user_id=user_id,
+        payload={
+            "course_id": course_id,
+            "overall": progress.overall,
+            "modules": progress.modules,
+        },
+    )
+
+
+def leaderboard_event(course_id: int, user_id: int) -> LiveEvent:
+    return LiveEvent(
+        kind=LiveEventKind.LEADERBOARD,
+        course_id=course_id,
+        user_id=user_id,
+    )
+
+
+def publish(events: Iterable[LiveEvent]) -> None:
+    events = list(events)
+    if events:
+        LiveEvent.objects.bulk_create(events)
+    prune()
+
+
+def prune(force: bool = False) -> int:
+    """Borra eventos vencidos, como mucho una vez por minuto por proceso."""
+    global _last_prune
+    now = time.monotonic()
+    if not force and now - _last_prune < 60:
+        return 0
+    _last_prune = now
+    retention = _setting("LIVE_EVENT_RETENTION_SECONDS", 600)
+    deleted, _ = LiveEvent.objects.filter(
+        created_at__lt=timezone.now() - timedelta(seconds=retention)
+    ).delete()
+    return deleted
+
+
+def leaderboard_snapshot(course_id: int, changed: Iterable[int] = ()) -> dict:
+    from activities.services import LeaderboardService
+
+    top = LeaderboardService(
+        None, limit=_setting("LIVE_LEADERBOARD_SIZE", 10), course_id=course_id
+    ).execute()
+    return {"course_id": course_id, "top": top, "changed": sorted(set(changed))}
+
+
+def progress_snapshot(course_id: int, user) -> dict:
+    from content.models import Course
+    from content.services import CourseProgressService
+
+    result = CourseProgressService(Course(pk=course_id), user).compute()
+    return {
+        "course_id": course_id,
+        "overall": result.overall,
+        "modules": result.modules,
+    }
+
+
+@dataclass(eq=False)
+class Subscription:
+    course_id: int
+    user_id: int
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=100))
+
+    def offer(self, message: Message) -> None:
+        # Los mensajes son estados completos: si el cliente no los consume,
+        # se descarta el más viejo y el siguiente lo reemplaza.
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+
+@dataclass
+class CourseBatch:
+    leaderboard: Optional[dict] = None
+    progress: Dict[int, dict] = field(default_factory=dict)
+
+
+class LiveHub:
+    def __init__(self):
+        self.cursor: Optional[int] = None
+        self.seen: Dict[int, object] = {}
+        self.subscriptions: Dict[int, Set[Subscription]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, course_id: int, user_id: int) -> Subscription:
+        subscription = Subscription(course_id, user_id)
+        self.subscriptions.setdefault(course_id, set()).add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self.subscriptions.get(subscription.course_id, set())
+        subscribers.discard(subscription)
+        if not subscribers:
+            self.subscriptions.pop(subscription.course_id, None)
+
+    def _late_since(self):
+        return timezone.now() - timedelta(
+            seconds=_setting("LIVE_EVENT_LATE_SECONDS", 30)
+        )
+
+    def start_cursor(self) -> None:
+        if self.cursor is None:
+            self.cursor = LiveEvent.objects.aggregate(m=Max("pk"))["m"] or 0
+            self.seen = dict(
+                LiveEvent.objects.filter(
+                    pk__lte=self.cursor, created_at__gte=self._late_since()
+                ).values_list("pk", "created_at")
+            )
+
+    def poll(self, course_ids: Iterable[int]) -> Dict[int, CourseBatch]:
+        """Lee los eventos nuevos de `course_ids` y los agrupa por curso."""
+        self.start_cursor()
+        since = self._late_since()
+        events = [
+            event
+            for event in LiveEvent.objects.filter(
+                Q(pk__gt=self.cursor) | Q(created_at__gte=since),
+                course_id__in=list(course_ids),
+            )
+            .order_by("pk")
+            .values("pk", "kind", "course_id", "user_id", "payload", "created_at")
+            if event["pk"] not in self.seen
+        ]
+        self.seen = {pk: at for pk, at in self.seen.items() if at >= since}
+        if not events:
+            return {}
+        self.cursor = max(self.cursor, events[-1]["pk"])
+        self.seen.update((event["pk"], event["created_at"]) for event in events)
+
+        changed: Dict[int, Set[int]] = {}
+        batches: Dict[int, CourseBatch] = {}
+        for event in events:
+            batch = batches.setdefault(event["course_id"], CourseBatch())
+            if event["kind"] == LiveEventKind.PROGRESS:
+                batch.progress[event["user_id"]] = event["payload"]
+            else:
+                changed.setdefault(event["course_id"], set()).add(event["user_id"])
+        for course_id, users in changed.items():
+            batches[course_id].leaderboard = leaderboard_snapshot(course_id, users)
+        return batches
+
+    def deliver(self, batches: Dict[int, CourseBatch]) -> int:
+        sent = 0
+        for course_id, batch in batches.items():
+            for subscription in list(self.subscriptions.get(course_id, ())):
+                if batch.leaderboard is not None:
+                    subscription.offer((LiveEventKind.LEADERBOARD, batch.leaderboard))
+                    sent += 1
+                progress = batch.progress.get(subscription.user_id)
+                if progress is not None:
+                    subscription.offer((LiveEventKind.PROGRESS, progress))
+                    sent += 1
+        return sent
+
+    async def _run(self) -> None:
+        interval = _setting("LIVE_POLL_INTERVAL", 1.0)
+        await sync_to_async(self.start_cursor)()
+        while self.subscriptions:
+            await asyncio.sleep(interval)
+            try:
+                batches = await sync_to_async(self.poll)(list(self.subscriptions))
+            except Exception:
+                logger.exception("No se pudieron leer los eventos en vivo")
+                continue
+            self.deliver(batches)
+        self.cursor = None
+        self.seen = {}
+
+
+_hubs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LiveHub]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_hub() -> LiveHub:
+    """Hub del event loop actual (uno por proceso bajo un servidor ASGI)."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = LiveHub()
+    return hub
+
+
+def format_sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def initial_messages(course_id: int, user) -> List[Message]:
+    return [
+        (LiveEventKind.PROGRESS, progress_snapshot(course_id, user)),
+        (LiveEventKind.LEADERBOARD, leaderboard_snapshot(course_id)),
+    ]
@@ -0,0 +1,109 @@
+from datetime import date
+
+from django.test import TestCase
+from knox.models import AuthToken
+
+from activities.models.word_ordering import WordOrderingActivity
+from activities.services import AnswerSubmissionService
+from content.models import Course, Module
+from jobs.services import JobWorker
+from people.models import Enrollment, EnrollmentStatus, Person, Student
+from users.models import User
+from utils.enums import ActivityType, LiveEventKind
+
+from .models import LiveEvent
+from .services import LiveHub, Subscription, leaderboard_event, publish
+
+
+class LiveEventsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        person = Person.objects.create(user=self.user, date_of_birth=date(2000, 1, 1))
+        student = Student.objects.create(person=person)
+        self.course = Course.objects.create(name="Inglés B1")
+        module = Module.objects.create(course=self.course, name="Unidad 1")
+        Enrollment.objects.create(
+            student=student, course=self.course, status=EnrollmentStatus.ACTIVE
+        )
+        self.activity = WordOrderingActivity.objects.create(
+            title="Ordena", type=ActivityType.ORDER, sentence="uno dos", module=module
+        )
+        self.token = AuthToken.objects.create(self.user)
+
+    def _answer(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            AnswerSubmissionService(
+                self.user, self.activity.id, {"words": ["uno", "dos"]}
+            ).execute()
+        JobWorker().run_pending()
+
+    def test_answers_publish_progress_and_rank_changes(self):
+        self._answer()
+        kinds = set(
+            LiveEvent.objects.filter(course=self.course).values_list("kind", flat=True)
+        )
+        self.assertEqual(kinds, {LiveEventKind.PROGRESS, LiveEventKind.LEADERBOARD})
+
+    def test_hub_coalesces_per_course(self):
+        hub = LiveHub()
+        hub.cursor = 0
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="secret"
+        )
+        mine = Subscription(self.course.pk, self.user.pk)
+        theirs = Subscription(self.course.pk, other.pk)
+        hub.subscriptions[self.course.pk] = {mine, theirs}
+
+        self._answer()
+        publish(leaderboard_event(self.course.pk, other.pk) for _ in range(5))
+        # Eventos + top del ranking (una vez para todo el curso) + personas.
+        with self.assertNumQueries(3):
+            batches = hub.poll([self.course.pk])
+        self.assertEqual(hub.deliver(batches), 3)
+
+        kind, data = mine.queue.get_nowait()
+        self.assertEqual(kind, LiveEventKind.LEADERBOARD)
+        self.assertEqual(data["changed"], sorted([self.user.pk, other.pk]))
+        kind, data = mine.queue.get_nowait()
+        self.assertEqual((kind, data["overall"]["percent"]), ("progress", 100.0))
+        self.assertEqual(theirs.queue.qsize(), 1)
+        self.assertEqual(hub.poll([self.course.pk]), {})
+
+    def test_hub_reads_events_committed_out_of_order(self):
+        hub = LiveHub()
+        subscription = Subscription(self.course.pk, self.user.pk)
+        hub.subscriptions[self.course.pk] = {subscription}
+        late, early = LiveEvent.objects.bulk_create([
+            leaderboard_event(self.course.pk, self.user.pk) for _ in range(2)
+        ])
+        # `early` se leyó antes de que se confirmara `late`, de pk menor.
+        hub.cursor = early.pk
+        hub.seen = {early.pk: early.created_at}
+
+        batches = hub.poll([self.course.pk])
+        self.assertEqual(batches[self.course.pk].leaderboard["changed"], [self.user.pk])
+        self.assertIn(late.pk, hub.seen)
+        self.assertEqual(hub.poll([self.course.pk]), {})
+
+    async def test_stream_requires_authentication(self):
+        url = f"/api/live/courses/{self.course.pk}/events/"
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_sends_current_state(self):
+        _, token = self.token
+        response = await self.async_client.get(
+            f"/api/live/courses/{self.course.pk}/events/",
+            headers={"Authorization": f"Token {token}"},
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = []
+        async for chunk in response.streaming_content:
+            chunks.append(chunk)
+            if len(chunks) == 3:
+                break
+        await response.streaming_content.aclose()
+        self.assertTrue(chunks[1].startswith(b"event: progress\n"))
+        self.assertTrue(chunks[2].startswith(b"event: leaderboard\n"))
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import course_events
+
+urlpatterns = [
+    path("courses/<int:course_id>/events/", course_events, name="live-course-events"),
+]
@@ -0,0 +1,67 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from content.models import Course
+
+from .services import format_sse, get_hub, initial_messages
+
+HEARTBEAT_SECONDS = 15
+
+
+def _authenticate(request):
+    drf_request = Request(
+        request,
+        authenticators=[cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+    )
+    try:
+        user = drf_request.user
+    except AuthenticationFailed:
+        return None
+    return user if user.is_authenticated else None
+
+
+async def course_events(request, course_id: int):
+    """
+    Stream SSE con el progreso del usuario autenticado en el curso y el top
+    del ranking del curso. Envía el estado actual al conectarse y luego un
+    evento `progress` o `leaderboard` por cada cambio.
+    """
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Las credenciales de autenticación no se proveyeron."},
+            status=401,
+        )
+    if not await Course.objects.filter(pk=course_id).aexists():
+        return JsonResponse({"detail": "No encontrado."}, status=404)
+
+    initial = await sync_to_async(initial_messages)(course_id, user)
+    hub = get_hub()
+    subscription = hub.subscribe(course_id, user.pk)
+
+    async def stream():
+        try:
+            yield b"retry: 5000\n\n"
+            for event, data in initial:
+                yield format_sse(event, data)
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield format_sse(event, data)
+        finally:
+            hub.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
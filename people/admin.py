@@ -11,6 +11,7 @@ from unfold.contrib.filters.admin import (
     AutocompleteSelectFilter,
 )
 
+from utils.admin import related_count
 from utils.enums import EnrollmentStatus
 
 from .forms import PersonAdminForm, StudentAdminForm
@@ -62,13 +63,19 @@ class StudentAdmin(ModelAdmin):
     search_fields = ("person__first_name", "person__last_name", "person__user__email")
     raw_id_fields = ("person",)
     inlines = [EnrollmentInline]
-    list_select_related = ("person",)
+    list_select_related = ("person", "active_course")
     readonly_fields = ("active_course",)
 
-    def enrollments_count(self, obj):
-        return obj.enrollments.count()
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(_enrollments_count=related_count(Enrollment.objects, "student"))
+        )
 
-    enrollments_count.short_description = "Enrollments"
+    @admin.display(description="Enrollments", ordering="_enrollments_count")
+    def enrollments_count(self, obj):
+        return obj._enrollments_count
 
     def save_formset(self, request, form, formset, change):
         if formset.model is Enrollment:
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 15:27
+
+from django.db import migrations, models
+
+
+def instructor_to_teacher(apps, schema_editor):
+    # "instructor" se aceptaba como rol docente antes de definir las opciones.
+    Enrollment = apps.get_model('people', 'Enrollment')
+    Enrollment.objects.filter(role='instructor').update(role='teacher')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0009_alter_person_photo'),
+    ]
+
+    operations = [
+        migrations.RunPython(instructor_to_teacher, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='enrollment',
+            name='role',
+            field=models.CharField(blank=True, choices=[('student', 'Student'), ('teacher', 'Teacher')], default='student', max_length=20),
+        ),
+    ]
@@ -4,7 +4,7 @@ from django.utils import timezone
 
 from languages.models import Language
 from users.models import User
-from utils.enums import EnrollmentStatus, ProficiencyLevel
+from utils.enums import EnrollmentRole, EnrollmentStatus, ProficiencyLevel
 
 
 class Person(models.Model):
@@ -129,7 +129,12 @@ class Enrollment(models.Model):
     enrolled_at = models.DateTimeField(default=timezone.now)
     start_at = models.DateTimeField(null=True, blank=True)
     end_at = models.DateTimeField(null=True, blank=True)
-    role = models.CharField(max_length=20, blank=True, default="student")
+    role = models.CharField(
+        max_length=20,
+        blank=True,
+        choices=EnrollmentRole.choices,
+        default=EnrollmentRole.STUDENT,
+    )
     notes = models.TextField(blank=True, default="")
 
     progress_percent = models.DecimalField(
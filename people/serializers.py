@@ -3,6 +3,7 @@ from rest_framework import serializers
 from content.serializers import CourseSerializer
 from languages.serializers import LanguageSerializer
 from people.models import Person, StudentLanguageProficiency
+from utils.serializers import SelectableFieldsMixin
 
 
 class StudentLanguageProficiencySerializer(serializers.ModelSerializer):
@@ -18,7 +19,7 @@ class StudentLanguageProficiencySerializer(serializers.ModelSerializer):
         return representation
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     email = serializers.EmailField(source="user.email", read_only=True)
 
     class Meta:
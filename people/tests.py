@@ -1,5 +1,6 @@
 from django.test import TestCase
 from rest_framework.test import APIClient
+from content.models import Vocabulary
 from people.models import Person, Student
 from datetime import date
 from users.models import User
@@ -58,4 +59,54 @@ class UpdateAccessViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.person.refresh_from_db()
         self.assertFalse(self.person.has_access)
-        self.assertTrue(Subscription.objects.filter(student=self.student).exists())
\ No newline at end of file
+        self.assertTrue(Subscription.objects.filter(student=self.student).exists())
+
+
+class VocabularyReviewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="student", email="student@example.com", password="secret"
+        )
+        person = Person.objects.create(user=self.user, date_of_birth=date(2000, 1, 1))
+        self.student = Student.objects.create(person=person)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.words = [
+            Vocabulary.objects.create(student=self.student, word=w, meaning=w.upper())
+            for w in ("apple", "book", "cat")
+        ]
+
+    def test_batch_review_reschedules_cards(self):
+        response = self.client.get("/api/people/vocabulary/due/?limit=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+        apple, book, _ = self.words
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                "/api/people/vocabulary/reviews/",
+                {
+                    "reviews": [
+                        {"id": apple.id, "quality": 5},
+                        {"id": book.id, "quality": 1},
+                    ]
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        cards = {c["id"]: c for c in response.json()}
+        self.assertEqual(
+            (cards[apple.id]["interval_days"], cards[apple.id]["ease"]), (1, 2.6)
+        )
+        self.assertEqual(cards[book.id]["repetitions"], 0)
+
+        due = self.client.get("/api/people/vocabulary/due/").json()
+        self.assertEqual([c["word"] for c in due], ["cat"])
+
+    def test_invalid_quality(self):
+        response = self.client.post(
+            "/api/people/vocabulary/reviews/",
+            {"reviews": [{"id": self.words[0].id, "quality": 9}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
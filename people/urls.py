@@ -2,6 +2,8 @@ from django.urls import path
 
 from .views import (
     MyCoursesProgressView,
+    MyVocabularyDueView,
+    MyVocabularyReviewView,
     MyVocabularyView,
     StudentProfileView,
     UpdateAccessView,
@@ -15,5 +17,11 @@ urlpatterns = [
         name="my_courses_progress",
     ),
     path("vocabulary/", MyVocabularyView.as_view(), name="my_vocabulary"),
+    path("vocabulary/due/", MyVocabularyDueView.as_view(), name="my_vocabulary_due"),
+    path(
+        "vocabulary/reviews/",
+        MyVocabularyReviewView.as_view(),
+        name="my_vocabulary_reviews",
+    ),
     path("update-access/", UpdateAccessView.as_view(), name="update_access"),
 ]
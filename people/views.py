@@ -1,15 +1,23 @@
 from django.db import transaction
-from drf_spectacular.utils import OpenApiExample, extend_schema
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, extend_schema
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from content.models import Vocabulary
-from content.serializers import CourseProgressSerializer, VocabularySerializer
-from content.services import CourseProgressService
+from content.serializers import (
+    CourseProgressSerializer,
+    VocabularyCardSerializer,
+    VocabularyReadProjection,
+    VocabularyReviewSerializer,
+    VocabularySerializer,
+)
+from content.services import CourseProgressService, VocabularyReviewService
 from subscriptions.models import PlanChoices, Subscription
 from users.models import User
+from utils.pagination import CURSOR_PAGINATION_PARAMETERS, CursorPaginatedAPIViewMixin
+from utils.streaming import StreamingListAPIViewMixin
 
 from .models import Enrollment, EnrollmentStatus, Person, Student
 from .serializers import (
@@ -124,12 +132,14 @@ class UpdateAccessView(APIView):
         )
 
 
-class MyVocabularyView(APIView):
+class MyVocabularyView(CursorPaginatedAPIViewMixin, StreamingListAPIViewMixin, APIView):
     permission_classes = [IsAuthenticated]
+    pagination_ordering = ("word", "id")
 
     @extend_schema(
         summary="Obtener mi vocabulario",
         description="Devuelve la lista de palabras y significados del estudiante autenticado.",  # noqa: E501
+        parameters=CURSOR_PAGINATION_PARAMETERS,
         responses={200: VocabularySerializer(many=True)},
         examples=[
             OpenApiExample(
@@ -161,9 +171,95 @@ class MyVocabularyView(APIView):
         except Student.DoesNotExist:
             return Response([], status=status.HTTP_200_OK)
 
-        vocabularies = Vocabulary.objects.filter(student_id=student_id).order_by("word")
-        serializer = VocabularySerializer(vocabularies, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        projection = VocabularyReadProjection(context=self.get_serializer_context())
+        vocabularies = projection.project(
+            Vocabulary.objects.filter(student_id=student_id).order_by(
+                *self.pagination_ordering
+            ),
+            extra=self.pagination_ordering,
+        )
+        page = self.paginate_queryset(vocabularies)
+        if page is not None:
+            return self.get_paginated_response(projection.represent_many(page))
+        return self.get_streaming_response(vocabularies, VocabularyReadProjection)
+
+
+class MyVocabularyDueView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Vocabulario pendiente de repaso",
+        description=(
+            "Devuelve las palabras del estudiante autenticado cuyo repaso ya "
+            "venció, de la más atrasada a la más reciente."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "limit",
+                int,
+                description="Cantidad máxima de palabras (default 20, máximo 200)",
+            )
+        ],
+        responses={200: VocabularyCardSerializer(many=True)},
+    )
+    def get(self, request):
+        student_id = (
+            Student.objects.filter(person__user_id=request.user.id)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if student_id is None:
+            return Response([], status=status.HTTP_200_OK)
+
+        try:
+            limit = max(int(request.query_params.get("limit", 20)), 1)
+        except ValueError:
+            return Response(
+                {"detail": "limit debe ser un entero."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        cards = VocabularyReviewService(student_id).due(limit)
+        return Response(VocabularyCardSerializer(cards, many=True).data)
+
+
+class MyVocabularyReviewView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Registrar repasos de vocabulario",
+        description=(
+            "Aplica un lote de repasos (calidad 0-5, estilo SM-2) en una sola "
+            "transacción y devuelve las tarjetas con su próxima fecha de repaso."
+        ),
+        request=VocabularyReviewSerializer,
+        responses={200: VocabularyCardSerializer(many=True)},
+        examples=[
+            OpenApiExample(
+                "Lote de repasos",
+                value={"reviews": [{"id": 1, "quality": 5}, {"id": 2, "quality": 2}]},
+                request_only=True,
+            )
+        ],
+    )
+    def post(self, request):
+        serializer = VocabularyReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        student_id = (
+            Student.objects.filter(person__user_id=request.user.id)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if student_id is None:
+            return Response(
+                {"detail": "No hay perfil de estudiante asociado."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cards = VocabularyReviewService(student_id).submit(
+            serializer.validated_data["reviews"]
+        )
+        return Response(VocabularyCardSerializer(cards, many=True).data)
 
 
 class MyCoursesProgressView(APIView):
@@ -0,0 +1,74 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+
+
+def related_count(queryset, field: str):
+    """
+    Cantidad de filas de `queryset` cuyo `field` apunta a la fila externa.
+
+    Se calcula en una subconsulta correlacionada, así los JOIN que agregan
+    filtros o búsquedas del changelist no multiplican el conteo.
+    """
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador del admin para tablas grandes.
+
+    Sin filtros aplicados usa la estimación de filas de Postgres
+    (`pg_class.reltuples`) en lugar de un `COUNT(*)` completo. En tablas
+    particionadas (como `user_answer`) el padre no tiene estimación propia, así
+    que se suman las de sus particiones. Con filtros, en otros motores o si la
+    estimación es baja, hace el conteo exacto.
+    """
+
+    estimate_threshold = 10_000
+
+    def _estimated_count(self):
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+        if query is None or query.where or query.distinct:
+            return None
+
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        # `to_regclass` resuelve el nombre con el search_path de la conexión,
+        # igual que las consultas del ORM; reltuples es -1 si nunca se analizó.
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint
+                FROM pg_class c
+                WHERE c.oid = to_regclass(%s)
+                   OR c.oid IN (
+                       SELECT inhrelid FROM pg_inherits
+                       WHERE inhparent = to_regclass(%s)
+                   )
+                """,
+                [table, table],
+            )
+            row = cursor.fetchone()
+        if not row or row[0] < self.estimate_threshold:
+            return None
+        return int(row[0])
+
+    @cached_property
+    def count(self):
+        estimate = self._estimated_count()
+        if estimate is not None:
+            return estimate
+        return super().count
@@ -23,6 +23,11 @@ class ActivityType(models.TextChoices):
     # SHOW_RESULTS = 'SHOW_RESULTS',                             // FR 25
 
 
+class WordTokenizer(models.TextChoices):
+    WHITESPACE = "whitespace", "Separar por espacios"
+    PUNCTUATION = "punctuation", "Separar también la puntuación"
+
+
 class ProficiencyLevel(models.TextChoices):
     BEGINNER = "A1", "Beginner (A1)"
     ELEMENTARY = "A2", "Elementary (A2)"
@@ -53,8 +58,24 @@ class EnrollmentStatus(models.TextChoices):
     COMPLETED = "COMPLETED", "Completed"
 
 
+class EnrollmentRole(models.TextChoices):
+    STUDENT = "student", "Student"
+    TEACHER = "teacher", "Teacher"
+
+
 CONSUME_STATUSES = {
     ExamAttemptStatus.SUBMITTED,
     ExamAttemptStatus.GRADED,
     ExamAttemptStatus.EXPIRED,
 }
+
+
+class JobStatus(models.TextChoices):
+    PENDING = "pending", "Pendiente"
+    RUNNING = "running", "En ejecución"
+    FAILED = "failed", "Fallido"
+
+
+class LiveEventKind(models.TextChoices):
+    PROGRESS = "progress", "Progreso"
+    LEADERBOARD = "leaderboard", "Ranking"
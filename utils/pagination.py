@@ -0,0 +1,91 @@
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes
+from rest_framework.pagination import CursorPagination
+
+CURSOR_QUERY_PARAM = "cursor"
+PAGE_SIZE_QUERY_PARAM = "page_size"
+FIELDS_QUERY_PARAM = "fields"
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Paginación por cursor (keyset) sobre columnas indexadas.
+
+    El primer campo de `ordering` define la posición del cursor; si no es
+    único, se agrega `id` como desempate para que el orden sea estable entre
+    páginas. Cada vista debe ordenar su queryset igual, así la respuesta sin
+    paginar sale en el mismo orden.
+    """
+
+    cursor_query_param = CURSOR_QUERY_PARAM
+    page_size_query_param = PAGE_SIZE_QUERY_PARAM
+    page_size = 50
+    max_page_size = 200
+    ordering = ("id",)
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+
+CURSOR_PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        name=CURSOR_QUERY_PARAM,
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Cursor opaco devuelto en `next`/`previous`.",
+    ),
+    OpenApiParameter(
+        name=PAGE_SIZE_QUERY_PARAM,
+        type=OpenApiTypes.INT,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description=(
+            "Tamaño de página (máx. 200). Si se envía `cursor` o `page_size` la "
+            "respuesta se pagina como `{next, previous, results}`."
+        ),
+    ),
+    OpenApiParameter(
+        name=FIELDS_QUERY_PARAM,
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description="Lista de campos separados por coma, p.ej. `id,title`.",
+    ),
+]
+
+
+def parse_fields_param(request):
+    raw = request.query_params.get(FIELDS_QUERY_PARAM) if request else None
+    if not raw:
+        return None
+    fields = {f.strip() for f in raw.split(",") if f.strip()}
+    return fields or None
+
+
+class CursorPaginatedAPIViewMixin:
+    """
+    Paginación por cursor opcional para `APIView`.
+
+    Los clientes que no envían `cursor` ni `page_size` siguen recibiendo la
+    lista completa, así que la paginación es retrocompatible.
+    """
+
+    pagination_class = KeysetCursorPagination
+    pagination_ordering = ("id",)
+
+    def wants_pagination(self, request):
+        params = request.query_params
+        return CURSOR_QUERY_PARAM in params or PAGE_SIZE_QUERY_PARAM in params
+
+    def paginate_queryset(self, queryset):
+        if not self.wants_pagination(self.request):
+            return None
+        self.paginator = self.pagination_class(ordering=self.pagination_ordering)
+        return self.paginator.paginate_queryset(queryset, self.request, view=self)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_serializer_context(self):
+        return {"request": self.request, "fields": parse_fields_param(self.request)}
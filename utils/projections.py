@@ -0,0 +1,102 @@
+from django.core.files.storage import default_storage
+
+
+class Field:
+    def __init__(self, source=None, transform=None):
+        self.source = source
+        self.transform = transform
+
+
+class Nested:
+    """Agrupa columnas `<source>__<campo>` en un dict; `None` si la FK es nula."""
+
+    def __init__(self, source, projection, key="id"):
+        self.source = source
+        self.projection = projection
+        self.key = key
+
+
+def choices_display(choices):
+    display = {value: str(label) for value, label in choices.choices}
+    return lambda value, context: display.get(value, value)
+
+
+def file_url(storage=None):
+    storage = storage or default_storage
+
+    def transform(value, context):
+        if not value:
+            return None
+        url = storage.url(value)
+        request = context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+    return transform
+
+
+class ValuesProjection:
+    """
+    Serializer de sólo lectura que trabaja sobre filas de `.values()`.
+
+    `fields` es un dict `nombre de salida -> origen`, donde el origen puede ser
+    un lookup (str), un `Field(source, transform)` o un `Nested(source, cls)`.
+    La especificación se compila una sola vez por clase, así que serializar una
+    fila es sólo copiar claves del dict, sin construir instancias del modelo.
+    """
+
+    fields = {}
+    _plan = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._plan = cls._compile()
+
+    @classmethod
+    def _compile(cls, prefix=""):
+        plan = []
+        for name, spec in cls.fields.items():
+            if isinstance(spec, Nested):
+                source = f"{prefix}{spec.source}__"
+                nested = spec.projection._compile(prefix=source)
+                plan.append((name, f"{source}{spec.key}", None, nested))
+                continue
+            if isinstance(spec, str):
+                spec = Field(spec)
+            plan.append((name, f"{prefix}{spec.source or name}", spec.transform, None))
+        return plan
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        requested = self.context.get("fields")
+        self.plan = [
+            step for step in self._plan if not requested or step[0] in requested
+        ] or self._plan
+
+    @classmethod
+    def _lookups(cls, plan):
+        for _name, lookup, _transform, nested in plan:
+            yield lookup
+            if nested:
+                yield from cls._lookups(nested)
+
+    def project(self, queryset, extra=()):
+        lookups = dict.fromkeys([*self._lookups(self.plan), *extra])
+        return queryset.values(*lookups)
+
+    def _represent(self, plan, row):
+        out = {}
+        for name, lookup, transform, nested in plan:
+            value = row[lookup]
+            if nested is not None:
+                out[name] = None if value is None else self._represent(nested, row)
+            elif transform is not None:
+                out[name] = transform(value, self.context)
+            else:
+                out[name] = value
+        return out
+
+    def to_representation(self, row):
+        return self._represent(self.plan, row)
+
+    def represent_many(self, rows):
+        return [self._represent(self.plan, row) for row in rows]
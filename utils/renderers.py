@@ -0,0 +1,87 @@
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+_ENCODER = encoders.JSONEncoder()
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+else:  # pragma: no cover
+    ORJSON_OPTIONS = 0
+
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+def _default(obj):
+    # Fechas, Decimal, lazy strings, etc. se codifican igual que el
+    # JSONEncoder de DRF para que la salida no cambie al cambiar de backend.
+    return _ENCODER.default(obj)
+
+
+def _escape_line_separators(content: bytes) -> bytes:
+    for raw, escaped in LINE_SEPARATORS:
+        if raw in content:
+            content = content.replace(raw, escaped)
+    return content
+
+
+def dumps(data, indent=None) -> bytes:
+    if orjson is None:
+        return json.dumps(
+            data,
+            cls=encoders.JSONEncoder,
+            indent=indent,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":") if not indent else None,
+        ).encode("utf-8")
+    option = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(data, default=_default, option=option)
+
+
+def dumps_compact(data) -> bytes:
+    """Igual que `ORJSONRenderer` sin indentación, para codificar por partes."""
+    return _escape_line_separators(dumps(data))
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renderer JSON basado en orjson.
+
+    Si orjson no está instalado se comporta exactamente como `JSONRenderer`.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        return _escape_line_separators(dumps(data, indent=indent))
+
+
+class ORJSONParser(JSONParser):
+    """Parser JSON basado en orjson, con `JSONParser` como respaldo."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", "utf-8")
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,26 @@
+from rest_framework.serializers import ListSerializer
+
+
+class SelectableFieldsMixin:
+    """
+    Permite limitar los campos serializados con `context["fields"]`.
+
+    Los campos no solicitados se eliminan antes de serializar, de modo que los
+    `SerializerMethodField` costosos (p.ej. `payload`) no se evalúan. El
+    filtro sólo aplica al serializer raíz (o a los hijos de un `many=True`
+    raíz): los anidados comparten el contexto pero conservan sus campos.
+    """
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get("fields")
+        if not requested or not self._is_root():
+            return fields
+        selected = {name: f for name, f in fields.items() if name in requested}
+        return selected or fields
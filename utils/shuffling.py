@@ -0,0 +1,15 @@
+import hashlib
+import random
+
+
+def make_seed(*parts) -> int:
+    """Semilla estable entre procesos (a diferencia de `hash()`) para `parts`."""
+    key = ":".join(str(part) for part in parts).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big")
+
+
+def seeded_shuffle(items, seed=None, rng=None) -> list:
+    """Copia barajada de `items`; con la misma semilla siempre da el mismo orden."""
+    items = list(items)
+    (rng or random.Random(seed)).shuffle(items)
+    return items
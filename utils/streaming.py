@@ -0,0 +1,104 @@
+import logging
+from itertools import chain
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from utils.renderers import dumps_compact
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingJSONRenderer:
+    """
+    Codifica una secuencia de elementos como un arreglo JSON por partes.
+
+    Sólo se mantiene en memoria un bloque de hasta `buffer_size` bytes, sin
+    importar cuántos elementos tenga la secuencia. Cada elemento se codifica
+    igual que con `ORJSONRenderer`.
+    """
+
+    media_type = "application/json"
+    charset = "utf-8"
+    buffer_size = 64 * 1024
+
+    def encode(self, data) -> bytes:
+        return dumps_compact(data)
+
+    def render_iter(self, items):
+        buffer = bytearray(b"[")
+        first = True
+        for item in items:
+            if not first:
+                buffer += b","
+            buffer += self.encode(item)
+            first = False
+            if len(buffer) >= self.buffer_size:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b"]"
+        yield bytes(buffer)
+
+    @property
+    def content_type(self):
+        return f"{self.media_type}; charset={self.charset}"
+
+
+class StreamingListAPIViewMixin:
+    """
+    Respuestas de lista en streaming para `APIView`.
+
+    Recorre el queryset con `.iterator(chunk_size=...)` y serializa fila por
+    fila reutilizando una sola instancia del serializer. Sólo se transmite por
+    partes cuando la negociación eligió JSON compacto; con otro renderer
+    (`?format=api`, `indent`) se responde con un `Response` normal.
+
+    El primer bloque se genera antes de devolver la respuesta, así un error en
+    la primera página todavía sale con su código de estado. Un error posterior
+    corta el cuerpo, porque el 200 ya se envió.
+    """
+
+    streaming_renderer_class = StreamingJSONRenderer
+    stream_chunk_size = 500
+
+    def can_stream(self) -> bool:
+        renderer = getattr(self.request, "accepted_renderer", None)
+        return (
+            isinstance(renderer, JSONRenderer)
+            and renderer.compact
+            and not renderer.get_indent(self.request.accepted_media_type, {})
+        )
+
+    def get_streaming_response(self, queryset, serializer_class, item_getter=None):
+        context = (
+            self.get_serializer_context()
+            if hasattr(self, "get_serializer_context")
+            else {"request": self.request}
+        )
+        serializer = serializer_class(context=context)
+
+        def rows():
+            for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+                if item_getter is not None:
+                    instance = item_getter(instance)
+                yield serializer.to_representation(instance)
+
+        if not self.can_stream():
+            return Response(list(rows()))
+
+        renderer = self.streaming_renderer_class()
+        chunks = renderer.render_iter(rows())
+        first = next(chunks)
+        return StreamingHttpResponse(
+            self._log_errors(chain([first], chunks)),
+            content_type=renderer.content_type,
+        )
+
+    @staticmethod
+    def _log_errors(chunks):
+        try:
+            yield from chunks
+        except Exception:
+            logger.exception("Error a mitad de una respuesta en streaming.")
+            raise
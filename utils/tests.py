@@ -0,0 +1,107 @@
+import io
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apart.checks import shared_cache_check
+from utils.renderers import ORJSONParser, ORJSONRenderer
+from utils.serializers import SelectableFieldsMixin
+from utils.streaming import StreamingJSONRenderer
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    def setUp(self):
+        self.data = {
+            "percentage": Decimal("82.50"),
+            "finished_at": datetime(
+                2025, 8, 12, 15, 30, 0, 123456, tzinfo=timezone.utc
+            ),
+            "label": _("Fácil"),
+            "scores": {1: 10, 2: 20},
+            "text": "línea siguiente",
+            "empty": None,
+        }
+
+    def test_output_matches_stdlib_renderer(self):
+        self.assertEqual(
+            ORJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+    def test_parser_matches_stdlib_parser(self):
+        body = JSONRenderer().render(self.data)
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class StreamingJSONRendererTestCase(SimpleTestCase):
+    def test_render_iter_produces_valid_json_in_chunks(self):
+        renderer = StreamingJSONRenderer()
+        renderer.buffer_size = 16
+        items = [{"id": i, "word": "palabra"} for i in range(20)]
+        chunks = list(renderer.render_iter(iter(items)))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads(b"".join(chunks)), items)
+
+    def test_items_are_encoded_like_the_renderer(self):
+        items = [{"text": "línea\u2028siguiente\u2029", "scores": {1: 10}}]
+        body = b"".join(StreamingJSONRenderer().render_iter(iter(items)))
+        self.assertEqual(body, ORJSONRenderer().render(items))
+        self.assertNotIn("\u2028".encode(), body)
+
+    def test_render_iter_empty(self):
+        chunks = StreamingJSONRenderer().render_iter(iter([]))
+        self.assertEqual(b"".join(chunks), b"[]")
+
+
+class InnerSerializer(SelectableFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class OuterSerializer(SelectableFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    inner = InnerSerializer()
+
+
+class SelectableFieldsMixinTestCase(SimpleTestCase):
+    def setUp(self):
+        self.item = {"id": 1, "title": "Curso", "inner": {"id": 2, "name": "Nivel"}}
+        self.context = {"fields": {"id", "inner"}}
+
+    def test_only_root_fields_are_filtered(self):
+        data = OuterSerializer(self.item, context=self.context).data
+        self.assertEqual(data, {"id": 1, "inner": {"id": 2, "name": "Nivel"}})
+
+    def test_many_filters_each_item_but_not_nested(self):
+        data = OuterSerializer([self.item], many=True, context=self.context).data
+        self.assertEqual(data, [{"id": 1, "inner": {"id": 2, "name": "Nivel"}}])
+
+
+class SharedCacheCheckTestCase(SimpleTestCase):
+    @override_settings(TESTING=False)
+    def test_process_local_cache_is_rejected(self):
+        self.assertEqual([e.id for e in shared_cache_check(None)], ["apart.E001"])
+
+    @override_settings(
+        TESTING=False,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": "django_cache",
+            }
+        },
+    )
+    def test_database_cache_is_accepted(self):
+        self.assertEqual(shared_cache_check(None), [])